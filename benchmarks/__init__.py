@@ -0,0 +1 @@
+"""Micro-benchmarks of the persistence layer (run with 'python -m benchmarks.<name>')."""
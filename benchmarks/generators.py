@@ -0,0 +1,87 @@
+"""
+Seeded synthetic datasets in the shape of the example JSON files.
+
+The same arguments and seed always give the same document, so benchmark
+runs on different commits measure the same graph.
+"""
+import random
+from typing import Any, Dict, List
+
+CATEGORIES = ("OS", "Programming", "Containers", "Cloud", "Data", "Security")
+
+
+def metro_network(
+    lines: int,
+    stations_per_line: int,
+    interchange_ratio: float = 0.2,
+    rer_ratio: float = 0.25,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    'lines.json' document: 'lines' lines of 'stations_per_line' stops, split
+    between METRO and RER. About 'interchange_ratio' of the stops of each new
+    line are stations of earlier lines (always at least one, so the network
+    is connected); the other stops are new stations.
+    """
+    rng = random.Random(seed)
+    network: Dict[str, Any] = {
+        "METRO": {"speed_factor": 1.0, "avg_stop_time": 90, "lines": {}},
+        "RER": {"speed_factor": 1.8, "avg_stop_time": 150, "lines": {}},
+    }
+    existing: List[str] = []
+    rer_lines = round(lines * rer_ratio)
+
+    for index in range(lines):
+        stops: List[str] = []
+        interchanges = max(1, round(stations_per_line * interchange_ratio)) if existing else 0
+        shared = set(rng.sample(range(stations_per_line), min(interchanges, stations_per_line)))
+        for position in range(stations_per_line):
+            if position in shared:
+                name = rng.choice(existing)
+                if name in stops:
+                    continue
+            else:
+                name = f"Station {len(existing)}"
+                existing.append(name)
+            stops.append(name)
+
+        if index < lines - rer_lines:
+            network["METRO"]["lines"][str(index + 1)] = stops
+        else:
+            network["RER"]["lines"][chr(ord("A") + index - (lines - rer_lines))] = stops
+    return network
+
+
+def curriculum(layers: int, width: int, max_prerequisites: int = 2, seed: int = 42) -> Dict[str, Any]:
+    """
+    'curriculum.json' document: a layered DAG of 'layers' x 'width' units.
+    Every unit after the first layer has 1 to 'max_prerequisites' prerequisites,
+    one of them in the previous layer (so the depth is exactly 'layers').
+    """
+    rng = random.Random(seed)
+    units: List[Dict[str, Any]] = []
+    previous: List[str] = []
+    earlier: List[str] = []
+
+    for layer in range(layers):
+        current = []
+        for column in range(width):
+            slug = f"unit_{layer}_{column}"
+            prerequisites: List[str] = []
+            if previous:
+                prerequisites.append(rng.choice(previous))
+                for _ in range(rng.randint(0, max_prerequisites - 1)):
+                    candidate = rng.choice(earlier)
+                    if candidate not in prerequisites:
+                        prerequisites.append(candidate)
+            units.append({
+                "id": slug,
+                "title": f"Unit {layer}.{column}",
+                "category": rng.choice(CATEGORIES),
+                "hours": rng.randint(2, 40),
+                "prerequisites": prerequisites,
+            })
+            current.append(slug)
+        earlier.extend(current)
+        previous = current
+    return {"units": units}
@@ -0,0 +1,73 @@
+"""
+Network latency benchmark: batching, pooling and async fan-out against the
+local stand-in server, with a configurable round-trip latency.
+
+    python -m benchmarks.latency --latency 0.01 --jitter 0.002 --entities 500
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from soltania_persistence.provider.memory.server import GremlinStandInServer
+from soltania_persistence.provider.tinkerpop.async_manager import AsyncGremlinEntityManager
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+from soltania_persistence.examples.metro_network.models import Station
+
+
+def report(name: str, seconds: float, operations: int) -> None:
+    print(f"{name:<40} {seconds * 1e3:>9.1f} ms  {operations / seconds:>9,.0f} entities/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds per round trip")
+    parser.add_argument("--jitter", type=float, default=0.002)
+    parser.add_argument("--entities", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    def stations(prefix: str):
+        return [Station(name=f"{prefix} {i}") for i in range(args.entities)]
+
+    with GremlinStandInServer(latency=args.latency, jitter=args.jitter, seed=42) as server:
+        print(f"{args.entities:,} stations, {args.latency * 1e3:.0f} ms (+/- {args.jitter * 1e3:.0f}) per round trip")
+
+        em = GremlinEntityManager(server.url, pool_size=args.threads)
+        try:
+            start = time.perf_counter()
+            for station in stations("single")[:args.batch_size]:
+                em.persist(station)
+            # One round trip each: measured on one batch worth, extrapolated
+            report("persist() one by one (extrapolated)", (time.perf_counter() - start) * args.entities / args.batch_size, args.entities)
+
+            start = time.perf_counter()
+            em.persist_all(stations("batch"), batch_size=args.batch_size)
+            report(f"persist_all(batch_size={args.batch_size})", time.perf_counter() - start, args.entities)
+
+            names = [f"batch {i}" for i in range(args.entities)]
+            for pool_size in (1, args.threads):
+                pooled = GremlinEntityManager(server.url, pool_size=pool_size, cache_size=0)
+                try:
+                    start = time.perf_counter()
+                    with ThreadPoolExecutor(args.threads) as pool:
+                        list(pool.map(lambda name: pooled.find_by_property(Station, "name", name), names))
+                    report(f"find_by_property, {args.threads} threads, pool={pool_size}", time.perf_counter() - start, args.entities)
+                finally:
+                    pooled.close()
+        finally:
+            em.close()
+
+        async_em = AsyncGremlinEntityManager(server.url, pool_size=args.threads)
+        try:
+            start = time.perf_counter()
+            asyncio.run(async_em.persist_all(stations("async"), batch_size=args.batch_size))
+            report(f"async persist_all(batch_size={args.batch_size})", time.perf_counter() - start, args.entities)
+        finally:
+            asyncio.run(async_em.close())
+        print(f"{server.requests:,} requests served")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Response decode benchmark: client CPU to deserialize GraphBinary, GraphSON 3
+and GraphSON 2 responses, per response size.
+
+Two shapes, as sent by a Gremlin Server: station element maps (find_all,
+find_by_property) and one path().by(elementMap()) of alternating station /
+connection maps (find_fastest_path, get_roadmap). The responses are encoded
+by the stand-in server codecs and decoded with the driver's serializers.
+
+    python -m benchmarks.serializers --sizes 10 100 1000 10000
+"""
+import argparse
+import gc
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List
+
+from gremlin_python.process.traversal import Direction, T, Traverser
+from gremlin_python.structure.graph import Path
+
+from soltania_persistence.provider.memory.server import _GraphBinaryCodec, _GraphSONCodec
+from soltania_persistence.provider.tinkerpop.manager import SERIALIZERS
+
+CODECS = {"graphbinary": _GraphBinaryCodec(), "graphson": _GraphSONCodec(3), "graphson-v2": _GraphSONCodec(2)}
+
+
+def station(i: int) -> dict:
+    now = datetime(2024, 1, 1)
+    return {T.id: i, T.label: "station", "name": f"Station {i}", "zone": i % 5, "created_at": now, "updated_at": now}
+
+
+def connection(i: int) -> dict:
+    return {
+        T.id: 100_000 + i, T.label: "connects_to",
+        Direction.OUT: {T.id: i, T.label: "station"}, Direction.IN: {T.id: i + 1, T.label: "station"},
+        "line": str(i % 14), "duration": 90, "distance": 800,
+    }
+
+
+def element_maps(size: int) -> List[Any]:
+    return [Traverser(station(i), 1) for i in range(size)]
+
+
+def path(size: int) -> List[Any]:
+    """One path of 'size' elements (stations and the connections between them)."""
+    objects = [station(i // 2) if i % 2 == 0 else connection(i // 2) for i in range(size)]
+    return [Traverser(Path([set() for _ in objects], objects), 1)]
+
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of 'repeat' runs, with the cyclic GC paused so runs are comparable."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    parser.add_argument("--serializers", nargs="+", choices=list(CODECS), default=list(CODECS))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    request_id = uuid.uuid4()
+    print(f"{'shape':<14} {'elements':>8}  {'serializer':<12} {'payload':>10} {'decode':>11} {'per element':>12}")
+    for shape, build in (("element maps", element_maps), ("path", path)):
+        for size in args.sizes:
+            results = build(size)
+            for name in args.serializers:
+                payload = CODECS[name].response(request_id, 200, results)
+                # The driver reads the mime header itself for GraphBinary; GraphSON arrives as the JSON document
+                decode = SERIALIZERS[name]().deserialize_message
+                seconds = best_time(lambda: decode(payload), args.repeat)
+                print(
+                    f"{shape:<14} {size:>8,}  {name:<12} {len(payload) / 1024:>7,.1f} KiB "
+                    f"{seconds * 1e3:>8.2f} ms {seconds / size * 1e6:>9.2f} µs"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Warm-start benchmark: time for a worker to be ready to route on the metro graph.
+
+Compares loading the CSR routing snapshot through traversals (what every
+worker does today, here against an in-process graph, so without any network
+cost) with mapping a binary snapshot file, and reports the file size.
+
+    python -m benchmarks.snapshot --stations 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.memory.snapshot import GraphSnapshot, export_snapshot
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.services.routing import RoutingEngine, shortest_paths
+
+
+def build_graph(stations: int, degree: int, seed: int) -> InMemoryEntityManager:
+    rng = random.Random(seed)
+    em = InMemoryEntityManager()
+    nodes = em.persist_all([Station(name=f"Station {i}", zone=i % 5 + 1) for i in range(stations)])
+    links = []
+    for i, node in enumerate(nodes):
+        for _ in range(degree):
+            links.append((node, nodes[rng.randrange(stations)], Connection(line=f"{i % 16}", duration=rng.randint(60, 300))))
+    em.create_relationships(links, batch_size=10_000)
+    return em
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stations", type=int, default=5_000)
+    parser.add_argument("--degree", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    em = build_graph(args.stations, args.degree, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metro.graph")
+        start = time.perf_counter()
+        stats = export_snapshot(em, path, [Station], [Connection], properties={Station: ["name", "zone"]}, weight="duration")
+        export = time.perf_counter() - start
+        print(f"{stats.vertices:,} stations, {stats.edges:,} connections, {stats.size / 1024:,.0f} KiB "
+              f"(export {export * 1e3:.0f} ms)")
+
+        start = time.perf_counter()
+        RoutingEngine(em).load()
+        print(f"{'traversal load (RoutingEngine)':<34} {(time.perf_counter() - start) * 1e3:>9.1f} ms")
+
+        start = time.perf_counter()
+        with GraphSnapshot.open(path) as snapshot:
+            opened = time.perf_counter() - start
+            source = snapshot.lookup("station", "name", "Station 0")[0]
+            shortest_paths(snapshot.offsets, snapshot.targets, snapshot.weights, source, {len(snapshot) - 1})
+            first_route = time.perf_counter() - start
+        print(f"{'mmap open':<34} {opened * 1e3:>9.2f} ms")
+        print(f"{'mmap open + first route':<34} {first_route * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Benchmark suite: import and query scenarios on synthetic graphs of several sizes.
+
+Every scenario runs against the in-process provider (InMemoryEntityManager,
+repository traversals executed by the local bytecode interpreter), so no
+database is needed and runs are comparable across commits. The report is a
+JSON document with, per scenario and size, the throughput, latency
+percentiles and peak memory (tracemalloc, measured in a separate pass so it
+does not slow down the timed one).
+
+    python -m benchmarks.suite --sizes small medium --output bench.json
+    python -m benchmarks.suite --baseline bench.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+from soltania_persistence.examples.learning_paths.services.importer import CurriculumImporter
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+from soltania_persistence.examples.metro_network.services.importer import NetworkImporter
+from soltania_persistence.examples.metro_network.services.routing import RoutingEngine
+
+from benchmarks.generators import curriculum, metro_network
+
+REPORT_VERSION = 1
+
+# Metro: (lines, stations per line); curriculum: (layers, units per layer)
+SIZES: Dict[str, Dict[str, Tuple[int, int]]] = {
+    "small": {"metro": (6, 12), "curriculum": (4, 6)},
+    "medium": {"metro": (12, 25), "curriculum": (6, 12)},
+    "large": {"metro": (24, 40), "curriculum": (8, 20)},
+}
+
+# A scenario prepares its dataset and returns the operation to time (called with the operation index)
+Scenario = Callable[[str, str, int, random.Random], Callable[[int], Any]]
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    """The importers and repositories report progress on stdout."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _write(directory: str, name: str, document: Dict[str, Any]) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f)
+    return path
+
+
+def _metro(directory: str, size: str, seed: int) -> Tuple[str, Dict[str, Any]]:
+    lines, stations = SIZES[size]["metro"]
+    document = metro_network(lines, stations, seed=seed)
+    return _write(directory, f"lines-{size}.json", document), document
+
+
+def _curriculum(directory: str, size: str, seed: int) -> Tuple[str, Dict[str, Any]]:
+    layers, width = SIZES[size]["curriculum"]
+    document = curriculum(layers, width, seed=seed)
+    return _write(directory, f"curriculum-{size}.json", document), document
+
+
+def _station_names(document: Dict[str, Any]) -> List[str]:
+    names = {name for transport in document.values() for stops in transport["lines"].values() for name in stops}
+    return sorted(names)
+
+
+def _loaded_metro(directory: str, size: str, seed: int, local_routing: bool = False) -> Tuple[MetroRepository, List[str]]:
+    path, document = _metro(directory, size, seed)
+    em = InMemoryEntityManager()
+    # Route cache disabled: every call computes its route
+    repo = MetroRepository(em, router=RoutingEngine(em) if local_routing else None, route_cache_size=0)
+    with _quiet():
+        NetworkImporter(repo, path).run()
+    return repo, _station_names(document)
+
+
+def _loaded_curriculum(directory: str, size: str, seed: int) -> Tuple[CurriculumRepository, List[str]]:
+    path, document = _curriculum(directory, size, seed)
+    repo = CurriculumRepository(InMemoryEntityManager())
+    with _quiet():
+        CurriculumImporter(repo, path).run()
+    return repo, [unit["id"] for unit in document["units"]]
+
+
+# --- Scenarios ---------------------------------------------------------------
+
+def import_metro(directory: str, size: str, seed: int, rng: random.Random) -> Callable[[int], Any]:
+    path, _ = _metro(directory, size, seed)
+    return lambda i: NetworkImporter(MetroRepository(InMemoryEntityManager()), path).run()
+
+
+def import_curriculum(directory: str, size: str, seed: int, rng: random.Random) -> Callable[[int], Any]:
+    path, _ = _curriculum(directory, size, seed)
+    return lambda i: CurriculumImporter(CurriculumRepository(InMemoryEntityManager()), path).run()
+
+
+def find_by_property(directory: str, size: str, seed: int, rng: random.Random) -> Callable[[int], Any]:
+    repo, names = _loaded_metro(directory, size, seed)
+    queries = [rng.choice(names) for _ in range(1024)]
+    return lambda i: repo.find_by_name(queries[i % len(queries)])
+
+
+def find_fastest_path(directory: str, size: str, seed: int, rng: random.Random) -> Callable[[int], Any]:
+    repo, names = _loaded_metro(directory, size, seed)
+    pairs = [tuple(rng.sample(names, 2)) for _ in range(256)]
+    return lambda i: repo.find_fastest_path(*pairs[i % len(pairs)])
+
+
+def find_fastest_path_local(directory: str, size: str, seed: int, rng: random.Random) -> Callable[[int], Any]:
+    repo, names = _loaded_metro(directory, size, seed, local_routing=True)
+    pairs = [tuple(rng.sample(names, 2)) for _ in range(256)]
+    return lambda i: repo.find_fastest_path(*pairs[i % len(pairs)])
+
+
+def get_roadmap(directory: str, size: str, seed: int, rng: random.Random) -> Callable[[int], Any]:
+    repo, slugs = _loaded_curriculum(directory, size, seed)
+    # Deepest units: the longest roadmaps
+    width = SIZES[size]["curriculum"][1]
+    targets = slugs[-width:]
+    return lambda i: repo.get_roadmap(targets[i % len(targets)])
+
+
+def get_roadmap_dag(directory: str, size: str, seed: int, rng: random.Random) -> Callable[[int], Any]:
+    repo, slugs = _loaded_curriculum(directory, size, seed)
+    width = SIZES[size]["curriculum"][1]
+    targets = slugs[-width:]
+    return lambda i: repo.get_roadmap_dag(targets[i % len(targets)])
+
+
+# Name -> (scenario, operations per run as a fraction of --operations, sizes it runs at (None = all))
+SCENARIOS: Dict[str, Tuple[Scenario, float, Optional[Tuple[str, ...]]]] = {
+    "import_metro": (import_metro, 0.05, None),
+    "import_curriculum": (import_curriculum, 0.05, None),
+    "find_by_property": (find_by_property, 1.0, None),
+    # The beam-search traversal explores every simple path up to 40 hops:
+    # beyond the small network a single route takes minutes
+    "find_fastest_path": (find_fastest_path, 0.1, ("small",)),
+    "find_fastest_path_local": (find_fastest_path_local, 0.1, None),
+    "get_roadmap": (get_roadmap, 0.1, None),
+    "get_roadmap_dag": (get_roadmap_dag, 0.1, None),
+}
+
+
+# --- Measurement -------------------------------------------------------------
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values (q in [0, 1])."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def run_scenario(name: str, size: str, operations: int, seed: int, directory: str) -> Dict[str, Any]:
+    """Times 'operations' calls, then measures the peak memory of a fresh run of the same scenario."""
+    scenario = SCENARIOS[name][0]
+    with _quiet():
+        operation = scenario(directory, size, seed, random.Random(seed))
+        latencies = []
+        start = time.perf_counter()
+        for i in range(operations):
+            began = time.perf_counter()
+            operation(i)
+            latencies.append(time.perf_counter() - began)
+        elapsed = time.perf_counter() - start
+
+        # Peak over the dataset setup and a few operations, allocations of the process excluded
+        tracemalloc.start()
+        try:
+            operation = scenario(directory, size, seed, random.Random(seed))
+            for i in range(min(operations, 10)):
+                operation(i)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "size": size,
+        "operations": operations,
+        "seconds": round(elapsed, 6),
+        "throughput": round(operations / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1e3, 4),
+            "p90": round(percentile(latencies, 0.90) * 1e3, 4),
+            "p99": round(percentile(latencies, 0.99) * 1e3, 4),
+            "max": round(latencies[-1] * 1e3, 4),
+        },
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def run_suite(
+    scenarios: Sequence[str], sizes: Sequence[str], operations: int, seed: int,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for name in scenarios:
+                supported = SCENARIOS[name][2]
+                if supported is not None and size not in supported:
+                    continue
+                count = max(1, int(operations * SCENARIOS[name][1]))
+                result = run_scenario(name, size, count, seed, directory)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return {
+        "version": REPORT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "sizes": {size: SIZES[size] for size in sizes},
+        "results": results,
+    }
+
+
+def regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Scenarios whose median latency or peak memory grew by more than 'tolerance' (0.2 = +20%)."""
+    previous = {(r["scenario"], r["size"]): r for r in baseline.get("results", [])}
+    found = []
+    for result in report["results"]:
+        before = previous.get((result["scenario"], result["size"]))
+        if before is None:
+            continue
+        for metric, now, then in (
+            ("p50", result["latency_ms"]["p50"], before["latency_ms"]["p50"]),
+            ("peak memory", result["peak_memory_kib"], before["peak_memory_kib"]),
+        ):
+            if then and now > then * (1 + tolerance):
+                found.append(f"{result['scenario']} [{result['size']}] {metric}: {then} -> {now} (+{now / then - 1:.0%})")
+    return found
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{result['scenario']:<24} {result['size']:<7} {result['throughput']:>10,.1f} ops/s  "
+        f"p50 {latency['p50']:>8.3f} ms  p99 {latency['p99']:>8.3f} ms  peak {result['peak_memory_kib']:>9,.0f} KiB",
+        file=sys.stderr,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--operations", type=int, default=1_000, help="Operations of the query scenarios")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON report file (stdout if omitted)")
+    parser.add_argument("--baseline", help="Previous JSON report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run_suite(args.scenarios, args.sizes, args.operations, args.seed, progress=_print_result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"⚠️  Regression: {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Traversal template benchmark: client CPU per request for the hot queries.
+
+For find_by_property and find_fastest_path, compares building the traversal
+with the fluent API (previous behaviour) against instantiating a
+TraversalTemplate, and the script endpoint request. Each variant includes the
+GraphBinary serialization of the request message, as sent by the driver.
+The server side (script compiled and cached once vs. bytecode translated per
+request) needs a live Gremlin Server and is not measured here.
+
+    python -m benchmarks.templates --requests 20000
+"""
+import argparse
+import gc
+import time
+import uuid
+from typing import Callable
+
+from gremlin_python.driver.request import RequestMessage
+from gremlin_python.driver.serializer import GraphBinarySerializersV1
+from gremlin_python.process.graph_traversal import GraphTraversalSource
+from gremlin_python.process.traversal import TraversalStrategies
+from gremlin_python.structure.graph import Graph
+
+from soltania_persistence.provider.tinkerpop.manager import _find_by_property_template
+from soltania_persistence.examples.metro_network.repositories.metro_repository import (
+    _fastest_path_template,
+    _fastest_path_traversal,
+)
+
+SERIALIZER = GraphBinarySerializersV1()
+ALIASES = {"g": "g"}
+
+
+def send_bytecode(bytecode) -> bytes:
+    message = RequestMessage("traversal", "bytecode", {"gremlin": bytecode, "aliases": ALIASES})
+    return SERIALIZER.serialize_message(str(uuid.uuid4()), message)
+
+
+def send_script(script: str, bindings: dict) -> bytes:
+    message = RequestMessage("", "eval", {"gremlin": script, "bindings": bindings, "aliases": ALIASES})
+    return SERIALIZER.serialize_message(str(uuid.uuid4()), message)
+
+
+def measure(name: str, fn: Callable[[int], bytes], requests: int, repeat: int) -> float:
+    """Best wall time of 'repeat' runs of 'requests' calls, cyclic GC paused."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for i in range(requests):
+                fn(i)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    print(f"{name:<34} {best / requests * 1e6:>8.1f} µs/request")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    g = GraphTraversalSource(Graph(), TraversalStrategies())
+    find = _find_by_property_template("station", "name")
+    route = _fastest_path_template(("name",), ("line",))
+
+    print(f"{args.requests:,} requests per variant (best of {args.repeat})")
+    print("find_by_property")
+    fluent = measure(
+        "  fluent bytecode",
+        lambda i: send_bytecode(g.V().hasLabel("station").has("name", f"S{i}").limit(1).elementMap().bytecode),
+        args.requests, args.repeat,
+    )
+    template = measure("  template bytecode", lambda i: send_bytecode(find.bytecode(value=f"S{i}")), args.requests, args.repeat)
+    script = measure("  template script", lambda i: send_script(find.script, {"value": f"S{i}"}), args.requests, args.repeat)
+    print(f"  speed-up: bytecode x{fluent / template:.1f}, script x{fluent / script:.1f}")
+
+    print("find_fastest_path")
+    fluent = measure(
+        "  fluent bytecode",
+        lambda i: send_bytecode(_fastest_path_traversal(g, i, i + 1, ["name"], ["line"]).bytecode),
+        args.requests, args.repeat,
+    )
+    template = measure("  template bytecode", lambda i: send_bytecode(route.bytecode(start=i, end=i + 1)), args.requests, args.repeat)
+    script = measure("  template script", lambda i: send_script(route.script, {"start": i, "end": i + 1}), args.requests, args.repeat)
+    print(f"  speed-up: bytecode x{fluent / template:.1f}, script x{fluent / script:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,30 @@
-# Expose the public API
-from .core.domain import BaseEntity
-from .core.interfaces import EntityManager, Repository
+# Expose the public API. The modules are imported on first access, so that
+# 'import soltania_persistence.config' (or a CLI printing its usage) does not
+# pay for pydantic models and providers it does not use.
+import importlib
+from typing import Any
 
-__all__ = ["BaseEntity", "Repository", "EntityManager"]
+_EXPORTS = {
+    "BaseEntity": ".core.domain",
+    "Repository": ".core.interfaces",
+    "EntityManager": ".core.interfaces",
+    "AsyncEntityManager": ".core.interfaces",
+    "GraphSync": ".core.sync",
+    "UnitOfWork": ".core.unit_of_work",
+    "open_entity_manager": ".core.registry",
+    "register_provider": ".core.registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
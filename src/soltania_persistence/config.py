@@ -1,6 +1,7 @@
+import functools
 import sys
 import os
-from typing import Tuple, Type, Any, List
+from typing import Tuple, Type, Any, List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict
 
@@ -40,16 +41,59 @@ class AppConfig(BaseSettings):
     Définition centralisée de la configuration.
     """
     
+    # Backend choisi par le schéma de l'URL (ws://, wss://, memory://) ; None = gremlin_url
+    persistence_url: Optional[str] = Field(default=None, description="URL du backend de persistance")
+
     # Définition des variables (insensible à la casse)
     gremlin_host: str = Field(default="localhost", description="IP du serveur Gremlin")
     gremlin_port: int = Field(default=8182, description="Port du serveur Gremlin")
     gremlin_protocol: str = Field(default="ws", description="Protocole (ws ou wss)")
 
+    # Réglages du driver (None = valeur par défaut de gremlinpython)
+    gremlin_pool_size: Optional[int] = Field(default=None, description="Nombre de connexions websocket du pool")
+    gremlin_max_workers: Optional[int] = Field(default=None, description="Threads du driver (défaut: taille du pool)")
+    gremlin_max_content_length: int = Field(default=10 * 1024 * 1024, description="Taille max d'une réponse (octets)")
+    gremlin_message_serializer: str = Field(default="graphbinary", description="Sérialiseur (graphbinary, graphson, graphson-v2)")
+
+    # Journal des requêtes lentes (None = désactivé)
+    gremlin_slow_query_threshold: Optional[float] = Field(default=None, description="Durée (secondes) au-delà de laquelle une traversée est journalisée")
+    gremlin_slow_query_profile: bool = Field(default=False, description="Rejoue les traversées lentes (lecture seule) avec profile()")
+
+    # Templates de traversées : envoyés en bytecode, ou en script (compilé une fois et mis en cache par le serveur)
+    gremlin_script_templates: bool = Field(default=False, description="Exécute les templates via le endpoint script")
+
+    # Index des clés déclarées (indexed / unique) créés par ensure_schema()
+    gremlin_schema_dialect: Optional[str] = Field(default=None, description="Serveur cible des index (tinkergraph, janusgraph)")
+    gremlin_unindexed_lookup_threshold: Optional[int] = Field(default=10_000, description="Taille de label au-delà de laquelle une recherche non indexée est signalée")
+
     @property
     def gremlin_url(self) -> str:
         """Helper pour construire l'URL complète"""
         return f"{self.gremlin_protocol}://{self.gremlin_host}:{self.gremlin_port}/gremlin"
 
+    @property
+    def entity_manager_url(self) -> str:
+        """URL passée au registre des providers (core.registry)"""
+        return self.persistence_url or self.gremlin_url
+
+    @property
+    def gremlin_driver_options(self) -> dict[str, Any]:
+        """Options du driver, à passer telles quelles au GremlinEntityManager"""
+        return {
+            "pool_size": self.gremlin_pool_size,
+            "max_workers": self.gremlin_max_workers,
+            "max_content_length": self.gremlin_max_content_length,
+            "message_serializer": self.gremlin_message_serializer,
+        }
+
+    @property
+    def gremlin_slow_query_options(self) -> dict[str, Any]:
+        """Réglages du journal des requêtes lentes du GremlinEntityManager"""
+        return {
+            "slow_query_threshold": self.gremlin_slow_query_threshold,
+            "profile_slow_queries": self.gremlin_slow_query_profile,
+        }
+
     # --- 3. Configuration de la hiérarchie de chargement ---
     model_config = SettingsConfigDict(
         # Utilisation de la liste filtrée (sans None)
@@ -75,5 +119,15 @@ class AppConfig(BaseSettings):
             init_settings,                       # 4. Defaults
         )
 
-# Instanciation unique
-settings = AppConfig()
\ No newline at end of file
+# Instanciation unique et paresseuse : la lecture des fichiers .env, de
+# l'environnement et de sys.argv n'a lieu qu'au premier accès
+@functools.lru_cache(maxsize=None)
+def get_settings() -> AppConfig:
+    return AppConfig()
+
+
+def __getattr__(name: str) -> Any:
+    # 'from soltania_persistence.config import settings' reste valable
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
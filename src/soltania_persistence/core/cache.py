@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Optional, Set, Tuple, TypeVar
+
+from .domain import BaseEntity, ID
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Secondary key of the identity map: (label, property names, property values)
+NaturalKey = Tuple[str, Tuple[str, ...], Tuple[Any, ...]]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters of a cache (used to size it)."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe bounded mapping with Least-Recently-Used eviction.
+    A max_size of 0 disables the cache (every lookup is a miss, nothing is stored).
+    With a 'ttl' (seconds), entries older than ttl are dropped on access.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if max_size < 0:
+            raise ValueError("max_size must be >= 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be > 0")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._expires: Dict[K, float] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            if self.ttl is not None and key in self._data and self._expires[key] <= self._clock():
+                self.pop(key)
+                self.expirations += 1
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def peek(self, key: K) -> Optional[V]:
+        """Like get(), for a lookup already counted by the caller: no hit, miss or recency change."""
+        with self._lock:
+            if key in self._data and (self.ttl is None or self._expires[key] > self._clock()):
+                return self._data[key]
+            return None
+
+    def put(self, key: K, value: V) -> None:
+        if self.max_size == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = self._clock() + self.ttl
+            while len(self._data) > self.max_size:
+                evicted_key, evicted_value = self._data.popitem(last=False)
+                self._expires.pop(evicted_key, None)
+                self.evictions += 1
+                self._on_evict(evicted_key, evicted_value)
+
+    def pop(self, key: K) -> Optional[V]:
+        with self._lock:
+            self._expires.pop(key, None)
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self.hits, self.misses, self.evictions, len(self._data), self.max_size, self.expirations
+            )
+
+    def _on_evict(self, key: K, value: V) -> None:
+        """Hook for subclasses to drop data attached to an evicted entry."""
+        pass
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+
+class IdentityMap(LRUCache[ID, BaseEntity]):
+    """
+    First-level cache of the persistence context (like the JPA persistence context).
+    Entities are stored once, keyed by id, and can also be reached through natural
+    keys (label, property names, property values). The same instance is returned
+    for every lookup until it is evicted or invalidated.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        super().__init__(max_size)
+        self._by_key: Dict[NaturalKey, ID] = {}
+        self._keys_of: Dict[ID, Set[NaturalKey]] = {}
+
+    @staticmethod
+    def natural_key(label: str, fields: Iterable[str], values: Iterable[Any]) -> Optional[NaturalKey]:
+        """Builds a secondary key, or None when a value cannot be hashed."""
+        key = (label, tuple(fields), tuple(values))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def find(self, key: Optional[NaturalKey]) -> Optional[BaseEntity]:
+        """Looks an entity up by natural key (counts as a hit or a miss)."""
+        with self._lock:
+            obj_id = self._by_key.get(key) if key is not None else None
+            if obj_id is None:
+                self.misses += 1
+                return None
+            return self.get(obj_id)
+
+    def register(self, entity: BaseEntity, *keys: Optional[NaturalKey]) -> None:
+        """Stores a persisted entity by id and attaches the given natural keys to it."""
+        if entity.id is None or self.max_size == 0:
+            return
+        with self._lock:
+            self.put(entity.id, entity)
+            for key in keys:
+                if key is None:
+                    continue
+                previous = self._by_key.get(key)
+                if previous is not None and previous != entity.id:
+                    self._keys_of.get(previous, set()).discard(key)
+                self._by_key[key] = entity.id
+                self._keys_of.setdefault(entity.id, set()).add(key)
+
+    def invalidate(self, entity: BaseEntity) -> None:
+        """Drops the entity and every natural key pointing to it."""
+        with self._lock:
+            if entity.id is not None:
+                self.pop(entity.id)
+                self._drop_keys(entity.id)
+
+    def invalidate_values(self, label: str, values: Dict[str, Any]) -> None:
+        """Drops single-property natural keys of 'label' that match one of 'values'."""
+        with self._lock:
+            for field, value in values.items():
+                key = self.natural_key(label, (field,), (value,))
+                obj_id = self._by_key.pop(key, None) if key is not None else None
+                if obj_id is not None:
+                    self._keys_of.get(obj_id, set()).discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._by_key.clear()
+            self._keys_of.clear()
+
+    def _on_evict(self, key: ID, value: BaseEntity) -> None:
+        self._drop_keys(key)
+
+    def _drop_keys(self, obj_id: ID) -> None:
+        for key in self._keys_of.pop(obj_id, set()):
+            self._by_key.pop(key, None)
@@ -1,29 +1,108 @@
-from typing import Optional, ClassVar, Union
-from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Dict, List, NamedTuple, Optional, ClassVar, Tuple, Type, Union
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, PrivateAttr
 
 # --- DÉFINITION DE 'ID' (C'est ce qui manquait) ---
 ID = Union[str, int]
 
+# Edge directions for eager loading: 'out' follows source -> target, 'in' the reverse
+OUT, IN = "out", "in"
+
+# Model classes by graph label, filled as the subclasses are defined
+_ENTITY_TYPES: Dict[str, Type["BaseEntity"]] = {}
+_RELATIONSHIP_TYPES: Dict[str, Type["Relationship"]] = {}
+
+
+def _register_type(registry: Dict[str, type], cls: type) -> None:
+    label = cls.__dict__.get("__label__")
+    if isinstance(label, str):
+        registry[label] = cls
+
+
+def _declared_indexes(cls: type) -> Dict[str, bool]:
+    """
+    Fields declared as lookup keys, mapped to their uniqueness. A field opts in
+    through its pydantic metadata: Field(..., json_schema_extra={"unique": True})
+    or {"indexed": True}.
+    """
+    indexes = {}
+    for name, info in cls.model_fields.items():
+        extra = info.json_schema_extra if isinstance(info.json_schema_extra, dict) else {}
+        if extra.get("unique"):
+            indexes[name] = True
+        elif extra.get("indexed"):
+            indexes[name] = False
+    return indexes
+
+
+def entity_type(label: str) -> Optional[Type["BaseEntity"]]:
+    """Entity class mapped to a vertex label, if one has been defined."""
+    return _ENTITY_TYPES.get(label)
+
+
+def relationship_type(label: str) -> Optional[Type["Relationship"]]:
+    """Relationship class mapped to an edge label, if one has been defined."""
+    return _RELATIONSHIP_TYPES.get(label)
+
+
+def relation_label(relation: Union[str, Type["Relationship"]]) -> str:
+    """Edge label of a relation given by label or by Relationship class."""
+    return relation if isinstance(relation, str) else relation.__label__
+
+
+class Related(NamedTuple):
+    """An eagerly loaded edge: its Relationship model and the entity at the other end."""
+    relationship: "Relationship"
+    entity: "BaseEntity"
+
 class BaseEntity(BaseModel):
     """
     Base class for all persistent entities (equivalent to @Entity).
     Uses Pydantic for validation.
     """
     id: Optional[ID] = Field(default=None, description="Database ID")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Creation timestamp")
     # --- AJOUT DU CHAMP MANQUANT ---
-    updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Last update timestamp")
     
     # Metadata to define the label in GraphDB or Table in SQL
     __label__: ClassVar[str]
 
+    # Declared lookup keys: field name -> unique (True) or merely indexed (False)
+    __indexes__: ClassVar[Dict[str, bool]] = {}
+
+    # Relationships loaded eagerly (include=... / prefetch()), keyed by (label, direction)
+    _related: Optional[Dict[Tuple[str, str], List[Related]]] = PrivateAttr(default=None)
+
     class Config:
         # Allows populating by field name even if an alias is defined
         populate_by_name = True
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__indexes__ = _declared_indexes(cls)
+        _register_type(_ENTITY_TYPES, cls)
+
+    def related(self, relation: Union[str, Type["Relationship"]], direction: str = OUT) -> List[Related]:
+        """Relationships loaded by include=[...] or prefetch(); KeyError if they were not loaded."""
+        key = (relation_label(relation), direction)
+        if not self._related or key not in self._related:
+            raise KeyError(f"Relation {key} of {type(self).__name__} was not loaded (use include= or prefetch())")
+        return self._related[key]
+
+    def _set_related(self, relation: str, direction: str, related: List[Related]) -> None:
+        if self._related is None:
+            self._related = {}
+        self._related[(relation, direction)] = related
+
 class Relationship(BaseModel):
     """
     Represents an Edge in a Graph Database.
     """
-    __label__: ClassVar[str]
\ No newline at end of file
+    __label__: ClassVar[str]
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        _register_type(_RELATIONSHIP_TYPES, cls)
\ No newline at end of file
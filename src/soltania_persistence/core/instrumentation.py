@@ -0,0 +1,184 @@
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+# (operation, label), e.g. ("find_by_property", "station")
+OperationKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class OperationEvent:
+    """One completed EntityManager operation, as reported to an Instrumentation."""
+    operation: str
+    label: str
+    duration: float
+    round_trips: int
+    results: int
+    payload_bytes: int
+    error: bool = False
+
+
+class Instrumentation(ABC):
+    """
+    Hook receiving an event after every instrumented operation.
+    Called on the thread that ran the operation: implementations must be thread-safe and fast.
+    """
+
+    @abstractmethod
+    def record(self, event: OperationEvent) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class OperationStats:
+    """Point-in-time counters of one (operation, label) pair."""
+    operation: str
+    label: str
+    count: int
+    errors: int
+    round_trips: int
+    results: int
+    payload_bytes: int
+    total_seconds: float
+    # Cumulative histogram: (upper bound, operations at most that long), +Inf last
+    buckets: Tuple[Tuple[float, int], ...]
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Latency quantile estimated from the buckets (linear interpolation inside
+        the bucket, like Prometheus' histogram_quantile). 0.0 when empty.
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower, below = 0.0, 0
+        for bound, cumulative in self.buckets:
+            if cumulative >= rank:
+                if math.isinf(bound):
+                    return lower
+                inside = cumulative - below
+                return lower + (bound - lower) * ((rank - below) / inside if inside else 0.0)
+            lower, below = bound, cumulative
+        return lower
+
+
+class _Series:
+    __slots__ = ("count", "errors", "round_trips", "results", "payload_bytes", "total_seconds", "counts")
+
+    def __init__(self, size: int):
+        self.count = self.errors = self.round_trips = self.results = self.payload_bytes = 0
+        self.total_seconds = 0.0
+        self.counts = [0] * size
+
+
+class MetricsCollector(Instrumentation):
+    """
+    Built-in Instrumentation: per (operation, label) latency histogram, and
+    round-trip, result, payload-size and error counters.
+    Read with snapshot(), export with to_prometheus().
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds or any(b <= 0 for b in bounds):
+            raise ValueError("buckets must be positive upper bounds")
+        self.bounds: Tuple[float, ...] = tuple(bounds)
+        self._series: Dict[OperationKey, _Series] = {}
+        self._lock = threading.Lock()
+
+    def record(self, event: OperationEvent) -> None:
+        key = (event.operation, event.label)
+        # Index of the first bound >= duration (len(bounds) is the +Inf bucket)
+        slot = bisect_left(self.bounds, event.duration)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.bounds) + 1)
+            series.count += 1
+            series.errors += event.error
+            series.round_trips += event.round_trips
+            series.results += event.results
+            series.payload_bytes += event.payload_bytes
+            series.total_seconds += event.duration
+            series.counts[slot] += 1
+
+    def snapshot(self) -> Dict[OperationKey, OperationStats]:
+        """Copy of every series, keyed by (operation, label)."""
+        with self._lock:
+            items = [(key, series, list(series.counts)) for key, series in self._series.items()]
+            stats = {}
+            for (operation, label), series, counts in items:
+                cumulative, running = [], 0
+                for bound, count in zip(self.bounds + (math.inf,), counts):
+                    running += count
+                    cumulative.append((bound, running))
+                stats[(operation, label)] = OperationStats(
+                    operation, label, series.count, series.errors, series.round_trips,
+                    series.results, series.payload_bytes, series.total_seconds, tuple(cumulative),
+                )
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def to_prometheus(self, prefix: str = "soltania") -> str:
+        """Current snapshot in the Prometheus text exposition format."""
+        return export_prometheus(self.snapshot(), prefix)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_float(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value))
+
+
+def export_prometheus(snapshot: Dict[OperationKey, OperationStats], prefix: str = "soltania") -> str:
+    """
+    Renders a snapshot in the Prometheus text format (version 0.0.4), e.g. to be
+    written to a node_exporter textfile or served by any HTTP endpoint.
+    """
+    stats = [snapshot[key] for key in sorted(snapshot)]
+    name = f"{prefix}_operation"
+    lines: List[str] = [
+        f"# HELP {name}_duration_seconds Latency of EntityManager operations.",
+        f"# TYPE {name}_duration_seconds histogram",
+    ]
+    for s in stats:
+        labels = f'operation="{_escape(s.operation)}",label="{_escape(s.label)}"'
+        for bound, cumulative in s.buckets:
+            lines.append(f'{name}_duration_seconds_bucket{{{labels},le="{_format_float(bound)}"}} {cumulative}')
+        lines.append(f"{name}_duration_seconds_sum{{{labels}}} {_format_float(s.total_seconds)}")
+        lines.append(f"{name}_duration_seconds_count{{{labels}}} {s.count}")
+
+    counters = (
+        ("round_trips", "Requests sent to the server.", "round_trips"),
+        ("results", "Results returned by the server.", "results"),
+        ("payload_bytes", "Approximate size of the returned results in bytes.", "payload_bytes"),
+        ("errors", "Operations that raised.", "errors"),
+    )
+    for metric, help_text, attribute in counters:
+        lines.append(f"# HELP {name}_{metric}_total {help_text}")
+        lines.append(f"# TYPE {name}_{metric}_total counter")
+        for s in stats:
+            labels = f'operation="{_escape(s.operation)}",label="{_escape(s.label)}"'
+            lines.append(f"{name}_{metric}_total{{{labels}}} {getattr(s, attribute)}")
+    return "\n".join(lines) + "\n"
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, List, Any, Optional, Generic
-from .domain import BaseEntity, Relationship, ID
+from typing import Type, TypeVar, List, Any, Dict, Optional, Generic, Sequence, Tuple, AsyncIterator, Iterator, Union
+from .domain import OUT, BaseEntity, Relationship, ID
 
 # Generic Type definitions
 T = TypeVar("T", bound=BaseEntity)
@@ -11,14 +11,102 @@ class EntityManager(ABC):
     Interface for the Persistence Context (similar to jakarta.persistence.EntityManager).
     """
 
+    # Incremented by every write made through the manager; caches of query
+    # results compare it with the value they were filled at to detect staleness.
+    graph_version: int = 0
+
+    def _bump_version(self) -> None:
+        self.graph_version += 1
+
+    @classmethod
+    def from_url(cls, url: str, settings: Any = None, **options: Any) -> "EntityManager":
+        """
+        Builds a manager for a URL of its scheme (see core.registry). Providers
+        with configurable options read them from 'settings' (an AppConfig).
+        """
+        return cls(url, **options)
+
     @abstractmethod
     def persist(self, entity: T) -> T:
         """Saves or updates an entity."""
         pass
 
     @abstractmethod
-    def find_by_property(self, entity_class: Type[T], key: str, value: Any) -> Optional[T]:
-        """Finds a single entity by a specific property."""
+    def persist_all(self, entities: Sequence[T], batch_size: int = 100) -> List[T]:
+        """Saves several entities in batches; ids are assigned back in input order."""
+        pass
+
+    @abstractmethod
+    def upsert(self, entity: T, key_fields: Sequence[str]) -> T:
+        """Get-or-create: reuses the entity matching 'key_fields' or persists a new one."""
+        pass
+
+    @abstractmethod
+    def upsert_all(self, entities: Sequence[T], key_fields: Sequence[str], batch_size: int = 100) -> List[T]:
+        """Batched get-or-create; ids are assigned back in input order."""
+        pass
+
+    @abstractmethod
+    def update_all(self, changes: Sequence[Tuple[BaseEntity, Dict[str, Any]]], batch_size: int = 100) -> None:
+        """
+        Writes property changes of saved entities in batches. Each item is an
+        (entity, {property: new value}) pair; a None value removes the property.
+        """
+        pass
+
+    def update(self, entity: T, fields: Optional[Sequence[str]] = None) -> T:
+        """Writes the given fields (all of them by default) of a saved entity."""
+        if entity.id is None:
+            raise ValueError("Entity must be saved before being updated")
+        data = entity.model_dump(exclude={"id"})
+        if fields is not None:
+            data = {field: data[field] for field in fields}
+        self.update_all([(entity, data)])
+        return entity
+
+    @abstractmethod
+    def find(self, entity_class: Type[T], id: ID, include: Optional[Sequence[Any]] = None) -> Optional[T]:
+        """
+        Finds an entity by its database ID (similar to EntityManager.find).
+        'include' eagerly loads relations, like find_by_property.
+        """
+        pass
+
+    @abstractmethod
+    def find_by_property(
+        self,
+        entity_class: Type[T],
+        key: str,
+        value: Any,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[Any]] = None,
+    ) -> Optional[T]:
+        """
+        Finds a single entity by a specific property.
+        With 'fields', only those properties are fetched and a lightweight
+        typed record (id + fields) is returned instead of the entity.
+        With 'include' (edge labels or Relationship classes, optionally as
+        (relation, 'in') pairs), the relations are loaded with the entity
+        (similar to JPA fetch joins) and read back with entity.related().
+        """
+        pass
+
+    @abstractmethod
+    def prefetch(
+        self, entities: Sequence[T], relation: Union[str, Type[Relationship]], direction: str = OUT, batch_size: int = 100
+    ) -> List[T]:
+        """Eagerly loads one relation of many entities in batches (see find_by_property 'include')."""
+        pass
+
+    @abstractmethod
+    def find_all(self, entity_class: Type[T], **filters: Any) -> Iterator[T]:
+        """Lazily iterates over every entity matching the property filters (all of them when none)."""
+        pass
+
+    @abstractmethod
+    def stream(self, entity_class: Type[T], page_size: int = 1000, **filters: Any) -> Iterator[T]:
+        """Like find_all, fetching 'page_size' entities per round trip."""
         pass
 
     @abstractmethod
@@ -26,16 +114,150 @@ class EntityManager(ABC):
         """Creates a link (Edge) between two entities."""
         pass
 
+    @abstractmethod
+    def create_relationships(
+        self, relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]], batch_size: int = 100
+    ) -> None:
+        """Creates several links from (source, target, relation) triples in batches."""
+        pass
+
+    @abstractmethod
+    def remove_all(self, entities: Sequence[BaseEntity], batch_size: int = 100) -> None:
+        """Deletes saved entities (and their edges) in batches; unknown ids are ignored."""
+        pass
+
+    @abstractmethod
+    def remove_relationships(
+        self, relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]], batch_size: int = 100
+    ) -> None:
+        """
+        Deletes one edge per (source, target, relation) triple, matched on its
+        label, endpoints and properties, in batches.
+        """
+        pass
+
+    @abstractmethod
+    def ensure_schema(self, entity_classes: Sequence[Type[BaseEntity]]) -> List[Any]:
+        """
+        Creates the backend indexes of the keys declared on the classes
+        (indexed / unique fields) where the backend supports it; returns the
+        declared IndexSpec list. Safe to call again: existing indexes are kept.
+        """
+        pass
+
     @abstractmethod
     def clear_database(self):
         """Truncates the database (Dangerous)."""
         pass
-    
+
     @abstractmethod
     def close(self):
         """Closes the connection."""
         pass
 
+    def execute(self, template: Any, **values: Any) -> List[Any]:
+        """
+        Runs a parameterized traversal template (e.g. a TraversalTemplate) on
+        the manager's traversal source 'g' and returns every result.
+        """
+        return template.traversal(self.g, **values).toList()
+
+class AsyncEntityManager(ABC):
+    """
+    asyncio counterpart of EntityManager: every operation is a coroutine so many
+    requests can be in flight on the same connection pool.
+    """
+
+    # Traversal source the repositories build their queries on
+    g: Any
+
+    @abstractmethod
+    async def submit(self, t: Any) -> List[Any]:
+        """Sends a traversal built on 'g' and awaits its full result list."""
+        pass
+
+    @abstractmethod
+    async def persist(self, entity: T) -> T:
+        """Saves an entity; one that already has an id is updated."""
+        pass
+
+    @abstractmethod
+    async def update(self, entity: T) -> T:
+        """Writes every property of a saved entity."""
+        pass
+
+    @abstractmethod
+    async def persist_all(self, entities: Sequence[T], batch_size: int = 100) -> List[T]:
+        """Saves several entities in batches; ids are assigned back in input order."""
+        pass
+
+    @abstractmethod
+    async def upsert(self, entity: T, key_fields: Sequence[str]) -> T:
+        """Get-or-create: reuses the entity matching 'key_fields' or persists a new one."""
+        pass
+
+    @abstractmethod
+    async def upsert_all(self, entities: Sequence[T], key_fields: Sequence[str], batch_size: int = 100) -> List[T]:
+        """Batched get-or-create; ids are assigned back in input order."""
+        pass
+
+    @abstractmethod
+    async def find(self, entity_class: Type[T], id: ID, include: Optional[Sequence[Any]] = None) -> Optional[T]:
+        """Finds an entity by its database ID ('include': see EntityManager.find_by_property)."""
+        pass
+
+    @abstractmethod
+    async def find_by_property(
+        self,
+        entity_class: Type[T],
+        key: str,
+        value: Any,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[Any]] = None,
+    ) -> Optional[T]:
+        """
+        Finds a single entity by a specific property.
+        With 'fields', only those properties are fetched and a lightweight
+        typed record (id + fields) is returned instead of the entity.
+        'include' eagerly loads relations (see EntityManager.find_by_property).
+        """
+        pass
+
+    @abstractmethod
+    async def prefetch(
+        self, entities: Sequence[T], relation: Union[str, Type[Relationship]], direction: str = OUT, batch_size: int = 100
+    ) -> List[T]:
+        """Eagerly loads one relation of many entities in batches."""
+        pass
+
+    @abstractmethod
+    def find_all_by_property(self, entity_class: Type[T], key: str, value: Any) -> AsyncIterator[T]:
+        """Iterates asynchronously over every entity matching a property."""
+        pass
+
+    @abstractmethod
+    async def create_relationship(self, source: T, target: T, relation: R) -> None:
+        """Creates a link (Edge) between two entities."""
+        pass
+
+    @abstractmethod
+    async def create_relationships(
+        self, relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]], batch_size: int = 100
+    ) -> None:
+        """Creates several links from (source, target, relation) triples in batches."""
+        pass
+
+    @abstractmethod
+    async def clear_database(self):
+        """Truncates the database (Dangerous)."""
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """Closes the connection."""
+        pass
+
 class Repository(ABC, Generic[T]):
     """
     Base interface for all Repositories (similar to JpaRepository<T, ID>).
@@ -52,4 +274,8 @@ class Repository(ABC, Generic[T]):
     @abstractmethod
     def find_by_id(self, id: ID) -> Optional[T]:
         """Find entity by ID."""
-        pass
\ No newline at end of file
+        pass
+
+    def find_all(self, **filters: Any) -> Iterator[T]:
+        """Lazily iterates over the entities matching the property filters."""
+        return self.em.find_all(self.entity_class, **filters)
@@ -0,0 +1,63 @@
+"""
+EntityManager implementations by URL scheme.
+
+Providers are registered as "module:Class" strings and imported on first use,
+so choosing a backend costs nothing until a manager is opened (the Gremlin
+driver, aiohttp and the bytecode interpreter are only loaded by the provider
+that needs them):
+
+    em = open_entity_manager("memory://")
+    em = open_entity_manager(settings=get_settings())   # persistence_url, driver options
+"""
+import importlib
+from typing import Any, Dict, List, Optional, Type, Union
+from urllib.parse import urlsplit
+
+from .interfaces import EntityManager
+
+# URL scheme -> EntityManager class, or its "module:Class" path
+_PROVIDERS: Dict[str, Union[str, Type[EntityManager]]] = {
+    "ws": "soltania_persistence.provider.tinkerpop.manager:GremlinEntityManager",
+    "wss": "soltania_persistence.provider.tinkerpop.manager:GremlinEntityManager",
+    "memory": "soltania_persistence.provider.memory.manager:InMemoryEntityManager",
+}
+
+
+def register_provider(scheme: str, provider: Union[str, Type[EntityManager]]) -> None:
+    """Maps a URL scheme to an EntityManager class or to its "module:Class" path (imported lazily)."""
+    if isinstance(provider, str) and ":" not in provider:
+        raise ValueError(f"Provider path '{provider}' must have the form 'module:Class'")
+    _PROVIDERS[scheme.lower()] = provider
+
+
+def registered_schemes() -> List[str]:
+    return sorted(_PROVIDERS)
+
+
+def provider_for(url: str) -> Type[EntityManager]:
+    """EntityManager class of a URL, imported (once) from its registered path."""
+    scheme = urlsplit(url).scheme.lower()
+    provider = _PROVIDERS.get(scheme)
+    if provider is None:
+        raise ValueError(
+            f"No provider registered for '{scheme}://' URLs (known schemes: {registered_schemes()}); "
+            f"add one with register_provider()"
+        )
+    if isinstance(provider, str):
+        module, _, name = provider.partition(":")
+        provider = getattr(importlib.import_module(module), name)
+        _PROVIDERS[scheme] = provider
+    return provider
+
+
+def open_entity_manager(url: Optional[str] = None, settings: Any = None, **options: Any) -> EntityManager:
+    """
+    Opens the manager of 'url' (default: settings.entity_manager_url). With
+    'settings' (an AppConfig), the provider also reads its options from it;
+    keyword 'options' override them.
+    """
+    if url is None:
+        if settings is None:
+            raise ValueError("open_entity_manager() needs a URL or settings")
+        url = settings.entity_manager_url
+    return provider_for(url).from_url(url, settings, **options)
@@ -0,0 +1,92 @@
+"""
+Backend indexes for the lookup keys declared on the entity classes.
+
+A field is declared in its pydantic metadata (see BaseEntity.__indexes__):
+
+    name: str = Field(..., json_schema_extra={"unique": True})
+    category: str = Field(..., json_schema_extra={"indexed": True})
+
+EntityManager.ensure_schema() turns the declarations into IndexSpec values and,
+where the backend supports it, into the script that creates the indexes.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Type
+
+from .domain import BaseEntity
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """One declared lookup key: vertex label, property key and uniqueness."""
+    label: str
+    key: str
+    unique: bool = False
+
+    @property
+    def name(self) -> str:
+        """Index name on the backend (stable, so the bootstrap can be re-run)."""
+        return f"{self.label}_{self.key}_{'unique' if self.unique else 'index'}"
+
+
+def index_specs(entity_classes: Iterable[Type[BaseEntity]]) -> List[IndexSpec]:
+    """Indexes declared by the classes, in declaration order, without duplicates."""
+    specs: Dict[IndexSpec, None] = {}
+    for entity_class in entity_classes:
+        for key, unique in entity_class.__indexes__.items():
+            specs[IndexSpec(entity_class.__label__, key, unique)] = None
+    return list(specs)
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _tinkergraph_script(specs: List[IndexSpec]) -> str:
+    """
+    TinkerGraph indexes a property key for every label and does not enforce
+    uniqueness: one createIndex() per key not indexed yet.
+    """
+    keys = list(dict.fromkeys(spec.key for spec in specs))
+    lines = ["indexed = graph.getIndexedKeys(Vertex.class)"]
+    for key in keys:
+        lines.append(f"if (!indexed.contains({_quote(key)})) graph.createIndex({_quote(key)}, Vertex.class)")
+    lines.append(f"{len(keys)}")
+    return "\n".join(lines)
+
+
+def _janusgraph_script(specs: List[IndexSpec]) -> str:
+    """
+    JanusGraph composite indexes restricted to the label (indexOnly), unique()
+    for the unique keys; existing indexes are left untouched.
+    """
+    lines = ["mgmt = graph.openManagement()", "created = 0"]
+    for spec in specs:
+        key, label, name = _quote(spec.key), _quote(spec.label), _quote(spec.name)
+        lines += [
+            f"if (mgmt.getGraphIndex({name}) == null) {{",
+            f"  key = mgmt.getPropertyKey({key}) ?: mgmt.makePropertyKey({key}).make()",
+            f"  label = mgmt.getVertexLabel({label}) ?: mgmt.makeVertexLabel({label}).make()",
+            f"  builder = mgmt.buildIndex({name}, Vertex.class).addKey(key).indexOnly(label)",
+            "  builder.unique()" if spec.unique else "",
+            "  builder.buildCompositeIndex()",
+            "  created++",
+            "}",
+        ]
+    lines += ["mgmt.commit()", "created"]
+    return "\n".join(line for line in lines if line)
+
+
+# Index creation scripts by backend (AppConfig.gremlin_schema_dialect)
+SCHEMA_DIALECTS: Dict[str, Callable[[List[IndexSpec]], str]] = {
+    "tinkergraph": _tinkergraph_script,
+    "janusgraph": _janusgraph_script,
+}
+
+
+def schema_script(dialect: str, specs: List[IndexSpec]) -> str:
+    """Groovy script creating the 'specs' indexes on a 'dialect' server."""
+    try:
+        build = SCHEMA_DIALECTS[dialect.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown schema dialect '{dialect}' (expected one of {sorted(SCHEMA_DIALECTS)})") from None
+    return build(specs)
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .domain import BaseEntity, Relationship, ID, relationship_type
+from .interfaces import EntityManager
+
+# Incremented when the manifest layout changes; other versions trigger a rescan
+MANIFEST_VERSION = 1
+
+# Maintained by the persistence layer, not part of the imported content
+_VOLATILE_FIELDS = {"id", "created_at", "updated_at"}
+
+Link = Tuple[BaseEntity, BaseEntity, Relationship]
+
+
+def default_manifest_path(source_path: str) -> str:
+    """
+    Manifest of a source file: '<file name>.manifest.json' in the working
+    directory, since the source may ship in a read-only package directory.
+    """
+    return os.path.abspath(os.path.basename(source_path) + ".manifest.json")
+
+
+def content_hash(data: Dict[str, Any]) -> str:
+    """Stable hash of a record (canonical JSON: sorted keys, no whitespace)."""
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def entity_content(entity: BaseEntity) -> Dict[str, Any]:
+    return entity.model_dump(exclude=_VOLATILE_FIELDS)
+
+
+def vertex_key(entity: BaseEntity, key_fields: Sequence[str]) -> str:
+    return json.dumps([entity.__label__, *(getattr(entity, key) for key in key_fields)], ensure_ascii=False, default=str)
+
+
+def edge_key(source_key: str, target_key: str, relationship: Relationship) -> str:
+    """Identity of an edge: label, endpoints and properties (two lines between the same stations are two edges)."""
+    properties = relationship.model_dump(mode="json", exclude_none=True)
+    return json.dumps([relationship.__label__, source_key, target_key, properties], sort_keys=True, ensure_ascii=False)
+
+
+@dataclass
+class Manifest:
+    """
+    What the last sync wrote: per vertex key its content hash and graph id,
+    per edge key the number of such edges.
+    """
+    vertices: Dict[str, Tuple[str, ID]] = field(default_factory=dict)
+    edges: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Manifest"]:
+        """The manifest at 'path', or None if it is missing, unreadable or from another version."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return cls({k: (v[0], v[1]) for k, v in data["vertices"].items()}, dict(data["edges"]))
+
+    def save(self, path: str) -> None:
+        """Written next to 'path' then renamed, so a crash never leaves half a manifest."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "synced_at": datetime.now(timezone.utc).isoformat(),
+            "vertices": {k: list(v) for k, v in self.vertices.items()},
+            "edges": self.edges,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class SyncPlan:
+    """Writes needed to bring the graph from the baseline to the desired records."""
+    inserts: List[BaseEntity] = field(default_factory=list)
+    updates: List[BaseEntity] = field(default_factory=list)
+    deletes: List[BaseEntity] = field(default_factory=list)
+    edge_inserts: List[Link] = field(default_factory=list)
+    edge_deletes: List[Link] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.inserts or self.updates or self.deletes or self.edge_inserts or self.edge_deletes)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.inserts)} inserted, {len(self.updates)} updated, {len(self.deletes)} deleted, "
+            f"{self.unchanged} unchanged; edges: {len(self.edge_inserts)} inserted, {len(self.edge_deletes)} deleted"
+        )
+
+
+class GraphSync:
+    """
+    Incremental, idempotent import: the desired entities and links are hashed
+    and compared with a manifest of the previous sync, and only the difference
+    is written, in batches (upsert_all, update_all, remove_relationships,
+    remove_all, create_relationships). An unchanged source costs no round trip.
+
+    Without a usable manifest (first run, deleted file, rescan=True), the
+    baseline is read from the graph itself, so a graph filled by the old full
+    reload is repaired: duplicate vertices and edges are deleted.
+    """
+
+    def __init__(self, em: EntityManager, manifest_path: str, batch_size: int = 100):
+        self.em = em
+        self.manifest_path = manifest_path
+        self.batch_size = batch_size
+
+    def plan(
+        self,
+        entities: Sequence[BaseEntity],
+        key_fields: Sequence[str],
+        links: Sequence[Link] = (),
+        rescan: bool = False,
+    ) -> Tuple[SyncPlan, Manifest]:
+        """Diff between the baseline and the desired state, and the manifest to save once it is applied."""
+        baseline = None if rescan else Manifest.load(self.manifest_path)
+        # Entities / links read from the graph by a rescan, reused for the deletes
+        scanned: Dict[str, Any] = {}
+        if baseline is None:
+            baseline, scanned = self._scan(entities, key_fields, links)
+
+        plan, manifest = SyncPlan(), Manifest()
+        desired: Dict[str, BaseEntity] = {}
+        for entity in entities:
+            key = vertex_key(entity, key_fields)
+            if key in desired:
+                raise ValueError(f"Duplicate record {key} in the source")
+            desired[key] = entity
+
+            digest = content_hash(entity_content(entity))
+            known = baseline.vertices.get(key)
+            if known is None:
+                plan.inserts.append(entity)
+            else:
+                entity.id = known[1]
+                if known[0] == digest:
+                    plan.unchanged += 1
+                else:
+                    plan.updates.append(entity)
+            manifest.vertices[key] = (digest, entity.id)
+
+        deleted_ids = set()
+        for key, (_, obj_id) in baseline.vertices.items():
+            if key not in desired:
+                plan.deletes.append(scanned.get(key) or BaseEntity(id=obj_id))
+                deleted_ids.add(obj_id)
+
+        keys_of = {id(entity): key for key, entity in desired.items()}
+        wanted: Counter = Counter()
+        samples: Dict[str, Link] = {}
+        for source, target, relationship in links:
+            if id(source) not in keys_of or id(target) not in keys_of:
+                raise ValueError("Links must connect entities of the same sync")
+            key = edge_key(keys_of[id(source)], keys_of[id(target)], relationship)
+            wanted[key] += 1
+            samples.setdefault(key, (source, target, relationship))
+        manifest.edges = dict(wanted)
+
+        for key, count in wanted.items():
+            plan.edge_inserts.extend([samples[key]] * max(count - baseline.edges.get(key, 0), 0))
+        for key, count in baseline.edges.items():
+            extra = count - wanted.get(key, 0)
+            link = (scanned.get(key) or self._link(key, baseline)) if extra > 0 else None
+            # Edges of a deleted vertex go with it
+            if link is not None and not {link[0].id, link[1].id} & deleted_ids:
+                plan.edge_deletes.extend([link] * extra)
+        return plan, manifest
+
+    def sync(
+        self,
+        entities: Sequence[BaseEntity],
+        key_fields: Sequence[str],
+        links: Sequence[Link] = (),
+        rescan: bool = False,
+    ) -> SyncPlan:
+        """Applies the plan and saves the new manifest; returns what was written."""
+        entities = list(entities)
+        plan, manifest = self.plan(entities, key_fields, links, rescan)
+        if plan.is_empty:
+            if rescan or not os.path.exists(self.manifest_path):
+                manifest.save(self.manifest_path)
+            return plan
+
+        try:
+            if plan.inserts:
+                self.em.upsert_all(plan.inserts, key_fields, batch_size=self.batch_size)
+            if plan.updates:
+                now = datetime.now(timezone.utc)
+                changes = []
+                for entity in plan.updates:
+                    entity.updated_at = now
+                    changes.append((entity, {**entity_content(entity), "updated_at": now}))
+                self.em.update_all(changes, batch_size=self.batch_size)
+            if plan.edge_deletes:
+                self.em.remove_relationships(plan.edge_deletes, batch_size=self.batch_size)
+            if plan.deletes:
+                self.em.remove_all(plan.deletes, batch_size=self.batch_size)
+            if plan.edge_inserts:
+                self.em.create_relationships(plan.edge_inserts, batch_size=self.batch_size)
+        except Exception as e:
+            # The graph is now between two states: rebuild the baseline from it next time
+            print(f"❌ Sync failed, the next run will rescan the graph: {e}")
+            if os.path.exists(self.manifest_path):
+                os.remove(self.manifest_path)
+            raise e
+
+        for key, entity in zip(list(manifest.vertices), entities):
+            manifest.vertices[key] = (manifest.vertices[key][0], entity.id)
+        manifest.save(self.manifest_path)
+        return plan
+
+    # --- Baseline from the graph ---------------------------------------------
+
+    def _scan(
+        self, entities: Sequence[BaseEntity], key_fields: Sequence[str], links: Sequence[Link]
+    ) -> Tuple[Manifest, Dict[str, Any]]:
+        """
+        Manifest equivalent of the graph content for the labels being synced
+        (one stream per entity class, one prefetch per relationship class),
+        with the scanned entities and links by key.
+        """
+        manifest, scanned = Manifest(), {}
+        classes = list(dict.fromkeys(type(entity) for entity in entities))
+        relations = list(dict.fromkeys(type(link[2]) for link in links))
+
+        found: List[BaseEntity] = []
+        keys_by_id: Dict[ID, str] = {}
+        for entity_class in classes:
+            for entity in self.em.stream(entity_class):
+                key = vertex_key(entity, key_fields)
+                if key in manifest.vertices:
+                    # Same key twice (left by earlier full reloads): the extra vertex is deleted
+                    key = json.dumps(["duplicate", entity.id], default=str)
+                manifest.vertices[key] = (content_hash(entity_content(entity)), entity.id)
+                scanned[key] = entity
+                keys_by_id[entity.id] = key
+                found.append(entity)
+
+        for relation in relations:
+            self.em.prefetch(found, relation, batch_size=self.batch_size)
+            for entity in found:
+                for related in entity.related(relation):
+                    target_key = keys_by_id.get(related.entity.id)
+                    if target_key is None:
+                        continue
+                    key = edge_key(keys_by_id[entity.id], target_key, related.relationship)
+                    manifest.edges[key] = manifest.edges.get(key, 0) + 1
+                    scanned.setdefault(key, (entity, related.entity, related.relationship))
+        return manifest, scanned
+
+    @staticmethod
+    def _link(key: str, baseline: Manifest) -> Optional[Link]:
+        """(source, target, relationship) of an edge known only from the manifest."""
+        label, source_key, target_key, properties = json.loads(key)
+        source, target = baseline.vertices.get(source_key), baseline.vertices.get(target_key)
+        relationship_class = relationship_type(label)
+        if source is None or target is None or relationship_class is None:
+            return None
+        return BaseEntity(id=source[1]), BaseEntity(id=target[1]), relationship_class(**properties)
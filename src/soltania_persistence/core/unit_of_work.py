@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from .domain import BaseEntity, Relationship, ID
+from .interfaces import EntityManager
+
+T = TypeVar("T", bound=BaseEntity)
+
+# Fields maintained by the unit of work itself, never compared
+_UNTRACKED = {"id", "updated_at"}
+
+
+def _snapshot(entity: BaseEntity) -> Dict[str, Any]:
+    return entity.model_dump(exclude=_UNTRACKED)
+
+
+class UnitOfWork:
+    """
+    Write-behind session over an EntityManager (like a Hibernate Session).
+
+    New entities, changes to tracked entities and new relationships are queued
+    and only written on flush()/commit(), each kind as one batched call:
+    persist_all() for the new vertices (upsert_all() for those added with
+    'key_fields'; ids assigned back), update_all() with just the modified
+    properties, then create_relationships(). Relationships may reference
+    entities that are still queued.
+
+        with UnitOfWork(em) as uow:
+            python = uow.find_by_property(LearningUnit, "slug", "python")
+            python.hours = 40                     # only 'hours' is written
+            django = uow.add(LearningUnit(slug="django", title="Django", category="web", hours=30))
+            uow.relate(python, django, Dependency(type="required"))
+        # committed here; discarded if the block raised
+
+    Writes are not transactional: a failing batch leaves the previous ones applied.
+    """
+
+    def __init__(self, em: EntityManager, batch_size: int = 100):
+        self.em = em
+        self.batch_size = batch_size
+        # Keyed by id() of the Python object: entities are mutable, hence unhashable
+        self._new: Dict[int, Tuple[BaseEntity, Tuple[str, ...]]] = {}
+        self._tracked: Dict[int, Tuple[BaseEntity, Dict[str, Any]]] = {}
+        self._relationships: List[Tuple[BaseEntity, BaseEntity, Relationship]] = []
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    # --- Registration -------------------------------------------------------
+
+    def add(self, entity: T, key_fields: Sequence[str] = ()) -> T:
+        """
+        Queues a new entity; with 'key_fields' it is upserted on flush (get-or-create).
+        A saved entity (id set) is tracked with every field dirty.
+        """
+        if entity.id is not None:
+            self._tracked[id(entity)] = (entity, {})
+        elif id(entity) not in self._tracked:
+            self._new[id(entity)] = (entity, tuple(key_fields))
+        return entity
+
+    def add_all(self, entities: Iterable[T], key_fields: Sequence[str] = ()) -> List[T]:
+        return [self.add(entity, key_fields) for entity in entities]
+
+    def track(self, entity: T) -> T:
+        """Attaches a saved entity: later changes to its fields are written on flush."""
+        if entity.id is None:
+            return self.add(entity)
+        if id(entity) not in self._tracked:
+            self._tracked[id(entity)] = (entity, _snapshot(entity))
+        return entity
+
+    def find(self, entity_class: Type[T], entity_id: ID) -> Optional[T]:
+        """EntityManager.find, the result being tracked."""
+        entity = self.em.find(entity_class, entity_id)
+        return self.track(entity) if entity is not None else None
+
+    def find_by_property(self, entity_class: Type[T], key: str, value: Any) -> Optional[T]:
+        """EntityManager.find_by_property, the result being tracked."""
+        entity = self.em.find_by_property(entity_class, key, value)
+        return self.track(entity) if entity is not None else None
+
+    def relate(self, source: BaseEntity, target: BaseEntity, relationship: Relationship) -> None:
+        """Queues an edge; unsaved endpoints must be added to this unit of work."""
+        for entity in (source, target):
+            if entity.id is None and id(entity) not in self._new:
+                raise ValueError(f"{type(entity).__name__} must be saved or added before being related")
+        self._relationships.append((source, target, relationship))
+
+    # --- Change detection ---------------------------------------------------
+
+    def dirty_fields(self, entity: BaseEntity) -> Dict[str, Any]:
+        """Fields of a tracked entity that differ from its snapshot, with their new values."""
+        _, snapshot = self._tracked[id(entity)]
+        current = _snapshot(entity)
+        return {key: value for key, value in current.items() if key not in snapshot or snapshot[key] != value}
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self._new or self._relationships or any(self.dirty_fields(e) for e, _ in self._tracked.values()))
+
+    # --- Flush --------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Writes the queued work in batches; tracked entities stay attached."""
+        if self._new:
+            by_keys: Dict[Tuple[str, ...], List[BaseEntity]] = {}
+            for entity, key_fields in self._new.values():
+                by_keys.setdefault(key_fields, []).append(entity)
+            for key_fields, entities in by_keys.items():
+                if key_fields:
+                    self.em.upsert_all(entities, key_fields, batch_size=self.batch_size)
+                else:
+                    self.em.persist_all(entities, batch_size=self.batch_size)
+                # Saved from here on: a failure below must not insert them twice
+                for entity in entities:
+                    del self._new[id(entity)]
+                    self._tracked[id(entity)] = (entity, _snapshot(entity))
+
+        changes = []
+        for entity, _ in self._tracked.values():
+            dirty = self.dirty_fields(entity)
+            if dirty:
+                entity.updated_at = datetime.now(timezone.utc)
+                changes.append((entity, {**dirty, "updated_at": entity.updated_at}))
+        if changes:
+            self.em.update_all(changes, batch_size=self.batch_size)
+            for entity, _ in changes:
+                self._tracked[id(entity)] = (entity, _snapshot(entity))
+
+        if self._relationships:
+            self.em.create_relationships(self._relationships, batch_size=self.batch_size)
+            self._relationships.clear()
+
+    def commit(self) -> None:
+        """Flushes the queued work and detaches every entity."""
+        self.flush()
+        self._tracked.clear()
+
+    def rollback(self) -> None:
+        """Discards the work queued since the last flush (in-memory objects are left as they are)."""
+        self._new.clear()
+        self._tracked.clear()
+        self._relationships.clear()
@@ -1,9 +1,9 @@
 import sys
 import os
-import asyncio
 
 # --- WINDOWS FIX ---
 if sys.platform == 'win32':
+    import asyncio
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 # -------------------
 
@@ -12,77 +12,76 @@ src_path = os.path.abspath(os.path.join(current_dir, "../../../"))
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from soltania_persistence.config import settings
-from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
-from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
-from soltania_persistence.examples.learning_paths.services.importer import CurriculumImporter
+# The settings, the driver and the repositories are imported by the commands
+# that use them: 'help' starts without any of them, 'drop' without the models
 
-def get_prop(element_map, key):
-    """Helper for elementMap extraction."""
-    if not isinstance(element_map, dict): return str(element_map)
-    if key in element_map: return element_map[key]
-    for k, v in element_map.items():
-        if str(k) == key: return v
-    return "???"
+USAGE = "Usage: python main.py [help|drop|load|sync [--rescan]|roadmap <slug>]"
 
 def main():
-    em = GremlinEntityManager(settings.gremlin_url)
-    repo = CurriculumRepository(em)
-    
     cmd = sys.argv[1] if len(sys.argv) > 1 else "help"
+    if cmd not in ("drop", "load", "sync", "roadmap"):
+        print(USAGE)
+        return
+
+    from soltania_persistence.config import get_settings
+    from soltania_persistence.core.registry import open_entity_manager
+
+    # Provider picked by URL scheme (ws://, wss://, memory://), options from the configuration
+    em = open_entity_manager(settings=get_settings())
 
     if cmd == "drop":
         print("💥 Clearing database...")
         em.g.V().drop().iterate()
+        from soltania_persistence.core.sync import default_manifest_path
+        manifest_path = default_manifest_path("curriculum.json")
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
         em.close()
         return
 
+    from soltania_persistence.examples.learning_paths.models.nodes import LearningUnit
+    from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+    from soltania_persistence.examples.learning_paths.services.importer import CurriculumImporter
+
+    repo = CurriculumRepository(em)
+
     if cmd == "load":
         json_path = os.path.join(current_dir, "data", "curriculum.json")
+        em.ensure_schema([LearningUnit])
         importer = CurriculumImporter(repo, json_path)
         importer.run()
         em.close()
         return
 
+    if cmd == "sync":
+        json_path = os.path.join(current_dir, "data", "curriculum.json")
+        importer = CurriculumImporter(repo, json_path)
+        importer.sync(rescan="--rescan" in sys.argv)
+        em.close()
+        return
+
     if cmd == "roadmap":
         target_slug = sys.argv[2] if len(sys.argv) > 2 else "devops_pro"
-        raw_paths = repo.get_roadmap(target_slug)
+        # Seuls le titre, le slug et les heures sont affichés
+        roadmap = repo.get_roadmap_dag(target_slug, fields=["title"])
         
         print(f"\n🗺️  ROADMAP TO: {target_slug}")
         print("="*40)
         
-        # Le résultat est une liste de chemins. Pour une roadmap linéaire simple,
-        # on peut extraire tous les nœuds uniques rencontrés.
-        
-        seen = set()
-        steps = []
-        
-        # Gremlin renvoie des chemins depuis la racine vers la feuille ou l'inverse selon le sens.
-        # Ici on a traversé "in" (en arrière).
-        
-        for path_obj in raw_paths:
-            # path_obj est une liste d'objets [Unit, Edge, Unit...]
-            # On parcourt à l'envers pour avoir l'ordre chronologique (Base -> Avancé)
-            nodes = [x for x in path_obj if isinstance(x, dict) and 'slug' not in str(x)] # Filtrer edges approximativement
-            
-            # Meilleure méthode : itérer sur les objets du path
-            for item in reversed(path_obj):
-                if isinstance(item, dict):
-                    # C'est un noeud (elementMap)
-                    slug = get_prop(item, 'slug')
-                    title = get_prop(item, 'title')
-                    if slug and slug not in seen and slug != "???":
-                        seen.add(slug)
-                        steps.append(title)
-
-        # Affichage
-        if steps:
-            for i, title in enumerate(steps, 1):
-                if i == len(steps):
-                     print(f"🎯 OBJETIF : {title}")
+        # Les unités arrivent déjà dédupliquées et triées (ordre topologique :
+        # prérequis d'abord, objectif en dernier).
+        if roadmap and len(roadmap.units) > 1:
+            for i, unit in enumerate(roadmap.units, 1):
+                if unit.slug == roadmap.target.slug:
+                     print(f"🎯 OBJETIF : {unit.title} ({unit.hours}h)")
                 else:
-                     print(f" {i}. {title}")
+                     print(f" {i}. {unit.title} ({unit.hours}h)")
                      print(f"    ⬇️")
+
+            print("-"*40)
+            print(f"⏱️  Total : {roadmap.total_hours}h")
+            chain = " -> ".join(unit.slug for unit in roadmap.critical_path)
+            print(f"🛤️  Chemin critique ({roadmap.critical_path_hours}h) : {chain}")
         else:
             print("No prerequisites found or target is a standalone course.")
             
@@ -90,8 +89,6 @@ def main():
         em.close()
         return
 
-    print("Usage: python main.py [drop|load|roadmap <slug>]")
-    em.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
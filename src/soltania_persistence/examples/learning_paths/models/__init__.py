@@ -1,2 +1,3 @@
 from .nodes import LearningUnit
-from .edges import Dependency
\ No newline at end of file
+from .edges import Dependency
+from .roadmap import Roadmap
@@ -1,4 +1,5 @@
 from typing import Optional
+from pydantic import Field
 from soltania_persistence.core.domain import BaseEntity
 
 class LearningUnit(BaseEntity):
@@ -7,7 +8,7 @@ class LearningUnit(BaseEntity):
     """
     __label__ = "learning_unit"
 
-    slug: str       # Unique identifier (e.g., 'linux_basics')
+    slug: str = Field(..., json_schema_extra={"unique": True})  # Unique identifier (e.g., 'linux_basics')
     title: str
-    category: str
+    category: str = Field(..., json_schema_extra={"indexed": True})
     hours: int
\ No newline at end of file
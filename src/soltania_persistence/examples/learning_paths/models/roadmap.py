@@ -0,0 +1,79 @@
+from collections import deque
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel, Field
+
+from .nodes import LearningUnit
+
+
+class Roadmap(BaseModel):
+    """
+    Deduplicated prerequisite DAG of a target unit.
+    Each unit and each dependency appears once, whatever the number of paths.
+    """
+    target: LearningUnit
+    # Every unit needed to reach the target, prerequisites first (target last)
+    units: List[LearningUnit]
+    # (prerequisite slug, unit slug) pairs between the units above
+    dependencies: List[Tuple[str, str]]
+    # Longest chain of prerequisites by hours, ending at the target
+    critical_path: List[LearningUnit] = Field(default_factory=list)
+    critical_path_hours: int = 0
+
+    @property
+    def total_hours(self) -> int:
+        """Hours needed to complete every unit of the roadmap."""
+        return sum(unit.hours for unit in self.units)
+
+    @classmethod
+    def build(
+        cls, target: LearningUnit, units: List[LearningUnit], dependencies: List[Tuple[str, str]]
+    ) -> "Roadmap":
+        """
+        Orders 'units' topologically (Kahn's algorithm, ties kept in input order)
+        and computes the critical path. Raises ValueError on a dependency cycle.
+        """
+        by_slug: Dict[str, LearningUnit] = {unit.slug: unit for unit in units}
+        by_slug.setdefault(target.slug, target)
+        prerequisites: Dict[str, List[str]] = {slug: [] for slug in by_slug}
+        followers: Dict[str, List[str]] = {slug: [] for slug in by_slug}
+        for before, after in dependencies:
+            if before in by_slug and after in by_slug:
+                prerequisites[after].append(before)
+                followers[before].append(after)
+
+        in_degree = {slug: len(prerequisites[slug]) for slug in by_slug}
+        ready = deque(slug for slug in by_slug if in_degree[slug] == 0)
+        order: List[str] = []
+        while ready:
+            slug = ready.popleft()
+            order.append(slug)
+            for follower in followers[slug]:
+                in_degree[follower] -= 1
+                if in_degree[follower] == 0:
+                    ready.append(follower)
+
+        if len(order) != len(by_slug):
+            cyclic = sorted(slug for slug, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"Prerequisite cycle between: {cyclic}")
+
+        # Longest path by hours: processed in topological order, prerequisites are final
+        best: Dict[str, int] = {}
+        via: Dict[str, str] = {}
+        for slug in order:
+            previous = max(prerequisites[slug], key=lambda p: best[p], default=None)
+            best[slug] = by_slug[slug].hours + (best[previous] if previous is not None else 0)
+            if previous is not None:
+                via[slug] = previous
+
+        chain = [target.slug]
+        while chain[-1] in via:
+            chain.append(via[chain[-1]])
+
+        return cls(
+            target=by_slug[target.slug],
+            units=[by_slug[slug] for slug in order],
+            dependencies=[(b, a) for b, a in dependencies if b in by_slug and a in by_slug],
+            critical_path=[by_slug[slug] for slug in reversed(chain)],
+            critical_path_hours=best[target.slug],
+        )
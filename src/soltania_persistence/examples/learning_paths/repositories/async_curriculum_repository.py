@@ -0,0 +1,61 @@
+from typing import Optional, List, Dict, Sequence, Tuple
+
+from soltania_persistence.core.interfaces import AsyncEntityManager
+from soltania_persistence.examples.learning_paths.models import LearningUnit, Dependency, Roadmap
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import (
+    _roadmap_dag_template,
+    _roadmap_from_result,
+    _roadmap_traversal,
+)
+
+class AsyncCurriculumRepository:
+    """asyncio variant of CurriculumRepository."""
+
+    def __init__(self, em: AsyncEntityManager):
+        self.em = em
+
+    async def find_by_slug(self, slug: str) -> Optional[LearningUnit]:
+        """Finds a unit by its unique slug."""
+        return await self.em.find_by_property(LearningUnit, "slug", slug)
+
+    async def save_unit(self, unit: LearningUnit) -> LearningUnit:
+        """Upserts a learning unit by slug (single round trip)."""
+        return await self.em.upsert(unit, key_fields=["slug"])
+
+    async def save_units(self, units: List[LearningUnit]) -> List[LearningUnit]:
+        """Batched variant of save_unit."""
+        return await self.em.upsert_all(units, key_fields=["slug"])
+
+    async def add_prerequisite(self, prerequisite: LearningUnit, target: LearningUnit):
+        """Creates a directional link: Prereq -> Target."""
+        await self.em.create_relationship(prerequisite, target, Dependency(type="required"))
+
+    async def add_prerequisites(self, links: List[Tuple[LearningUnit, LearningUnit]]):
+        """Creates many Prereq -> Target links using the batched API."""
+        await self.em.create_relationships([(p, t, Dependency(type="required")) for p, t in links])
+
+    async def get_roadmap(self, target_slug: str) -> List[Dict]:
+        """Same backward traversal as CurriculumRepository.get_roadmap."""
+        target = await self.find_by_slug(target_slug)
+        if not target:
+            return []
+
+        try:
+            return await self.em.submit(_roadmap_traversal(self.em.g, target.id))
+        except Exception as e:
+            print(f"❌ Error building roadmap: {e}")
+            return []
+
+    async def get_roadmap_dag(self, target_slug: str, fields: Optional[Sequence[str]] = None) -> Optional[Roadmap]:
+        """Same deduplicated roadmap (and projection) as CurriculumRepository.get_roadmap_dag."""
+        target = await self.find_by_slug(target_slug)
+        if not target:
+            return None
+
+        try:
+            template = _roadmap_dag_template(tuple(fields) if fields is not None else None)
+            results = await self.em.submit(template.traversal(self.em.g, target=target.id))
+        except Exception as e:
+            print(f"❌ Error building roadmap: {e}")
+            return None
+        return _roadmap_from_result(target, results[0], fields) if results else None
@@ -1,9 +1,81 @@
-from typing import Optional, List, Dict, Any
+import functools
+from typing import Optional, List, Dict, Any, Iterator, Sequence, Tuple
 from gremlin_python.process.graph_traversal import __
 from gremlin_python.process.traversal import Order
 
+from soltania_persistence.core.domain import IN
 from soltania_persistence.core.interfaces import EntityManager
-from soltania_persistence.examples.learning_paths.models import LearningUnit, Dependency
+from soltania_persistence.provider.tinkerpop.hydration import hydrator_for
+from soltania_persistence.provider.tinkerpop.projection import project_fields
+from soltania_persistence.provider.tinkerpop.templates import TraversalTemplate
+from soltania_persistence.examples.learning_paths.models import LearningUnit, Dependency, Roadmap
+
+def _roadmap_traversal(g, target_id):
+    """Builds the prerequisite path traversal (shared by the sync and async repositories)."""
+    # GREMLIN QUERY:
+    # 1. Start at target
+    # 2. Repeat: go INcoming edges (leads_to) to find prerequisites
+    # 3. Until no more prerequisites
+    # 4. Emit everything found
+    # 5. Deduplicate and return as a path list
+    return (
+        g.V(target_id)
+        .repeat(__.inE().outV().simplePath())
+        .until(__.inE().count().is_(0))
+        .emit()
+        .path()
+        .by(__.elementMap())
+    )
+
+
+def _roadmap_dag_traversal(g, target_id, fields: Optional[Sequence[str]] = None):
+    """
+    Builds the deduplicated prerequisite traversal (shared by the sync and async repositories).
+    Every ancestor is visited once (dedup() inside repeat() keeps its state across
+    loops), and the dependency edges are the incoming edges of those units, shipped
+    as {'out': id, 'in': id} pairs. Units are full element maps, or only 'fields'
+    (plus the slug and hours the roadmap needs) when a projection is given.
+    Returns a single map: {'units': [...], 'dependencies': [...]}.
+    """
+    label = Dependency.__label__
+    units = __.unfold().elementMap() if fields is None else __.unfold().map(project_fields(_roadmap_fields(fields)))
+    return (
+        g.V(target_id)
+        .emit()
+        .repeat(__.in_(label).dedup())
+        .dedup()
+        .fold()
+        .project('units', 'dependencies')
+        .by(units.fold())
+        .by(__.unfold().inE(label).project('out', 'in').by(__.outV().id_()).by(__.inV().id_()).fold())
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _roadmap_dag_template(fields: Optional[Tuple[str, ...]] = None) -> TraversalTemplate:
+    """The deduplicated roadmap traversal as a template with a 'target' parameter."""
+    return TraversalTemplate(lambda g, target: _roadmap_dag_traversal(g, target, fields), "target", name="roadmap_dag")
+
+
+def _roadmap_fields(fields: Sequence[str]) -> List[str]:
+    return list(dict.fromkeys(["slug", "hours", *fields]))
+
+
+def _roadmap_from_result(target: LearningUnit, result: Dict, fields: Optional[Sequence[str]] = None) -> Roadmap:
+    """
+    Turns the DAG traversal result into a Roadmap (topological order + critical path).
+    Projected units are assembled without validation: fields that were not fetched stay unset.
+    """
+    hydrator = hydrator_for(LearningUnit)
+    units = [hydrator.hydrate(m, trusted=fields is not None) for m in result.get('units', [])]
+    slugs = {unit.id: unit.slug for unit in units}
+    dependencies = []
+    for edge in result.get('dependencies', []):
+        before, after = slugs.get(edge['out']), slugs.get(edge['in'])
+        if before is not None and after is not None:
+            dependencies.append((before, after))
+    return Roadmap.build(target, units, dependencies)
+
 
 class CurriculumRepository:
     def __init__(self, em: EntityManager):
@@ -13,13 +85,21 @@ class CurriculumRepository:
         """Finds a unit by its unique slug."""
         return self.em.find_by_property(LearningUnit, "slug", slug)
 
+    def find_with_prerequisites(self, slug: str) -> Optional[LearningUnit]:
+        """Unit and its direct prerequisites (incoming leads_to edges) in one round trip."""
+        return self.em.find_by_property(LearningUnit, "slug", slug, include=[(Dependency, IN)])
+
+    def find_by_category(self, category: str) -> Iterator[LearningUnit]:
+        """Lazily iterates over the units of a category."""
+        return self.em.find_all(LearningUnit, category=category)
+
     def save_unit(self, unit: LearningUnit) -> LearningUnit:
-        """Upserts a learning unit."""
-        existing = self.find_by_slug(unit.slug)
-        if existing:
-            unit.id = existing.id
-            return unit
-        return self.em.persist(unit)
+        """Upserts a learning unit by slug (single round trip)."""
+        return self.em.upsert(unit, key_fields=["slug"])
+
+    def save_units(self, units: List[LearningUnit]) -> List[LearningUnit]:
+        """Batched variant of save_unit."""
+        return self.em.upsert_all(units, key_fields=["slug"])
 
     def add_prerequisite(self, prerequisite: LearningUnit, target: LearningUnit):
         """
@@ -29,6 +109,11 @@ class CurriculumRepository:
         rel = Dependency(type="required")
         self.em.create_relationship(prerequisite, target, rel)
 
+    def add_prerequisites(self, links: List[Tuple[LearningUnit, LearningUnit]]):
+        """Creates many Prereq -> Target links using the batched API."""
+        triples = [(prerequisite, target, Dependency(type="required")) for prerequisite, target in links]
+        self.em.create_relationships(triples)
+
     def get_roadmap(self, target_slug: str) -> List[Dict]:
         """
         Generates the full learning path to reach a specific target.
@@ -40,24 +125,29 @@ class CurriculumRepository:
 
         print(f"🎓 Building roadmap for: {target.title}...")
 
-        # GREMLIN QUERY:
-        # 1. Start at target
-        # 2. Repeat: go INcoming edges (leads_to) to find prerequisites
-        # 3. Until no more prerequisites
-        # 4. Emit everything found
-        # 5. Deduplicate and return as a path list
-        
         try:
-            path = (
-                self.em.g.V(target.id)
-                .repeat(__.inE().outV().simplePath())
-                .until(__.inE().count().is_(0))
-                .emit()
-                .path()
-                .by(__.elementMap())
-                .toList()
-            )
+            path = _roadmap_traversal(self.em.g, target.id).toList()
             return path
         except Exception as e:
             print(f"❌ Error building roadmap: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def get_roadmap_dag(self, target_slug: str, fields: Optional[Sequence[str]] = None) -> Optional[Roadmap]:
+        """
+        Roadmap mode returning each prerequisite once: the distinct units and
+        dependencies are fetched in one traversal, then ordered topologically
+        client-side with the critical path (in hours) to the target.
+        The result grows with the number of units, not the number of paths.
+        With 'fields' (e.g. ["title"]) only those unit properties are fetched.
+        """
+        target = self.find_by_slug(target_slug)
+        if not target:
+            return None
+
+        try:
+            template = _roadmap_dag_template(tuple(fields) if fields is not None else None)
+            results = self.em.execute(template, target=target.id)
+        except Exception as e:
+            print(f"❌ Error building roadmap: {e}")
+            return None
+        return _roadmap_from_result(target, results[0], fields) if results else None
\ No newline at end of file
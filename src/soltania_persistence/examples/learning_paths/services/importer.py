@@ -1,38 +1,34 @@
 import json
 import os
-from soltania_persistence.examples.learning_paths.models import LearningUnit
+from soltania_persistence.core.sync import GraphSync, default_manifest_path
+from soltania_persistence.core.unit_of_work import UnitOfWork
+from soltania_persistence.examples.learning_paths.models import LearningUnit, Dependency
 from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
 
 class CurriculumImporter:
-    def __init__(self, repo: CurriculumRepository, file_path: str):
+    def __init__(self, repo: CurriculumRepository, file_path: str, manifest_path=None):
         self.repo = repo
         self.file_path = file_path
+        # Last synced state (default: in the working directory)
+        self.manifest_path = manifest_path or default_manifest_path(file_path)
 
-    def run(self):
-        if not os.path.exists(self.file_path):
-            print(f"❌ File not found: {self.file_path}")
-            return
-
+    def _read(self):
+        """Units by slug and (prerequisite, unit) pairs of the JSON file."""
         with open(self.file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
         units_data = data.get("units", [])
         cache = {} # Cache to store created objects by slug
 
-        print("🔄 PASS 1: Creating Learning Units...")
         for u in units_data:
-            unit = LearningUnit(
+            cache[u["id"]] = LearningUnit(
                 slug=u["id"],
                 title=u["title"],
                 category=u["category"],
                 hours=u["hours"]
             )
-            saved = self.repo.save_unit(unit)
-            cache[u["id"]] = saved
-            print(f"   ✅ Created: {u['title']}")
 
-        print("🔗 PASS 2: Linking Prerequisites...")
-        count = 0
+        links = []
         for u in units_data:
             target_slug = u["id"]
             prereqs = u.get("prerequisites", [])
@@ -43,9 +39,47 @@ class CurriculumImporter:
                 if p_slug in cache:
                     source_node = cache[p_slug]
                     # Link: Source -> Leads To -> Target
-                    self.repo.add_prerequisite(source_node, target_node)
-                    count += 1
+                    links.append((source_node, target_node))
                 else:
                     print(f"   ⚠️ Warning: Prerequisite '{p_slug}' not found for '{target_slug}'")
 
-        print(f"✅ Import Complete: {len(cache)} units, {count} dependencies.")
\ No newline at end of file
+        return cache, links
+
+    def run(self):
+        if not os.path.exists(self.file_path):
+            print(f"❌ File not found: {self.file_path}")
+            return
+
+        cache, links = self._read()
+        uow = UnitOfWork(self.repo.em)
+
+        print("🔄 PASS 1: Queuing Learning Units...")
+        uow.add_all(cache.values(), key_fields=["slug"])
+
+        print("🔗 PASS 2: Queuing Prerequisites...")
+        for source_node, target_node in links:
+            uow.relate(source_node, target_node, Dependency(type="required"))
+
+        # Units upserted on their slug, then the links, in batches
+        uow.commit()
+        for unit in cache.values():
+            print(f"   ✅ Saved: {unit.title}")
+
+        print(f"✅ Import Complete: {len(cache)} units, {len(links)} dependencies.")
+
+    def sync(self, manifest_path=None, rescan=False):
+        """
+        Incremental import: only the units and prerequisites that changed since
+        the last sync are written (see GraphSync).
+        """
+        if not os.path.exists(self.file_path):
+            print(f"❌ File not found: {self.file_path}")
+            return None
+
+        cache, links = self._read()
+        dependencies = [(source, target, Dependency(type="required")) for source, target in links]
+
+        sync = GraphSync(self.repo.em, manifest_path or self.manifest_path)
+        plan = sync.sync(list(cache.values()), ["slug"], dependencies, rescan=rescan)
+        print(f"✅ Sync Complete: {plan.summary()}")
+        return plan
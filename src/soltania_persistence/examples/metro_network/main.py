@@ -1,9 +1,9 @@
 import sys
 import os
-import asyncio
 
 # --- WINDOWS COMPATIBILITY ---
 if sys.platform == 'win32':
+    import asyncio
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 # -----------------------------
 
@@ -13,12 +13,10 @@ src_path = os.path.abspath(os.path.join(current_dir, "../../../"))
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from soltania_persistence.config import settings
-from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+# The settings, the driver and the repositories are imported by the commands
+# that use them: 'help' starts without any of them, 'drop' without the models
 
-# Imports from the new sub-folders
-from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
-from soltania_persistence.examples.metro_network.services.importer import NetworkImporter
+USAGE = "Usage: python main.py [help|drop|load|sync [--rescan]|[--local-routing] <from> <to>]"
 
 def format_seconds(seconds):
     if not seconds: return "0s"
@@ -26,44 +24,70 @@ def format_seconds(seconds):
     secs = int(seconds % 60)
     return f"{mins} min {secs} sec"
 
-def get_prop(element_map, key):
-    """Robust helper to extract values from Gremlin elementMap (handles both String and T.key)."""
-    if not isinstance(element_map, dict): return str(element_map)
-    if key in element_map: return element_map[key]
-    for k, v in element_map.items():
-        if str(k) == key: return v
-    return "???"
-
 def main():
-    em = GremlinEntityManager(settings.gremlin_url)
-    repo = MetroRepository(em)
-    
+    local_routing = "--local-routing" in sys.argv
+    if local_routing:
+        sys.argv.remove("--local-routing")
     cmd = sys.argv[1] if len(sys.argv) > 1 else None
 
+    if cmd in ("help", "--help", "-h"):
+        print(USAGE)
+        return
+
+    from soltania_persistence.config import get_settings
+    from soltania_persistence.core.registry import open_entity_manager
+
+    # Provider picked by URL scheme (ws://, wss://, memory://), options from the configuration
+    em = open_entity_manager(settings=get_settings())
+
     # --- DROP MODE ---
     if cmd == "drop":
         print("💥 Deleting all data in the database...")
         try:
             em.g.V().drop().iterate()
+            # The sync manifest describes the graph that was just deleted
+            from soltania_persistence.core.sync import default_manifest_path
+            manifest_path = default_manifest_path("lines.json")
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
             print("✅ Database cleared.")
         except Exception as e: print(f"❌ Error: {e}")
         finally: em.close()
         return
 
+    from soltania_persistence.examples.metro_network.models import Station
+    from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+    from soltania_persistence.examples.metro_network.services.importer import NetworkImporter
+    from soltania_persistence.examples.metro_network.services.routing import RoutingEngine
+
+    # --local-routing: load the network once and compute the route in process
+    router = RoutingEngine(em) if local_routing else None
+    repo = MetroRepository(em, router=router)
+
     # --- LOAD MODE ---
     if cmd == "load":
         # Pointing to the 'data' subfolder
         json_path = os.path.join(current_dir, "data", "lines.json")
+        em.ensure_schema([Station])
         importer = NetworkImporter(repo, json_path)
         importer.run()
         em.close()
         return
 
+    # --- SYNC MODE (incremental load, --rescan to rebuild the baseline from the graph) ---
+    if cmd == "sync":
+        json_path = os.path.join(current_dir, "data", "lines.json")
+        importer = NetworkImporter(repo, json_path)
+        importer.sync(rescan="--rescan" in sys.argv)
+        em.close()
+        return
+
     # --- SEARCH MODE ---
     start = sys.argv[1] if len(sys.argv) >= 3 else "Mairie des Lilas"
     end = sys.argv[2] if len(sys.argv) >= 3 else "Chelles - Gournay"
 
-    result = repo.find_fastest_path(start, end)
+    # Only the station names and line names are displayed: fetch nothing else
+    result = repo.find_fastest_path(start, end, station_fields=["name"], connection_fields=["line"])
 
     if result:
         try:
@@ -75,7 +99,7 @@ def main():
             
             if path_data:
                 start_node = path_data[0]
-                print(f"📍 START : {get_prop(start_node, 'name')}")
+                print(f"📍 START : {start_node.name}")
                 
                 previous_line = None
 
@@ -84,8 +108,8 @@ def main():
                     edge = path_data[i]
                     next_node = path_data[i+1]
                     
-                    line_name = get_prop(edge, 'line')
-                    station_name = get_prop(next_node, 'name')
+                    line_name = edge.line
+                    station_name = next_node.name
                     
                     # Smart Display Logic
                     if line_name != previous_line:
@@ -100,7 +124,7 @@ def main():
                     previous_line = line_name
                     
                 print("="*50)
-                print(f"🏁 ARRIVAL : {get_prop(path_data[-1], 'name')}")
+                print(f"🏁 ARRIVAL : {path_data[-1].name}")
             else:
                 print("⚠️ Path found but data is empty.")
 
@@ -1,4 +1,5 @@
 from typing import Optional
+from pydantic import Field
 from soltania_persistence.core.domain import BaseEntity
 
 class Station(BaseEntity):
@@ -8,5 +9,6 @@ class Station(BaseEntity):
     # Maps to the Gremlin vertex label
     __label__ = "station"
 
-    name: str
+    # Unique key: indexed by ensure_schema(), served from the identity map
+    name: str = Field(..., json_schema_extra={"unique": True})
     zone: Optional[int] = 1
\ No newline at end of file
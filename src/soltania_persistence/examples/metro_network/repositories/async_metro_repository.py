@@ -0,0 +1,75 @@
+import asyncio
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+from soltania_persistence.core.interfaces import AsyncEntityManager
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.repositories.metro_repository import (
+    _fastest_path_template,
+    _fields_key,
+    _project_route,
+)
+
+class AsyncMetroRepository:
+    """asyncio variant of MetroRepository (same queries, awaited on the event loop)."""
+
+    def __init__(self, em: AsyncEntityManager):
+        self.em = em
+
+    async def find_by_name(self, name: str) -> Optional[Station]:
+        """Finds a station by its exact name."""
+        return await self.em.find_by_property(Station, "name", name)
+
+    async def save_station(self, station: Station) -> Station:
+        """Upserts a station by name in a single round trip."""
+        return await self.em.upsert(station, key_fields=["name"])
+
+    async def save_stations(self, stations: List[Station]) -> List[Station]:
+        """Batched variant of save_station."""
+        return await self.em.upsert_all(stations, key_fields=["name"])
+
+    async def save_connection(self, from_st: Station, to_st: Station, line: str, duration: int):
+        """Creates a bidirectional relationship between two stations."""
+        await self.save_connections([(from_st, to_st, line, duration)])
+
+    async def save_connections(self, links: List[Tuple[Station, Station, str, int]]):
+        """Creates bidirectional relationships for many (from, to, line, duration) links."""
+        triples = []
+        for from_st, to_st, line, duration in links:
+            conn = Connection(line=line, duration=duration)
+            triples.append((from_st, to_st, conn))
+            triples.append((to_st, from_st, conn))
+        await self.em.create_relationships(triples)
+
+    async def find_fastest_path(
+        self,
+        start_name: str,
+        end_name: str,
+        station_fields: Optional[Sequence[str]] = None,
+        connection_fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Same weighted search (and projection options) as MetroRepository.find_fastest_path.
+        Both station lookups are awaited concurrently.
+        """
+        start_node, end_node = await asyncio.gather(self.find_by_name(start_name), self.find_by_name(end_name))
+
+        if not start_node or not end_node:
+            print(f"❌ Unknown station: {start_name} or {end_name}")
+            return None
+
+        try:
+            results = await self.em.submit(
+                _fastest_path_template(_fields_key(station_fields), _fields_key(connection_fields))
+                .traversal(self.em.g, start=start_node.id, end=end_node.id)
+            )
+        except Exception as e:
+            if "598" in str(e):
+                print(f"⚠️ TIMEOUT: Graph complexity exceeded server limits.")
+            else:
+                print(f"⚠️ Gremlin Error: {e}")
+            return None
+
+        if not results:
+            print("❌ No path found.")
+            return None
+        return _project_route(results[0], station_fields, connection_fields)
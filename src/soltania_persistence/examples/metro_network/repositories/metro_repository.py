@@ -1,41 +1,215 @@
-from typing import Optional, Dict, Any
+import functools
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
 from gremlin_python.process.graph_traversal import __
 from gremlin_python.process.traversal import P, Operator, Order
 
+from soltania_persistence.core.cache import CacheStats, LRUCache
 from soltania_persistence.core.interfaces import EntityManager
+from soltania_persistence.provider.tinkerpop.projection import project_fields, projection_type, to_record
+from soltania_persistence.provider.tinkerpop.templates import TraversalTemplate
 # Notice the clean import from the sibling 'models' package
 from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.services.routing import RoutingEngine, TravelTimeMatrix
+
+# Default number of (start, end) routes kept by MetroRepository (0 disables the cache)
+DEFAULT_ROUTE_CACHE_SIZE = 512
+
+
+def _fastest_path_traversal(
+    g, start_id, end_id, station_fields: Optional[Sequence[str]] = None, connection_fields: Optional[Sequence[str]] = None
+):
+    """
+    Builds the weighted shortest-path traversal (shared by the sync and async repositories).
+    Path elements are full element maps, or only the requested fields when a projection is given.
+    """
+    # Optimized A* / Beam Search logic
+    return (
+        g.with_('evaluationTimeout', 90000) 
+        .withSack(0.0)
+        .V(start_id)
+        .repeat(
+            __.outE()
+            .sack(Operator.sum_).by('duration')
+            .inV()
+            .simplePath()
+            # Keep only the top 100 fastest partial paths at each step
+            .order().by(__.sack(), Order.asc)
+            .barrier(100) 
+        )
+        .until(
+            __.hasId(end_id)
+            .or_().loops().is_(P.gt(40)) # Safety limit for path depth
+        )
+        .hasId(end_id)
+        .order().by(__.sack(), Order.asc)
+        .limit(1)
+        .project('total_time', 'path_data')
+        .by(__.sack())
+        .by(_path_by(station_fields, connection_fields))
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _fastest_path_template(
+    station_fields: Optional[Tuple[str, ...]] = None, connection_fields: Optional[Tuple[str, ...]] = None
+) -> TraversalTemplate:
+    """The shortest-path traversal as a template with 'start' / 'end' parameters (one per projection)."""
+    return TraversalTemplate(
+        lambda g, start, end: _fastest_path_traversal(g, start, end, station_fields, connection_fields),
+        "start", "end",
+        name="fastest_path",
+    )
+
+
+def _path_by(station_fields: Optional[Sequence[str]], connection_fields: Optional[Sequence[str]]):
+    if station_fields is None and connection_fields is None:
+        return __.path().by(__.elementMap())
+    station_type, connection_type = _route_record_types(station_fields, connection_fields)
+    # path() modulators are applied round-robin: station, connection, station, ...
+    return __.path().by(project_fields(station_type._fields)).by(project_fields(connection_type._fields))
+
+
+def _route_record_types(station_fields: Optional[Sequence[str]], connection_fields: Optional[Sequence[str]]):
+    """Record types of a projected route (a model's fields are all kept when it is not projected)."""
+    return (
+        projection_type(Station, station_fields if station_fields is not None else list(Station.model_fields)),
+        projection_type(Connection, connection_fields if connection_fields is not None else list(Connection.model_fields)),
+    )
+
+
+def _fields_key(fields: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+    return tuple(fields) if fields is not None else None
+
+
+def _project_route(
+    result: Dict[str, Any], station_fields: Optional[Sequence[str]], connection_fields: Optional[Sequence[str]]
+) -> Dict[str, Any]:
+    """Turns the path_data maps of a route into StationRecord / ConnectionRecord tuples."""
+    if station_fields is None and connection_fields is None:
+        return result
+    station_type, connection_type = _route_record_types(station_fields, connection_fields)
+    path_data = [
+        to_record(connection_type if i % 2 else station_type, element)
+        for i, element in enumerate(result.get('path_data', []))
+    ]
+    return {'total_time': result.get('total_time'), 'path_data': path_data}
+
 
 class MetroRepository:
-    def __init__(self, em: EntityManager):
+    def __init__(
+        self,
+        em: EntityManager,
+        router: Optional[RoutingEngine] = None,
+        route_cache_size: int = DEFAULT_ROUTE_CACHE_SIZE,
+        route_cache_ttl: Optional[float] = None,
+    ):
         self.em = em
+        # Optional in-process routing engine; find_fastest_path uses it instead of the server traversal
+        self.router = router
+        # Engine used by the one-to-many APIs when no router was given
+        self._matrix_router: Optional[RoutingEngine] = None
+        # Routes by (start, end), valid for the graph version they were computed at
+        self.route_cache: LRUCache[Tuple, Dict[str, Any]] = LRUCache(route_cache_size, ttl=route_cache_ttl)
+        self._route_cache_version = em.graph_version
 
     def find_by_name(self, name: str) -> Optional[Station]:
         """Finds a station by its exact name."""
         return self.em.find_by_property(Station, "name", name)
 
+    def find_with_connections(self, name: str) -> Optional[Station]:
+        """Station and its outgoing connections (station.related(Connection)) in one round trip."""
+        return self.em.find_by_property(Station, "name", name, include=[Connection])
+
+    def stream_stations(self, page_size: int = 1000) -> Iterator[Station]:
+        """Lazily iterates over every station, one page per round trip."""
+        return self.em.stream(Station, page_size=page_size)
+
     def save_station(self, station: Station) -> Station:
         """
-        Upserts a station: checks if it exists by name, 
-        returns the existing one ID if so, otherwise persists a new one.
+        Upserts a station by name in a single round trip:
+        reuses the existing vertex ID if there is one, otherwise creates it.
         """
-        existing = self.find_by_name(station.name)
-        if existing:
-            station.id = existing.id
-            return station
-        return self.em.persist(station)
+        return self.em.upsert(station, key_fields=["name"])
+
+    def save_stations(self, stations: List[Station]) -> List[Station]:
+        """Batched variant of save_station (one round trip per chunk)."""
+        return self.em.upsert_all(stations, key_fields=["name"])
 
     def save_connection(self, from_st: Station, to_st: Station, line: str, duration: int):
         """Creates a bidirectional relationship between two stations."""
         conn = Connection(line=line, duration=duration)
+        version = self.em.graph_version
         self.em.create_relationship(from_st, to_st, conn)
         self.em.create_relationship(to_st, from_st, conn)
+        self._invalidate_routes(from_st.id, to_st.id, since=version)
 
-    def find_fastest_path(self, start_name: str, end_name: str) -> Optional[Dict[str, Any]]:
+    def save_connections(self, links: List[Tuple[Station, Station, str, int]]):
+        """
+        Creates bidirectional relationships for many (from, to, line, duration) links
+        using the batched API (one round trip per chunk instead of two per link).
+        """
+        triples = []
+        for from_st, to_st, line, duration in links:
+            conn = Connection(line=line, duration=duration)
+            triples.append((from_st, to_st, conn))
+            triples.append((to_st, from_st, conn))
+        version = self.em.graph_version
+        self.em.create_relationships(triples)
+        self._invalidate_routes(*(st.id for link in links for st in link[:2]), since=version)
+
+    def find_fastest_path(
+        self,
+        start_name: str,
+        end_name: str,
+        station_fields: Optional[Sequence[str]] = None,
+        connection_fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         Calculates the shortest path using weighted edges (duration).
         Includes 'barrier' optimization to handle complex graphs without timeout.
+        With a RoutingEngine the exact route is computed in process instead.
+
+        With 'station_fields' / 'connection_fields' (e.g. ["name"] / ["line"]) only
+        those properties are shipped and path_data holds StationRecord /
+        ConnectionRecord tuples instead of full element maps.
+
+        Found routes are cached by (start, end, projection) until the graph version
+        of the EntityManager changes (or 'route_cache_ttl' expires); the cached dict
+        is shared between callers and must not be modified.
         """
+        version = self.em.graph_version
+        if version != self._route_cache_version:
+            self.route_cache.clear()
+            self._route_cache_version = version
+
+        key = (start_name, end_name)
+        if station_fields is not None or connection_fields is not None:
+            key += (_fields_key(station_fields), _fields_key(connection_fields))
+        cached = self.route_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._compute_fastest_path(start_name, end_name, station_fields, connection_fields)
+        # Not cached if the graph changed while the route was being computed
+        if result is not None and self.em.graph_version == version:
+            self.route_cache.put(key, result)
+        return result
+
+    def route_cache_stats(self) -> CacheStats:
+        """Hit/miss/eviction/expiration counters of the route cache."""
+        return self.route_cache.stats()
+
+    def _compute_fastest_path(
+        self,
+        start_name: str,
+        end_name: str,
+        station_fields: Optional[Sequence[str]] = None,
+        connection_fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        if self.router is not None:
+            result = self._find_fastest_path_in_process(start_name, end_name)
+            return _project_route(result, station_fields, connection_fields) if result is not None else None
+
         start_node = self.find_by_name(start_name)
         end_node = self.find_by_name(end_name)
 
@@ -46,40 +220,59 @@ class MetroRepository:
         print(f"⏱️  Calculating optimized route: {start_name} -> {end_name} ...")
 
         try:
-            # Optimized A* / Beam Search logic
-            result = (
-                self.em.g.with_('evaluationTimeout', 90000) 
-                .withSack(0.0)
-                .V(start_node.id)
-                .repeat(
-                    __.outE()
-                    .sack(Operator.sum_).by('duration')
-                    .inV()
-                    .simplePath()
-                    # Keep only the top 100 fastest partial paths at each step
-                    .order().by(__.sack(), Order.asc)
-                    .barrier(100) 
-                )
-                .until(
-                    __.hasId(end_node.id)
-                    .or_().loops().is_(P.gt(40)) # Safety limit for path depth
-                )
-                .hasId(end_node.id)
-                .order().by(__.sack(), Order.asc)
-                .limit(1)
-                .project('total_time', 'path_data')
-                .by(__.sack())
-                .by(__.path().by(__.elementMap())) 
-                .next()
-            )
-            return result
-
-        except StopIteration:
-            print("❌ No path found (StopIteration).")
-            return None
+            template = _fastest_path_template(_fields_key(station_fields), _fields_key(connection_fields))
+            results = self.em.execute(template, start=start_node.id, end=end_node.id)
         except Exception as e:
             if "598" in str(e):
                 print(f"⚠️ TIMEOUT: Graph complexity exceeded server limits.")
             else:
                 print(f"⚠️ Gremlin Error: {e}")
-            return None
\ No newline at end of file
+            return None
+
+        if not results:
+            print("❌ No path found.")
+            return None
+        return _project_route(results[0], station_fields, connection_fields)
+
+    def find_fastest_paths_from(
+        self, origin: str, targets: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fastest routes from 'origin' to each target (every station by default),
+        computed with one single-source search instead of one query per pair.
+        """
+        return self._routing().find_fastest_paths_from(origin, targets)
+
+    def travel_time_matrix(
+        self, stations: Optional[List[str]] = None, processes: Optional[int] = None
+    ) -> TravelTimeMatrix:
+        """Dense origin-destination travel time matrix, origins spread over a process pool."""
+        return self._routing().travel_time_matrix(stations, processes=processes)
+
+    def _invalidate_routes(self, *station_ids, since: Optional[int] = None) -> None:
+        for engine in (self.router, self._matrix_router):
+            if engine is not None:
+                engine.invalidate(*station_ids, since=since)
+
+    def _routing(self) -> RoutingEngine:
+        if self.router is not None:
+            return self.router
+        if self._matrix_router is None:
+            self._matrix_router = RoutingEngine(self.em)
+        return self._matrix_router
+
+    def _find_fastest_path_in_process(self, start_name: str, end_name: str) -> Optional[Dict[str, Any]]:
+        """Exact Dijkstra/A* over the router snapshot (station names resolved from the snapshot too)."""
+        try:
+            if self.router.station_index(start_name) is None or self.router.station_index(end_name) is None:
+                print(f"❌ Unknown station: {start_name} or {end_name}")
+                return None
+
+            result = self.router.shortest_path(start_name, end_name)
+        except Exception as e:
+            print(f"⚠️ Routing Error: {e}")
+            return None
+
+        if result is None:
+            print("❌ No path found.")
+        return result
@@ -1,26 +1,24 @@
 import json
 import os
-from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.core.sync import GraphSync, default_manifest_path
+from soltania_persistence.core.unit_of_work import UnitOfWork
+from soltania_persistence.examples.metro_network.models import Station, Connection
 from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
 
 class NetworkImporter:
-    def __init__(self, repo: MetroRepository, file_path: str):
+    def __init__(self, repo: MetroRepository, file_path: str, manifest_path=None):
         self.repo = repo
         self.file_path = file_path
+        # Last synced state (default: in the working directory)
+        self.manifest_path = manifest_path or default_manifest_path(file_path)
 
-    def run(self):
-        """Reads the JSON file and populates the graph via the Repository."""
-        if not os.path.exists(self.file_path):
-            print(f"❌ File not found: {self.file_path}")
-            return
-
-        print(f"📖 Reading network data from {self.file_path}...")
-        
+    def _read(self):
+        """Stations (one per unique name, interchanges are shared) and links of the JSON file."""
         with open(self.file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        total_stations = 0
-        total_connections = 0
+        stations = {}
+        links = []
 
         for transport_type, type_data in data.items():
             avg_time = type_data.get("avg_stop_time", 90)
@@ -35,20 +33,60 @@ class NetworkImporter:
                 previous_station = None
 
                 for station_name in stations_list:
-                    # 1. Create or Get Station
-                    current_station = self.repo.save_station(Station(name=station_name))
-                    total_stations += 1
+                    # 1. Get or create the Station
+                    current_station = stations.get(station_name)
+                    if current_station is None:
+                        current_station = stations[station_name] = Station(name=station_name)
 
-                    # 2. Link with previous station
+                    # 2. Remember the link with the previous station
                     if previous_station:
-                        self.repo.save_connection(
-                            from_st=previous_station,
-                            to_st=current_station,
-                            line=full_line_name,
-                            duration=avg_time
-                        )
-                        total_connections += 1
+                        links.append((previous_station, current_station, full_line_name, avg_time))
                     
                     previous_station = current_station
+
+        return stations, links
+
+    def run(self):
+        """Reads the JSON file and populates the graph in a single UnitOfWork."""
+        if not os.path.exists(self.file_path):
+            print(f"❌ File not found: {self.file_path}")
+            return
+
+        print(f"📖 Reading network data from {self.file_path}...")
+        stations, links = self._read()
+        uow = UnitOfWork(self.repo.em)
+
+        # 3. Queue the stations (upserted on their name at commit) and both directions of every link
+        uow.add_all(stations.values(), key_fields=["name"])
+        for from_st, to_st, line, duration in links:
+            conn = Connection(line=line, duration=duration)
+            uow.relate(from_st, to_st, conn)
+            uow.relate(to_st, from_st, conn)
+
+        # 4. Upsert the stations, then send the links, in batches
+        print(f"   Saving {len(stations)} stations and linking {len(links)} connections...")
+        uow.commit()
         
-        print(f"✅ Import Complete: {total_stations} stations processed, {total_connections} links created.")
\ No newline at end of file
+        print(f"✅ Import Complete: {len(stations)} stations processed, {len(links)} links created.")
+
+    def sync(self, manifest_path=None, rescan=False):
+        """
+        Incremental import: only the stations and connections that changed since
+        the last sync are written (see GraphSync). Safe to run every night.
+        """
+        if not os.path.exists(self.file_path):
+            print(f"❌ File not found: {self.file_path}")
+            return None
+
+        print(f"📖 Reading network data from {self.file_path}...")
+        stations, links = self._read()
+        connections = []
+        for from_st, to_st, line, duration in links:
+            conn = Connection(line=line, duration=duration)
+            connections.append((from_st, to_st, conn))
+            connections.append((to_st, from_st, conn))
+
+        sync = GraphSync(self.repo.em, manifest_path or self.manifest_path)
+        plan = sync.sync(list(stations.values()), ["name"], connections, rescan=rescan)
+        print(f"✅ Sync Complete: {plan.summary()}")
+        return plan
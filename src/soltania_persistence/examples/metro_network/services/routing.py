@@ -0,0 +1,356 @@
+import heapq
+import math
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from gremlin_python.process.traversal import Direction
+
+from soltania_persistence.core.domain import ID
+from soltania_persistence.core.interfaces import EntityManager
+from soltania_persistence.examples.metro_network.models import Connection, Station
+from soltania_persistence.provider.tinkerpop.hydration import edge_endpoint, element_id
+
+# Lower bound of the remaining travel time between two stations (element maps), for A*
+Heuristic = Callable[[Dict[Any, Any], Dict[Any, Any]], float]
+
+
+class CSRSnapshot:
+    """
+    Compressed Sparse Row copy of the station graph.
+
+    Stations are numbered 0..n-1; the outgoing connections of station i occupy
+    the slots offsets[i]..offsets[i+1]-1 of 'targets' (station index) and
+    'weights' (duration). 'edge_maps' holds the elementMap of each slot so
+    routes can be reported in the same shape as the Gremlin traversal.
+    """
+
+    def __init__(self):
+        self.ids: List[ID] = []
+        self.index: Dict[ID, int] = {}
+        self.by_name: Dict[str, int] = {}
+        self.vertex_maps: List[Dict[Any, Any]] = []
+        self.offsets = array("q", [0])
+        self.targets = array("q")
+        self.weights = array("d")
+        self.edge_maps: List[Dict[Any, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add_station(self, element_map: Dict[Any, Any]) -> int:
+        """Registers (or updates) a station and returns its index."""
+        vid = element_id(element_map)
+        i = self.index.get(vid)
+        if i is None:
+            i = len(self.ids)
+            self.ids.append(vid)
+            self.index[vid] = i
+            self.vertex_maps.append(element_map)
+            self.offsets.append(self.offsets[-1])
+        else:
+            self.by_name.pop(self.vertex_maps[i].get("name"), None)
+            self.vertex_maps[i] = element_map
+        if "name" in element_map:
+            self.by_name[element_map["name"]] = i
+        return i
+
+    def row(self, i: int) -> range:
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def replace_rows(self, rows: Dict[int, List[Tuple[int, float, Dict[Any, Any]]]]) -> None:
+        """
+        Rebuilds the slot arrays with new adjacency for the given station indexes;
+        the other rows are copied over as array slices.
+        """
+        offsets, targets, weights, edge_maps = array("q", [0]), array("q"), array("d"), []
+        for i in range(len(self.ids)):
+            if i in rows:
+                for target, weight, edge_map in rows[i]:
+                    targets.append(target)
+                    weights.append(weight)
+                    edge_maps.append(edge_map)
+            else:
+                start, end = self.offsets[i], self.offsets[i + 1]
+                targets.extend(self.targets[start:end])
+                weights.extend(self.weights[start:end])
+                edge_maps.extend(self.edge_maps[start:end])
+            offsets.append(len(targets))
+        self.offsets, self.targets, self.weights, self.edge_maps = offsets, targets, weights, edge_maps
+
+
+def shortest_paths(
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    weights: Sequence[float],
+    source: int,
+    goals: Optional[Set[int]] = None,
+    heuristic: Optional[Callable[[int], float]] = None,
+) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """
+    Dijkstra (A* when a heuristic is given) over CSR arrays.
+    Stops once every goal is settled (never when 'goals' is None).
+    Returns the settled distances and, per station, the slot of the edge used to reach it.
+    """
+    dist: Dict[int, float] = {source: 0.0}
+    via: Dict[int, int] = {}
+    settled: Dict[int, float] = {}
+    remaining = set(goals) if goals is not None else None
+    heap = [(heuristic(source) if heuristic else 0.0, 0.0, source)]
+
+    while heap:
+        _, d, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled[node] = d
+        if remaining is not None:
+            remaining.discard(node)
+            if not remaining:
+                break
+        for slot in range(offsets[node], offsets[node + 1]):
+            target = targets[slot]
+            if target in settled:
+                continue
+            candidate = d + weights[slot]
+            if candidate < dist.get(target, float("inf")):
+                dist[target] = candidate
+                via[target] = slot
+                priority = candidate + heuristic(target) if heuristic else candidate
+                heapq.heappush(heap, (priority, candidate, target))
+
+    return settled, via
+
+
+class TravelTimeMatrix:
+    """
+    Dense origin-destination matrix of travel times (seconds), row-major in a
+    single array('d'). Unreachable pairs hold math.inf.
+    """
+
+    def __init__(self, names: List[str], data: array):
+        if len(data) != len(names) * len(names):
+            raise ValueError("Matrix data does not match the number of stations")
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, pair: Tuple[str, str]) -> float:
+        origin, destination = pair
+        return self.data[self.index[origin] * len(self.names) + self.index[destination]]
+
+    def row(self, origin: str) -> array:
+        """Travel times from 'origin' to every station, in 'names' order."""
+        n = len(self.names)
+        start = self.index[origin] * n
+        return self.data[start:start + n]
+
+
+# CSR arrays of the current process pool worker (set by _init_worker)
+_worker_csr: Tuple[Sequence[int], Sequence[int], Sequence[float]] = ((), (), ())
+
+
+def _init_worker(offsets: array, targets: array, weights: array) -> None:
+    global _worker_csr
+    _worker_csr = (offsets, targets, weights)
+
+
+def _matrix_rows(origins: Sequence[int], columns: Sequence[int]) -> array:
+    """Rows of the travel time matrix for some origins (runs in a pool worker)."""
+    offsets, targets, weights = _worker_csr
+    return _rows(offsets, targets, weights, origins, columns)
+
+
+def _rows(offsets, targets, weights, origins: Sequence[int], columns: Sequence[int]) -> array:
+    goals = set(columns)
+    data = array("d")
+    for origin in origins:
+        settled, _ = shortest_paths(offsets, targets, weights, origin, goals)
+        data.extend(settled.get(column, math.inf) for column in columns)
+    return data
+
+
+class RoutingEngine:
+    """
+    In-process router for MetroRepository.find_fastest_path.
+
+    The station graph is loaded once (two round trips) into a CSRSnapshot and
+    every query runs an exact Dijkstra, or A* with a 'heuristic', in memory.
+    Stations whose connections changed are marked with invalidate(); the next
+    query reloads only their rows (two round trips) instead of the whole graph.
+    Any other write through the EntityManager (importers, UnitOfWork, GraphSync)
+    changes its graph_version, and the next query reloads the whole snapshot.
+    """
+
+    def __init__(self, em: EntityManager, heuristic: Optional[Heuristic] = None):
+        self.em = em
+        self.heuristic = heuristic
+        self.snapshot: Optional[CSRSnapshot] = None
+        self._dirty: Set[ID] = set()
+        # em.graph_version the snapshot (plus the dirty rows) is up to date with
+        self._version: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def load(self) -> CSRSnapshot:
+        """(Re)loads the full snapshot from the database."""
+        station_label, edge_label = Station.__label__, Connection.__label__
+        # Read before the traversals: a write made during the load triggers another one
+        version = self.em.graph_version
+        vertices = self.em.g.V().hasLabel(station_label).elementMap().toList()
+        edges = self.em.g.E().hasLabel(edge_label).elementMap().toList()
+
+        snapshot = CSRSnapshot()
+        for element_map in vertices:
+            snapshot.add_station(element_map)
+        snapshot.replace_rows(self._group_rows(snapshot, edges))
+
+        with self._lock:
+            self.snapshot = snapshot
+            self._version = version
+            self._dirty.clear()
+        return snapshot
+
+    def invalidate(self, *station_ids: ID, since: Optional[int] = None) -> None:
+        """
+        Marks stations whose outgoing connections changed. 'since' is the
+        em.graph_version before those writes: if the snapshot was up to date at
+        that version, the dirty rows cover the writes and no full reload is needed.
+        """
+        with self._lock:
+            self._dirty.update(sid for sid in station_ids if sid is not None)
+            if since is not None and since == self._version:
+                self._version = self.em.graph_version
+
+    def refresh(self) -> CSRSnapshot:
+        """Brings the snapshot up to date, reloading only the invalidated rows."""
+        with self._lock:
+            if self.snapshot is None or self.em.graph_version != self._version:
+                return self.load()
+            if not self._dirty:
+                return self.snapshot
+            dirty = list(self._dirty)
+
+            vertices = self.em.g.V(*dirty).hasLabel(Station.__label__).elementMap().toList()
+            edges = self.em.g.V(*dirty).outE(Connection.__label__).elementMap().toList()
+
+            snapshot = self.snapshot
+            for element_map in vertices:
+                snapshot.add_station(element_map)
+            rows = {snapshot.index[sid]: [] for sid in dirty if sid in snapshot.index}
+            rows.update(self._group_rows(snapshot, edges))
+            snapshot.replace_rows(rows)
+            self._dirty.clear()
+            return snapshot
+
+    def station_index(self, name: str) -> Optional[int]:
+        return self.refresh().by_name.get(name)
+
+    def shortest_path(self, start_name: str, end_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Fastest route between two station names, or None if either is unknown or
+        unreachable. Same shape as the Gremlin traversal: {'total_time', 'path_data'}
+        with path_data = [station, connection, station, ...] element maps.
+        """
+        with self._lock:
+            snapshot = self.refresh()
+            source, goal = snapshot.by_name.get(start_name), snapshot.by_name.get(end_name)
+            if source is None or goal is None:
+                return None
+
+            heuristic = None
+            if self.heuristic is not None:
+                goal_map = snapshot.vertex_maps[goal]
+                heuristic = lambda i: self.heuristic(snapshot.vertex_maps[i], goal_map)
+
+            settled, via = shortest_paths(
+                snapshot.offsets, snapshot.targets, snapshot.weights, source, {goal}, heuristic
+            )
+            if goal not in settled:
+                return None
+            return {"total_time": settled[goal], "path_data": self._path_data(snapshot, via, source, goal)}
+
+    def find_fastest_paths_from(
+        self, origin: str, targets: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fastest routes from one station to many, with a single Dijkstra run.
+        Returns {target name: {'total_time', 'path_data'}} for every reachable
+        target (all stations when 'targets' is None); unknown names are skipped.
+        """
+        with self._lock:
+            snapshot = self.refresh()
+            source = snapshot.by_name.get(origin)
+            if source is None:
+                return {}
+
+            if targets is None:
+                goals = None
+                wanted = {snapshot.vertex_maps[i].get("name"): i for i in range(len(snapshot))}
+            else:
+                wanted = {name: snapshot.by_name[name] for name in targets if name in snapshot.by_name}
+                goals = set(wanted.values())
+
+            settled, via = shortest_paths(snapshot.offsets, snapshot.targets, snapshot.weights, source, goals)
+            return {
+                name: {"total_time": settled[i], "path_data": self._path_data(snapshot, via, source, i)}
+                for name, i in wanted.items()
+                if i in settled
+            }
+
+    def travel_time_matrix(
+        self, stations: Optional[Sequence[str]] = None, processes: Optional[int] = None, chunk_size: int = 16
+    ) -> TravelTimeMatrix:
+        """
+        Travel times between every pair of 'stations' (all stations by default).
+        One single-source search per origin; origins are spread over a process
+        pool that receives the CSR arrays once. processes=1 runs in this process.
+        """
+        with self._lock:
+            snapshot = self.refresh()
+            if stations is None:
+                stations = [m.get("name") for m in snapshot.vertex_maps]
+            unknown = [name for name in stations if name not in snapshot.by_name]
+            if unknown:
+                raise KeyError(f"Unknown stations: {unknown}")
+            columns = [snapshot.by_name[name] for name in stations]
+            csr = (snapshot.offsets, snapshot.targets, snapshot.weights)
+
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or len(columns) <= chunk_size:
+            return TravelTimeMatrix(list(stations), _rows(*csr, columns, columns))
+
+        chunks = [columns[i:i + chunk_size] for i in range(0, len(columns), chunk_size)]
+        data = array("d")
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=csr) as pool:
+            for rows in pool.map(_matrix_rows, chunks, [columns] * len(chunks)):
+                data.extend(rows)
+        return TravelTimeMatrix(list(stations), data)
+
+    @staticmethod
+    def _path_data(snapshot: CSRSnapshot, via: Dict[int, int], source: int, goal: int) -> List[Dict[Any, Any]]:
+        reversed_path = [snapshot.vertex_maps[goal]]
+        node = goal
+        while node != source:
+            slot = via[node]
+            reversed_path.append(snapshot.edge_maps[slot])
+            node = snapshot.index[element_id(edge_endpoint(snapshot.edge_maps[slot], Direction.OUT))]
+            reversed_path.append(snapshot.vertex_maps[node])
+        reversed_path.reverse()
+        return reversed_path
+
+    @staticmethod
+    def _group_rows(
+        snapshot: CSRSnapshot, edges: Iterable[Dict[Any, Any]]
+    ) -> Dict[int, List[Tuple[int, float, Dict[Any, Any]]]]:
+        rows: Dict[int, List[Tuple[int, float, Dict[Any, Any]]]] = {}
+        for edge_map in edges:
+            out_v = snapshot.index.get(element_id(edge_endpoint(edge_map, Direction.OUT)))
+            in_v = snapshot.index.get(element_id(edge_endpoint(edge_map, Direction.IN)))
+            if out_v is None or in_v is None:
+                continue
+            rows.setdefault(out_v, []).append((in_v, float(edge_map.get("duration", 0)), edge_map))
+        return rows
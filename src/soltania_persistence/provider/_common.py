@@ -0,0 +1,35 @@
+"""
+Helpers shared by the EntityManager providers. No driver import here: the
+in-memory provider uses them without loading the Gremlin driver.
+"""
+from typing import Any, Iterable, Sequence, Tuple, Type, TypeVar
+
+from soltania_persistence.core.domain import BaseEntity, Relationship
+from soltania_persistence.provider.tinkerpop.hydration import hydrator_for
+
+E = TypeVar("E", bound=BaseEntity)
+
+# Default number of elements sent per traversal by the batched APIs
+DEFAULT_BATCH_SIZE = 100
+
+# Default number of entities fetched per round trip by find_all() / stream()
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    """Splits a sequence into consecutive slices of at most 'size' elements."""
+    if size < 1:
+        raise ValueError("batch_size must be >= 1")
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _require_saved(relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]]) -> None:
+    for from_entity, to_entity, _ in relationships:
+        if not from_entity.id or not to_entity.id:
+            raise ValueError("Entities must be saved before creating relationship")
+
+
+def _hydrate(entity_class: Type[E], result: dict, trusted: bool = False) -> E:
+    """Rebuilds an entity from an elementMap() result (compiled per-class hydrator)."""
+    return hydrator_for(entity_class).hydrate(result, trusted)
@@ -0,0 +1,179 @@
+import itertools
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from soltania_persistence.core.domain import ID
+
+
+class VertexRecord:
+    """Vertex storage: label, properties and the ids of its incident edges."""
+    __slots__ = ("id", "label", "properties", "out_edges", "in_edges")
+
+    def __init__(self, id: ID, label: str, properties: Dict[str, Any]):
+        self.id = id
+        self.label = label
+        self.properties = properties
+        self.out_edges: List[ID] = []
+        self.in_edges: List[ID] = []
+
+
+class EdgeRecord:
+    """Edge storage: label, endpoints (vertex ids) and properties."""
+    __slots__ = ("id", "label", "out_v", "in_v", "properties")
+
+    def __init__(self, id: ID, label: str, out_v: ID, in_v: ID, properties: Dict[str, Any]):
+        self.id = id
+        self.label = label
+        self.out_v = out_v
+        self.in_v = in_v
+        self.properties = properties
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class InMemoryGraph:
+    """
+    Property graph held in process memory.
+
+    Vertices and edges live in id-keyed dictionaries; every vertex keeps the ids
+    of its outgoing and incoming edges (adjacency lists), so neighbour expansion
+    never scans the edge set. Vertex properties are hash-indexed per label
+    (label -> key -> value -> ids), which makes property lookups O(1).
+    Dictionaries are used as insertion-ordered sets so iteration is deterministic.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self.vertices: Dict[ID, VertexRecord] = {}
+        self.edges: Dict[ID, EdgeRecord] = {}
+        self._by_label: Dict[str, Dict[ID, None]] = {}
+        self._index: Dict[str, Dict[str, Dict[Any, Dict[ID, None]]]] = {}
+
+    # --- Vertices ---
+
+    def add_vertex(self, label: str, properties: Optional[Dict[str, Any]] = None, id: Optional[ID] = None) -> ID:
+        with self._lock:
+            vid = id if id is not None else self._new_id()
+            if vid in self.vertices:
+                raise ValueError(f"Vertex with id {vid} already exists")
+            self.vertices[vid] = VertexRecord(vid, label, {})
+            self._by_label.setdefault(label, {})[vid] = None
+            for key, value in (properties or {}).items():
+                self.set_vertex_property(vid, key, value)
+            return vid
+
+    def set_vertex_property(self, vid: ID, key: str, value: Any) -> None:
+        with self._lock:
+            record = self.vertices[vid]
+            label_index = self._index.setdefault(record.label, {}).setdefault(key, {})
+            if key in record.properties:
+                self._unindex(label_index, record.properties[key], vid)
+            record.properties[key] = value
+            if _hashable(value):
+                label_index.setdefault(value, {})[vid] = None
+
+    def remove_vertex_property(self, vid: ID, key: str) -> None:
+        with self._lock:
+            record = self.vertices[vid]
+            if key in record.properties:
+                self._unindex(self._index.get(record.label, {}).get(key, {}), record.properties.pop(key), vid)
+
+    def remove_vertex(self, vid: ID) -> None:
+        with self._lock:
+            record = self.vertices.get(vid)
+            if record is None:
+                return
+            for eid in list(record.out_edges) + list(record.in_edges):
+                self.remove_edge(eid)
+            label_index = self._index.get(record.label, {})
+            for key, value in record.properties.items():
+                self._unindex(label_index.get(key, {}), value, vid)
+            self._by_label.get(record.label, {}).pop(vid, None)
+            del self.vertices[vid]
+
+    def vertex_ids(self, label: Optional[str] = None) -> List[ID]:
+        with self._lock:
+            if label is None:
+                return list(self.vertices)
+            return list(self._by_label.get(label, {}))
+
+    def lookup(self, label: str, key: str, value: Any) -> List[ID]:
+        """Ids of the 'label' vertices whose 'key' equals 'value' (index hit when hashable)."""
+        with self._lock:
+            if _hashable(value):
+                return list(self._index.get(label, {}).get(key, {}).get(value, {}))
+            return [
+                vid for vid in self._by_label.get(label, {})
+                if self.vertices[vid].properties.get(key) == value
+            ]
+
+    # --- Edges ---
+
+    def add_edge(
+        self, label: str, out_v: ID, in_v: ID, properties: Optional[Dict[str, Any]] = None, id: Optional[ID] = None
+    ) -> ID:
+        with self._lock:
+            if out_v not in self.vertices or in_v not in self.vertices:
+                raise KeyError(f"Unknown vertex in edge {out_v} -> {in_v}")
+            eid = id if id is not None else self._new_id()
+            self.edges[eid] = EdgeRecord(eid, label, out_v, in_v, dict(properties or {}))
+            self.vertices[out_v].out_edges.append(eid)
+            self.vertices[in_v].in_edges.append(eid)
+            return eid
+
+    def set_edge_property(self, eid: ID, key: str, value: Any) -> None:
+        with self._lock:
+            self.edges[eid].properties[key] = value
+
+    def remove_edge(self, eid: ID) -> None:
+        with self._lock:
+            record = self.edges.pop(eid, None)
+            if record is None:
+                return
+            self.vertices[record.out_v].out_edges.remove(eid)
+            self.vertices[record.in_v].in_edges.remove(eid)
+
+    def edge_ids(self, vid: ID, direction: str, labels: Sequence[str] = ()) -> Iterator[ID]:
+        """Incident edge ids of a vertex; direction is 'OUT', 'IN' or 'BOTH'."""
+        record = self.vertices[vid]
+        if direction == "OUT":
+            candidates: Iterable[ID] = list(record.out_edges)
+        elif direction == "IN":
+            candidates = list(record.in_edges)
+        else:
+            candidates = list(record.out_edges) + list(record.in_edges)
+        for eid in candidates:
+            if not labels or self.edges[eid].label in labels:
+                yield eid
+
+    # --- Maintenance ---
+
+    def clear(self) -> None:
+        with self._lock:
+            self.vertices.clear()
+            self.edges.clear()
+            self._by_label.clear()
+            self._index.clear()
+
+    def _new_id(self) -> ID:
+        vid = next(self._ids)
+        while vid in self.vertices or vid in self.edges:
+            vid = next(self._ids)
+        return vid
+
+    @staticmethod
+    def _unindex(key_index: Dict[Any, Dict[ID, None]], value: Any, vid: ID) -> None:
+        if not _hashable(value):
+            return
+        ids = key_index.get(value)
+        if ids is not None:
+            ids.pop(vid, None)
+            if not ids:
+                del key_index[value]
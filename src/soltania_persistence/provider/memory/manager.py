@@ -0,0 +1,276 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from gremlin_python.process.anonymous_traversal import traversal
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.core.domain import OUT, BaseEntity, Relationship, ID
+from soltania_persistence.core.interfaces import EntityManager
+from soltania_persistence.core.schema import IndexSpec, index_specs
+from soltania_persistence.provider.memory.graph import InMemoryGraph
+from soltania_persistence.provider.memory.traversal import LocalRemoteConnection
+from soltania_persistence.provider._common import DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE, _chunks, _hydrate, _require_saved
+from soltania_persistence.provider.tinkerpop.eager import Include, attach_related, normalize_includes
+from soltania_persistence.provider.tinkerpop.projection import projection_type, to_record
+
+E = TypeVar("E", bound=BaseEntity)
+
+_MISSING = object()
+
+
+def _vertex_properties(entity: BaseEntity) -> dict:
+    return entity.model_dump(exclude={"id"}, exclude_none=True)
+
+
+class InMemoryEntityManager(EntityManager):
+    """
+    EntityManager backed by an in-process InMemoryGraph (no server, no network).
+
+    CRUD calls go straight to the graph's adjacency lists and property indexes.
+    'g' is a regular gremlinpython traversal source whose bytecode is executed
+    locally, so repositories written against a Gremlin Server run unchanged.
+    Useful for unit tests, local development and as a fast read replica.
+    """
+
+    def __init__(self, graph: Optional[InMemoryGraph] = None):
+        self.graph = graph if graph is not None else InMemoryGraph()
+        self.connection = LocalRemoteConnection(self.graph)
+        self.g = traversal().withRemote(self.connection)
+
+    @classmethod
+    def from_url(cls, url: str, settings: Any = None, **options: Any) -> "InMemoryEntityManager":
+        """Manager for a memory:// URL: a new empty graph (the Gremlin settings do not apply)."""
+        return cls(**options)
+
+    def close(self):
+        """Nothing to release: the graph lives as long as the manager."""
+        self.connection.close()
+
+    def _find_id(self, entity: BaseEntity, key_fields: Sequence[str]) -> Optional[ID]:
+        """Index lookup on the first key field, remaining fields checked on the candidates."""
+        if not key_fields:
+            raise ValueError("upsert requires at least one key field")
+
+        values = {}
+        for key in key_fields:
+            value = getattr(entity, key)
+            if value is None:
+                raise ValueError(f"Key field '{key}' of {type(entity).__name__} must not be None")
+            values[key] = value
+
+        first, *others = key_fields
+        for vid in self.graph.lookup(entity.__label__, first, values[first]):
+            properties = self.graph.vertices[vid].properties
+            if all(properties.get(key) == values[key] for key in others):
+                return vid
+        return None
+
+    def _element_map(self, vid: ID) -> dict:
+        record = self.graph.vertices[vid]
+        return {T.id: vid, T.label: record.label, **record.properties}
+
+    def _load(self, entity_class: Type[E], vid: ID) -> E:
+        return _hydrate(entity_class, self._element_map(vid))
+
+    def _attach(self, entity: BaseEntity, label: str, direction: str) -> None:
+        """Reads one relation of a vertex from its adjacency list (same pairs as the Gremlin traversal)."""
+        pairs = []
+        for eid in self.graph.edge_ids(entity.id, direction.upper(), (label,)):
+            edge = self.graph.edges[eid]
+            other = edge.in_v if direction == OUT else edge.out_v
+            pairs.append({"e": edge.properties, "v": self._element_map(other)})
+        attach_related(entity, label, direction, pairs, _hydrate)
+
+    def _with_includes(self, entity: E, include: Optional[Sequence[Include]]) -> E:
+        with self.graph._lock:
+            for label, direction in normalize_includes(include):
+                self._attach(entity, label, direction)
+        return entity
+
+    def persist(self, entity: E) -> E:
+        """Saves an entity (Vertex) to the graph; a saved entity has its properties rewritten."""
+        if entity.id is not None:
+            return self.update(entity)
+        entity.id = self.graph.add_vertex(entity.__label__, _vertex_properties(entity))
+        self._bump_version()
+        return entity
+
+    def persist_all(self, entities: Sequence[E], batch_size: int = DEFAULT_BATCH_SIZE) -> List[E]:
+        """Saves several entities; 'batch_size' is validated for API parity but no batching is needed."""
+        entities = list(entities)
+        for chunk in _chunks(entities, batch_size):
+            with self.graph._lock:
+                for entity in chunk:
+                    self.persist(entity)
+        return entities
+
+    def upsert(self, entity: E, key_fields: Sequence[str]) -> E:
+        """Get-or-create on 'key_fields', atomic with respect to other threads."""
+        with self.graph._lock:
+            vid = self._find_id(entity, key_fields)
+            if vid is None:
+                return self.persist(entity)
+        entity.id = vid
+        return entity
+
+    def upsert_all(
+        self, entities: Sequence[E], key_fields: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[E]:
+        """Batched get-or-create (same contract as the Gremlin manager)."""
+        entities = list(entities)
+        for chunk in _chunks(entities, batch_size):
+            with self.graph._lock:
+                for entity in chunk:
+                    self.upsert(entity, key_fields)
+        return entities
+
+    def update_all(
+        self, changes: Sequence[Tuple[BaseEntity, Dict[str, Any]]], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> None:
+        """Writes property changes in place (indexes kept up to date); unknown vertices raise RuntimeError."""
+        changes = list(changes)
+        if any(entity.id is None for entity, _ in changes):
+            raise ValueError("Entity must be saved before being updated")
+        for chunk in _chunks(changes, batch_size):
+            with self.graph._lock:
+                missing = [entity.id for entity, _ in chunk if entity.id not in self.graph.vertices]
+                if missing:
+                    raise RuntimeError(f"Cannot update unknown vertices {missing}")
+                for entity, values in chunk:
+                    for key, value in values.items():
+                        if value is None:
+                            self.graph.remove_vertex_property(entity.id, key)
+                        else:
+                            self.graph.set_vertex_property(entity.id, key, value)
+                self._bump_version()
+
+    def find(self, entity_class: Type[E], entity_id: ID, include: Optional[Sequence[Include]] = None) -> Optional[E]:
+        """Finds an entity by its id; 'include' loads relations from the adjacency lists."""
+        record = self.graph.vertices.get(entity_id)
+        if record is None or record.label != entity_class.__label__:
+            return None
+        return self._with_includes(self._load(entity_class, entity_id), include)
+
+    def find_by_property(
+        self,
+        entity_class: Type[E],
+        property_name: str,
+        value: Any,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[Include]] = None,
+    ) -> Optional[E]:
+        """Finds a single entity by a specific property (hash index lookup); 'fields' returns a typed record."""
+        record_type = projection_type(entity_class, fields) if fields is not None else None
+        if record_type is not None and include:
+            raise ValueError("'fields' and 'include' cannot be combined: records carry no relations")
+        vids = self.graph.lookup(entity_class.__label__, property_name, value)
+        if not vids:
+            return None
+        if record_type is not None:
+            return to_record(record_type, {"id": vids[0], **self.graph.vertices[vids[0]].properties})
+        return self._with_includes(self._load(entity_class, vids[0]), include)
+
+    def prefetch(
+        self,
+        entities: Sequence[E],
+        relation: Union[str, Type[Relationship]],
+        direction: str = OUT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[E]:
+        """Loads one relation of many entities (same contract as the Gremlin manager); unknown vertices raise KeyError."""
+        entities = list(entities)
+        ((label, direction),) = normalize_includes([(relation, direction)])
+        if any(entity.id is None for entity in entities):
+            raise ValueError("Entities must be saved before prefetching their relationships")
+        for chunk in _chunks(entities, batch_size):
+            with self.graph._lock:
+                for entity in chunk:
+                    self._attach(entity, label, direction)
+        return entities
+
+    def find_all(self, entity_class: Type[E], **filters: Any) -> Iterator[E]:
+        """Lazily iterates over the entities matching the filters (first filter served by the index)."""
+        return self.stream(entity_class, DEFAULT_PAGE_SIZE, **filters)
+
+    def stream(self, entity_class: Type[E], page_size: int = DEFAULT_PAGE_SIZE, **filters: Any) -> Iterator[E]:
+        """Same contract as the Gremlin manager; ids are snapshotted 'page_size' at a time."""
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+
+        label = entity_class.__label__
+        if filters:
+            first, value = next(iter(filters.items()))
+            candidates = self.graph.lookup(label, first, value)
+        else:
+            candidates = self.graph.vertex_ids(label)
+
+        for chunk in _chunks(candidates, page_size):
+            for vid in chunk:
+                record = self.graph.vertices.get(vid)
+                if record is None:
+                    continue
+                if all(record.properties.get(k, _MISSING) == v for k, v in filters.items()):
+                    yield self._load(entity_class, vid)
+
+    def create_relationship(self, from_entity: BaseEntity, to_entity: BaseEntity, relationship: Relationship):
+        """Creates an edge between two saved vertices."""
+        self.create_relationships([(from_entity, to_entity, relationship)])
+
+    def create_relationships(
+        self,
+        relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Creates several edges; unknown endpoints raise KeyError."""
+        relationships = list(relationships)
+        _require_saved(relationships)
+        for chunk in _chunks(relationships, batch_size):
+            with self.graph._lock:
+                for from_entity, to_entity, relationship in chunk:
+                    self.graph.add_edge(
+                        relationship.__label__, from_entity.id, to_entity.id, relationship.model_dump(exclude_none=True)
+                    )
+                    self._bump_version()
+
+    def remove_all(self, entities: Sequence[BaseEntity], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """Deletes vertices and their edges; unknown ids are ignored."""
+        entities = list(entities)
+        if any(entity.id is None for entity in entities):
+            raise ValueError("Entities must be saved before being removed")
+        for chunk in _chunks(entities, batch_size):
+            with self.graph._lock:
+                for entity in chunk:
+                    self.graph.remove_vertex(entity.id)
+                self._bump_version()
+
+    def remove_relationships(
+        self,
+        relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Deletes one matching edge per triple (same contract as the Gremlin manager)."""
+        relationships = list(relationships)
+        _require_saved(relationships)
+        for chunk in _chunks(relationships, batch_size):
+            with self.graph._lock:
+                removed = 0
+                for from_entity, to_entity, relationship in chunk:
+                    wanted = relationship.model_dump(exclude_none=True)
+                    for eid in self.graph.edge_ids(from_entity.id, "OUT", (relationship.__label__,)):
+                        edge = self.graph.edges[eid]
+                        if edge.in_v == to_entity.id and all(edge.properties.get(k, _MISSING) == v for k, v in wanted.items()):
+                            self.graph.remove_edge(eid)
+                            removed += 1
+                            break
+                self._bump_version()
+            if removed != len(chunk):
+                raise RuntimeError(f"Batch removed {removed} relationships out of {len(chunk)}")
+
+    def ensure_schema(self, entity_classes: Sequence[Type[BaseEntity]]) -> List[IndexSpec]:
+        """Every property is already hash-indexed by the graph: the declared specs are only returned."""
+        return index_specs(entity_classes)
+
+    def clear_database(self):
+        """Deletes all vertices and edges."""
+        self.graph.clear()
+        self._bump_version()
@@ -0,0 +1,537 @@
+"""
+Local stand-in for Gremlin Server, backed by an InMemoryGraph.
+
+It speaks enough of the Gremlin Server websocket protocol (GraphBinary,
+GraphSON 3 and GraphSON 2 requests and responses, 'bytecode' and 'eval'
+operations, 206 partial batches) for GremlinEntityManager, AsyncGremlinEntityManager and the
+repositories to run against it unchanged. Traversals are executed by the
+local bytecode interpreter. Every response can be delayed (latency + jitter)
+or replaced by an error status, to measure and test the client offline:
+batching, connection pooling, async fan-out, timeouts and retries.
+
+    with GremlinStandInServer(latency=0.02, jitter=0.005) as server:
+        em = GremlinEntityManager(server.url, pool_size=8)
+
+Or from a shell, then point GREMLIN_URL at it:
+
+    python -m soltania_persistence.provider.memory.server --port 8182 --latency 0.02
+"""
+import argparse
+import asyncio
+import io
+import json
+import random
+import socket
+import struct
+import threading
+import time
+import uuid
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import WSMsgType, web
+from gremlin_python.process.traversal import Bytecode, P, TextP, TraversalStrategy, Traverser
+from gremlin_python.structure.graph import Path
+from gremlin_python.structure.io import graphbinaryV1, graphsonV2d0, graphsonV3d0
+from gremlin_python.structure.io.util import SymbolUtil
+
+from soltania_persistence.provider.memory.graph import InMemoryGraph
+from soltania_persistence.provider.memory.traversal import execute
+
+GRAPHBINARY_MIME = "application/vnd.graphbinary-v1.0"
+GRAPHSON_V3_MIME = "application/vnd.gremlin-v3.0+json"
+GRAPHSON_V2_MIME = "application/vnd.gremlin-v2.0+json"
+
+# Gremlin Server response status codes
+SUCCESS = 200
+NO_CONTENT = 204
+PARTIAL_CONTENT = 206
+MALFORMED_REQUEST = 499
+SERVER_ERROR = 500
+SERVER_EVALUATION_ERROR = 597
+SERVER_TIMEOUT = 598
+SERVER_SERIALIZATION_ERROR = 599
+
+# Results per response message (Gremlin Server's resultIterationBatchSize)
+DEFAULT_RESULT_BATCH_SIZE = 64
+
+_int32 = struct.Struct(">i")
+
+
+def _enum_reader(io_class: type) -> type:
+    """
+    gremlinpython reads enums back as snake_case names, which misses the
+    members renamed after Python keywords (Pop.all_, Operator.sum_...).
+    """
+    def read(cls, b, r):
+        name = graphbinaryV1.SymbolUtil.to_snake_case(r.to_object(b))
+        members = cls.python_type.__members__
+        return members[name] if name in members else members[name + "_"]
+
+    # A leading underscore keeps the class out of gremlinpython's global (client) registry
+    return type(f"_{io_class.__name__}", (io_class,), {"_read_enumval": classmethod(read)})
+
+
+class _PredicateReader(graphbinaryV1._GraphBinaryTypeIO):
+    """P / TextP arguments (written by the driver, never read back by it)."""
+    graphbinary_type = graphbinaryV1.DataType.p
+    python_type = P
+
+    @classmethod
+    def objectify(cls, buff, reader, nullable=True):
+        return cls.is_null(buff, reader, cls._read_predicate, nullable)
+
+    @classmethod
+    def _read_predicate(cls, b, r):
+        operator = r.to_object(b, graphbinaryV1.DataType.string, False)
+        args = [r.read_object(b) for _ in range(cls.read_int(b))]
+        if operator in ("within", "without"):
+            return cls.python_type(operator, args)
+        return cls.python_type(operator, *args)
+
+
+class _TextPredicateReader(_PredicateReader):
+    graphbinary_type = graphbinaryV1.DataType.textp
+    python_type = TextP
+
+
+class _StrategyReader(graphbinaryV1._GraphBinaryTypeIO):
+    """withStrategies() arguments, e.g. the OptionsStrategy of g.with_()."""
+    graphbinary_type = graphbinaryV1.DataType.traversalstrategy
+
+    @classmethod
+    def objectify(cls, buff, reader, nullable=True):
+        return cls.is_null(buff, reader, cls._read_strategy, nullable)
+
+    @classmethod
+    def _read_strategy(cls, b, r):
+        fqcn = r.to_object(b, graphbinaryV1.DataType.string, False)
+        configuration = r.to_object(b, graphbinaryV1.DataType.map, False)
+        return TraversalStrategy(configuration=configuration, fqcn=fqcn)
+
+
+_REQUEST_READERS = {
+    **{
+        data_type: _enum_reader(io_class)
+        for data_type, io_class in graphbinaryV1._deserializers.items()
+        if issubclass(io_class, graphbinaryV1._EnumIO)
+    },
+    graphbinaryV1.DataType.p: _PredicateReader,
+    graphbinaryV1.DataType.textp: _TextPredicateReader,
+    graphbinaryV1.DataType.traversalstrategy: _StrategyReader,
+}
+
+
+class _GraphBinaryCodec:
+    """Request decoding / response encoding for 'application/vnd.graphbinary-v1.0'."""
+
+    def __init__(self):
+        self._reader = graphbinaryV1.GraphBinaryReader(_REQUEST_READERS)
+        self._writer = graphbinaryV1.GraphBinaryWriter()
+
+    def read_request_id(self, b: io.BytesIO) -> uuid.UUID:
+        """Request id of a request body (after the mime header)."""
+        b.read(1)  # version (0x81)
+        return uuid.UUID(bytes=b.read(16))
+
+    def read_request(self, b: io.BytesIO) -> Tuple[str, str, Dict[str, Any]]:
+        """(op, processor, args) of a request body, after its id."""
+        op = self._reader.to_object(b, graphbinaryV1.DataType.string, nullable=False)
+        processor = self._reader.to_object(b, graphbinaryV1.DataType.string, nullable=False)
+        args = self._reader.to_object(b, graphbinaryV1.DataType.map, nullable=False)
+        return op, processor, args
+
+    def response(self, request_id: uuid.UUID, status: int, data: Any = None, message: Optional[str] = None) -> bytes:
+        ba = bytearray(b"\x81")
+        ba.extend(b"\x00" + request_id.bytes)         # nullable uuid
+        ba.extend(_int32.pack(status))
+        if message is None:
+            ba.extend(b"\x01")                        # null status message
+        else:
+            encoded = message.encode("utf-8")         # nullable string, no type code
+            ba.extend(b"\x00" + _int32.pack(len(encoded)) + encoded)
+        ba.extend(_int32.pack(0))                     # status attributes
+        ba.extend(_int32.pack(0))                     # meta attributes
+        self._writer.to_dict(data, ba)
+        return bytes(ba)
+
+
+# --- GraphSON ----------------------------------------------------------------
+# gremlinpython only writes the request types (bytecode, predicates, enums,
+# strategies) and only reads the response types: both directions are completed
+# here. The classes start with "_" to stay out of gremlinpython's registries.
+
+_GRAPHSON_ENUMS = {
+    f"g:{SymbolUtil.to_camel_case(io_class.python_type.__name__)}": io_class.python_type
+    for io_class in graphbinaryV1._deserializers.values()
+    if issubclass(io_class, graphbinaryV1._EnumIO)
+}
+
+
+class _GraphSONRequestReader(graphsonV3d0.GraphSONReader):
+    """Reads GraphSON 3 and GraphSON 2 requests (their bytecode shapes are the same)."""
+
+    def __init__(self, deserializers: Dict[str, Any]):
+        super().__init__()
+        self.deserializers = dict(deserializers)
+
+    def to_object(self, obj: Any) -> Any:
+        if isinstance(obj, dict) and "@type" in obj:
+            kind, value = obj["@type"], obj.get("@value")
+            if kind == "g:Bytecode":
+                return self._bytecode(value)
+            if kind in ("g:P", "g:TextP"):
+                return self._predicate(P if kind == "g:P" else TextP, value)
+            if kind in _GRAPHSON_ENUMS:
+                members = _GRAPHSON_ENUMS[kind].__members__
+                name = SymbolUtil.to_snake_case(value)
+                return members[name] if name in members else members[name + "_"]
+            if isinstance(value, dict) and "fqcn" in value:
+                configuration = {k: self.to_object(v) for k, v in value.get("conf", {}).items()}
+                return TraversalStrategy(configuration=configuration, fqcn=value["fqcn"])
+        return super().to_object(obj)
+
+    def _bytecode(self, value: Dict[str, Any]) -> Bytecode:
+        bytecode = Bytecode()
+        bytecode.source_instructions = [[i[0], *map(self.to_object, i[1:])] for i in value.get("source", [])]
+        bytecode.step_instructions = [[i[0], *map(self.to_object, i[1:])] for i in value.get("step", [])]
+        return bytecode
+
+    def _predicate(self, python_type: type, value: Dict[str, Any]) -> Any:
+        operator, argument = value["predicate"], value["value"]
+        if operator in ("within", "without"):
+            return python_type(operator, list(self.to_object(argument)))
+        # Two-argument predicates (between, and, or...) come as an untyped pair
+        if isinstance(argument, list):
+            return python_type(operator, *map(self.to_object, argument))
+        return python_type(operator, self.to_object(argument))
+
+
+class _PathWriterV3(graphsonV3d0._GraphSONTypeIO):
+    @classmethod
+    def dictify(cls, path, writer):
+        return graphsonV3d0.GraphSONUtil.typed_value(
+            "Path", {"labels": writer.to_dict(list(path.labels)), "objects": writer.to_dict(list(path.objects))}
+        )
+
+
+class _PathWriterV2(graphsonV2d0._GraphSONTypeIO):
+    @classmethod
+    def dictify(cls, path, writer):
+        return graphsonV2d0.GraphSONUtil.typed_value(
+            "Path", {"labels": [sorted(labels) for labels in path.labels], "objects": writer.to_dict(path.objects)}
+        )
+
+
+class _MapWriterV2(graphsonV2d0._GraphSONTypeIO):
+    """GraphSON 2 maps are JSON objects: keys are written as strings (T.id -> 'id', Direction.OUT -> 'OUT')."""
+    @classmethod
+    def dictify(cls, d, writer):
+        return {
+            (k.name if isinstance(k, Enum) else k if isinstance(k, str) else str(k)): writer.to_dict(v)
+            for k, v in d.items()
+        }
+
+
+class _ListWriterV2(graphsonV2d0._GraphSONTypeIO):
+    @classmethod
+    def dictify(cls, items, writer):
+        return [writer.to_dict(item) for item in items]
+
+
+class _GraphSONCodec:
+    """Request decoding / response encoding for the GraphSON 3 and GraphSON 2 mime types."""
+
+    def __init__(self, version: int):
+        self.version = version
+        self._reader = _GraphSONRequestReader(
+            graphsonV3d0._deserializers if version == 3 else graphsonV2d0._deserializers
+        )
+        if version == 3:
+            self._writer = graphsonV3d0.GraphSONWriter({Path: _PathWriterV3})
+        else:
+            self._writer = graphsonV2d0.GraphSONWriter(
+                {Path: _PathWriterV2, dict: _MapWriterV2, list: _ListWriterV2, set: _ListWriterV2, tuple: _ListWriterV2}
+            )
+
+    def read_request_id(self, b: io.BytesIO) -> uuid.UUID:
+        """Request id of a request body; the body is left to read_request() (requests are small)."""
+        start = b.tell()
+        message = json.loads(b.read())
+        b.seek(start)
+        request_id = message["requestId"]
+        return uuid.UUID(request_id["@value"] if isinstance(request_id, dict) else request_id)
+
+    def read_request(self, b: io.BytesIO) -> Tuple[str, str, Dict[str, Any]]:
+        message = json.loads(b.read())
+        return message["op"], message.get("processor", ""), self._reader.to_object(message["args"])
+
+    def response(self, request_id: uuid.UUID, status: int, data: Any = None, message: Optional[str] = None) -> bytes:
+        empty = self._writer.to_dict({})
+        document = {
+            "requestId": str(request_id),
+            "status": {"code": status, "message": message or "", "attributes": empty},
+            "result": {"data": self._writer.to_dict(data), "meta": empty},
+        }
+        return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+class GremlinStandInServer:
+    """
+    Websocket server answering Gremlin requests from an InMemoryGraph.
+
+    'latency' (seconds) delays every response, 'jitter' adds a uniform
+    +/- variation. 'error_rate' (0..1) answers that share of the requests with
+    'error_status' (598 = server timeout by default); 'fail_next()' queues
+    deterministic failures. 'evaluation_timeout' (seconds, or the request's
+    evaluationTimeout in ms) turns a delay longer than the timeout into a 598.
+    Script requests ('eval') are only accepted for the registered
+    TraversalTemplates, matched on their script. 'requests', 'errors' and
+    'max_in_flight' (most requests answered at once) count what the server saw.
+    """
+
+    def __init__(
+        self,
+        graph: Optional[InMemoryGraph] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = SERVER_TIMEOUT,
+        evaluation_timeout: Optional[float] = None,
+        templates: Iterable[Any] = (),
+        batch_size: int = DEFAULT_RESULT_BATCH_SIZE,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must be >= 0")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.graph = graph if graph is not None else InMemoryGraph()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.evaluation_timeout = evaluation_timeout
+        self.batch_size = batch_size
+        self.host = host
+        self.port = port or _free_port(host)
+        # Counters, readable from the test / benchmark thread
+        self.requests = 0
+        self.errors = 0
+        # Requests being answered, and the highest count seen (reset it before measuring)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._scripts = {template.script: template for template in templates}
+        self._failures: Deque[Tuple[int, str]] = deque()
+        self._random = random.Random(seed)
+        self._codecs = {
+            GRAPHBINARY_MIME: _GraphBinaryCodec(),
+            GRAPHSON_V3_MIME: _GraphSONCodec(3),
+            GRAPHSON_V2_MIME: _GraphSONCodec(2),
+        }
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._sockets: set = set()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/gremlin"
+
+    def fail_next(self, count: int = 1, status: int = SERVER_TIMEOUT, message: str = "Injected failure") -> None:
+        """The next 'count' requests are answered with 'status' (after the usual delay)."""
+        for _ in range(count):
+            self._failures.append((status, message))
+
+    def register(self, template: Any) -> None:
+        """Accepts the script of a TraversalTemplate on the 'eval' operation."""
+        self._scripts[template.script] = template
+
+    # --- Lifecycle ---
+
+    def start(self) -> "GremlinStandInServer":
+        """Serves from a background thread until stop()."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="gremlin-stand-in", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "GremlinStandInServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/gremlin", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def _stop(self) -> None:
+        # Connections left open by clients would make the cleanup wait for them
+        for ws in list(self._sockets):
+            await ws.close()
+        await self._runner.cleanup()
+
+    # --- Protocol ---
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        pending = set()
+        async for msg in ws:
+            if msg.type != WSMsgType.BINARY:
+                continue
+            # Requests of one connection are answered concurrently, like Gremlin Server
+            task = asyncio.ensure_future(self._answer(ws, msg.data))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        for task in list(pending):
+            task.cancel()
+        self._sockets.discard(ws)
+        return ws
+
+    async def _answer(self, ws: web.WebSocketResponse, data: bytes) -> None:
+        b = io.BytesIO(data)
+        mime = b.read(b.read(1)[0]).decode("utf-8")
+        codec = self._codecs.get(mime)
+        if codec is None:
+            return  # Unreadable request: the client times out, as with a real server
+        request_id = codec.read_request_id(b)
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await self._answer_request(ws, codec, request_id, b)
+        finally:
+            self.in_flight -= 1
+
+    async def _answer_request(self, ws: web.WebSocketResponse, codec: Any, request_id: uuid.UUID, b: io.BytesIO) -> None:
+        try:
+            op, processor, args = codec.read_request(b)
+        except Exception as e:
+            await self._fail(ws, codec, request_id, MALFORMED_REQUEST, f"{type(e).__name__}: {e}")
+            return
+
+        started = time.perf_counter()
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        timeout = _timeout(args, self.evaluation_timeout)
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            await self._fail(ws, codec, request_id, SERVER_TIMEOUT, f"A timeout occurred during traversal evaluation of [{op}] - consider increasing the limit given to evaluationTimeout")
+            return
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._failures:
+            status, message = self._failures.popleft()
+            await self._fail(ws, codec, request_id, status, message)
+            return
+        if self.error_rate and self._random.random() < self.error_rate:
+            await self._fail(ws, codec, request_id, self.error_status, "Injected failure")
+            return
+
+        try:
+            results = self._evaluate(op, args)
+        except Exception as e:
+            await self._fail(ws, codec, request_id, SERVER_EVALUATION_ERROR, f"{type(e).__name__}: {e}")
+            return
+        if timeout is not None and time.perf_counter() - started > timeout:
+            await self._fail(ws, codec, request_id, SERVER_TIMEOUT, "A timeout occurred during traversal evaluation")
+            return
+
+        await self._send_results(ws, codec, request_id, op, args, results)
+
+    def _evaluate(self, op: str, args: Dict[str, Any]) -> List[Any]:
+        if op == "bytecode":
+            return execute(self.graph, args["gremlin"])
+        if op == "eval":
+            template = self._scripts.get(args["gremlin"])
+            if template is None:
+                raise NotImplementedError("Only the scripts of registered TraversalTemplates can be evaluated")
+            return execute(self.graph, template.bytecode(**(args.get("bindings") or {})))
+        raise NotImplementedError(f"Unsupported operation '{op}'")
+
+    async def _send_results(
+        self, ws: web.WebSocketResponse, codec: Any, request_id: uuid.UUID, op: str, args: Dict[str, Any], results: List[Any]
+    ) -> None:
+        if not results:
+            await ws.send_bytes(codec.response(request_id, NO_CONTENT))
+            return
+        # Bytecode results are traversers, script results plain values
+        if op == "bytecode":
+            results = [Traverser(obj, 1) for obj in results]
+        size = int(args.get("batchSize") or self.batch_size)
+        for start in range(0, len(results), size):
+            status = SUCCESS if start + size >= len(results) else PARTIAL_CONTENT
+            try:
+                payload = codec.response(request_id, status, results[start:start + size])
+            except Exception as e:
+                await self._fail(ws, codec, request_id, SERVER_SERIALIZATION_ERROR, f"{type(e).__name__}: {e}")
+                return
+            await ws.send_bytes(payload)
+
+    async def _fail(self, ws: web.WebSocketResponse, codec: Any, request_id: uuid.UUID, status: int, message: str) -> None:
+        self.errors += 1
+        await ws.send_bytes(codec.response(request_id, status, message=message))
+
+
+def _timeout(args: Dict[str, Any], default: Optional[float]) -> Optional[float]:
+    """Evaluation timeout in seconds: the request option (ms) or the server default."""
+    value = args.get("evaluationTimeout", args.get("scriptEvaluationTimeout"))
+    if value is not None and value > 0:
+        return value / 1000
+    return default
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Gremlin Server stand-in backed by an in-memory graph")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8182)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- variation of the latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=SERVER_TIMEOUT)
+    parser.add_argument("--evaluation-timeout", type=float, default=None, help="Seconds (default: none)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = GremlinStandInServer(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, error_status=args.error_status,
+        evaluation_timeout=args.evaluation_timeout, host=args.host, port=args.port, seed=args.seed,
+    )
+    server.start()
+    print(f"🧪 Gremlin stand-in server listening on {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Compact, versioned binary snapshot of a graph, opened with mmap.
+
+export_snapshot() reads the vertices of some entity classes and the edges of
+some relationship classes through an EntityManager and writes them to one
+file; GraphSnapshot.open() maps that file read-only. Nothing is parsed up
+front: the fixed-width columns (labels, ids, CSR offsets/targets, weights) are
+memoryviews over the mapping and the properties (JSON per element) are only
+decoded when read. Every worker mapping the same file shares its pages through
+the OS page cache, so N workers hold one copy of the graph, not N.
+
+Layout (little-endian, sections 8-byte aligned):
+
+    header   magic 'SOLTGRPH', version u16, flags u16, section count u32
+    table    per section: name (8 bytes), offset u64, length u64
+    META     JSON: labels, exported property names, weight property
+    VLABEL   i32[n]    label index of each vertex
+    VIDS     i64[n]    vertex ids (flag FLAG_INT_IDS), or VIDSOFF/VIDSDAT strings
+    VPROPOFF i64[n+1]  VPROPDAT: JSON properties of each vertex
+    OFFSETS  i64[n+1]  outgoing edges of vertex i: slots OFFSETS[i]..OFFSETS[i+1]-1
+    TARGETS  i64[m]    target vertex index of each slot
+    ELABEL   i32[m]    label index of each slot
+    WEIGHTS  f64[m]    weight property of each slot (0.0 when missing)
+    EPROPOFF i64[m+1]  EPROPDAT: JSON properties of each slot
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Type
+
+from gremlin_python.process.traversal import Direction, T
+
+from soltania_persistence.core.domain import ID, BaseEntity, Related, Relationship, entity_type, relationship_type
+from soltania_persistence.core.interfaces import EntityManager
+from soltania_persistence.provider.memory.graph import InMemoryGraph
+from soltania_persistence.provider.tinkerpop.hydration import edge_endpoint, element_id, element_properties, hydrator_for
+
+MAGIC = b"SOLTGRPH"
+# Incremented on any incompatible layout change; readers refuse other versions
+SNAPSHOT_VERSION = 1
+# Header flag: vertex ids are stored as int64 (VIDS) rather than strings (VIDSOFF/VIDSDAT)
+FLAG_INT_IDS = 1
+
+_HEADER = struct.Struct("<8sHHI")
+_SECTION = struct.Struct("<8sQQ")
+_ALIGN = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+@dataclass(frozen=True)
+class SnapshotStats:
+    """What export_snapshot() wrote."""
+    path: str
+    vertices: int
+    edges: int
+    size: int
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _blob_column(values: Sequence[bytes]) -> Tuple[array, bytes]:
+    """Offsets (n+1) and concatenated payload of variable-length values."""
+    offsets = array("q", [0])
+    for value in values:
+        offsets.append(offsets[-1] + len(value))
+    return offsets, b"".join(values)
+
+
+def _to_bytes(column: Any) -> bytes:
+    if isinstance(column, array):
+        if not _LITTLE_ENDIAN:
+            column = array(column.typecode, column)
+            column.byteswap()
+        return column.tobytes()
+    return column
+
+
+def write_snapshot(
+    path: str,
+    vertices: Sequence[Tuple[ID, str, Dict[str, Any]]],
+    edges: Sequence[Tuple[ID, ID, str, Dict[str, Any]]],
+    weight: Optional[str] = None,
+    meta: Optional[Mapping[str, Any]] = None,
+) -> SnapshotStats:
+    """
+    Writes (id, label, properties) vertices and (out id, in id, label,
+    properties) edges; properties must be JSON-serializable. Edges whose
+    endpoints are not among the vertices are dropped. The file is written
+    next to 'path' and renamed over it, so processes that already mapped the
+    previous snapshot keep reading it unchanged.
+    """
+    labels: List[str] = []
+    label_index: Dict[str, int] = {}
+
+    def label_of(label: str) -> int:
+        if label not in label_index:
+            label_index[label] = len(labels)
+            labels.append(label)
+        return label_index[label]
+
+    index = {vid: i for i, (vid, _, _) in enumerate(vertices)}
+    if len(index) != len(vertices):
+        raise ValueError("Duplicate vertex ids in snapshot")
+
+    int_ids = all(isinstance(vid, int) and not isinstance(vid, bool) for vid in index)
+    sections: List[Tuple[bytes, Any]] = []
+    sections.append((b"VLABEL", array("i", (label_of(label) for _, label, _ in vertices))))
+    if int_ids:
+        sections.append((b"VIDS", array("q", index)))
+    else:
+        offsets, blob = _blob_column([str(vid).encode("utf-8") for vid in index])
+        sections += [(b"VIDSOFF", offsets), (b"VIDSDAT", blob)]
+    offsets, blob = _blob_column([_json(properties) for _, _, properties in vertices])
+    sections += [(b"VPROPOFF", offsets), (b"VPROPDAT", blob)]
+
+    # CSR: edges grouped by source vertex, in input order within a row
+    rows: List[List[Tuple[int, str, Dict[str, Any]]]] = [[] for _ in vertices]
+    for out_id, in_id, label, properties in edges:
+        source, target = index.get(out_id), index.get(in_id)
+        if source is not None and target is not None:
+            rows[source].append((target, label, properties))
+
+    csr_offsets, targets, edge_labels, weights, edge_properties = array("q", [0]), array("q"), array("i"), array("d"), []
+    for row in rows:
+        for target, label, properties in row:
+            targets.append(target)
+            edge_labels.append(label_of(label))
+            weights.append(float(properties.get(weight) or 0.0) if weight else 0.0)
+            edge_properties.append(_json(properties))
+        csr_offsets.append(len(targets))
+    offsets, blob = _blob_column(edge_properties)
+    sections += [
+        (b"OFFSETS", csr_offsets), (b"TARGETS", targets), (b"ELABEL", edge_labels),
+        (b"WEIGHTS", weights), (b"EPROPOFF", offsets), (b"EPROPDAT", blob),
+    ]
+
+    info = {
+        "labels": labels,
+        "weight": weight,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **(meta or {}),
+    }
+    sections.insert(0, (b"META", _json(info)))
+
+    payloads = [(name, _to_bytes(column)) for name, column in sections]
+    position = _HEADER.size + _SECTION.size * len(payloads)
+    table, layout = [], []
+    for name, data in payloads:
+        position += -position % _ALIGN
+        table.append(_SECTION.pack(name, position, len(data)))
+        layout.append((position, data))
+        position += len(data)
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, SNAPSHOT_VERSION, FLAG_INT_IDS if int_ids else 0, len(payloads)))
+        f.write(b"".join(table))
+        for offset, data in layout:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+    return SnapshotStats(path, len(vertices), len(targets), position)
+
+
+def export_snapshot(
+    em: EntityManager,
+    path: str,
+    entity_classes: Sequence[Type[BaseEntity]],
+    relationship_classes: Sequence[Type[Relationship]] = (),
+    properties: Optional[Mapping[type, Sequence[str]]] = None,
+    weight: Optional[str] = None,
+) -> SnapshotStats:
+    """
+    Snapshots the vertices of 'entity_classes' and the edges of
+    'relationship_classes' between them. Elements go through their models
+    (validation, JSON-mode dump), restricted to 'properties[cls]' when given.
+    'weight' names a numeric edge property stored as a float64 column
+    (e.g. "duration"), ready for shortest-path searches on the CSR arrays.
+    """
+    properties = properties or {}
+    vertices = []
+    for entity_class in entity_classes:
+        include = set(properties[entity_class]) if entity_class in properties else None
+        for entity in em.stream(entity_class):
+            data = entity.model_dump(mode="json", exclude={"id"}, include=include, exclude_none=True)
+            vertices.append((entity.id, entity_class.__label__, data))
+
+    edges = []
+    for relationship_class in relationship_classes:
+        include = set(properties[relationship_class]) if relationship_class in properties else None
+        label = relationship_class.__label__
+        for edge_map in em.g.E().hasLabel(label).elementMap().toList():
+            relationship = relationship_class(**element_properties(edge_map))
+            data = relationship.model_dump(mode="json", include=include, exclude_none=True)
+            out_v, in_v = edge_endpoint(edge_map, Direction.OUT), edge_endpoint(edge_map, Direction.IN)
+            edges.append((element_id(out_v), element_id(in_v), label, data))
+
+    return write_snapshot(path, vertices, edges, weight=weight, meta={
+        "entities": {cls.__label__: cls.__name__ for cls in entity_classes},
+        "relationships": {cls.__label__: cls.__name__ for cls in relationship_classes},
+    })
+
+
+class GraphSnapshot:
+    """
+    Read-only graph over a mapped snapshot file. Vertices are numbered
+    0..n-1; 'offsets', 'targets' and 'weights' are CSR arrays usable as is
+    by shortest-path code (e.g. routing.shortest_paths).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._views: List[memoryview] = []
+        self._index: Optional[Dict[ID, int]] = None
+        self._lookups: Dict[Tuple[str, str], Dict[Any, List[int]]] = {}
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def open(cls, path: str) -> "GraphSnapshot":
+        return cls(path)
+
+    def _parse(self) -> None:
+        buffer = self._view(memoryview(self._mmap))
+        magic, version, flags, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a graph snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})")
+
+        sections = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+            sections[name.rstrip(b"\0").decode("ascii")] = self._view(buffer[offset:offset + length])
+
+        self.meta: Dict[str, Any] = json.loads(bytes(sections["META"]))
+        self.labels: List[str] = self.meta["labels"]
+        self.vertex_labels = self._column(sections["VLABEL"], "i")
+        self._int_ids = bool(flags & FLAG_INT_IDS)
+        if self._int_ids:
+            self._ids = self._column(sections["VIDS"], "q")
+        else:
+            self._ids = (self._column(sections["VIDSOFF"], "q"), sections["VIDSDAT"])
+        self._vertex_properties = (self._column(sections["VPROPOFF"], "q"), sections["VPROPDAT"])
+        self.offsets = self._column(sections["OFFSETS"], "q")
+        self.targets = self._column(sections["TARGETS"], "q")
+        self.edge_labels = self._column(sections["ELABEL"], "i")
+        self.weights = self._column(sections["WEIGHTS"], "d")
+        self._edge_properties = (self._column(sections["EPROPOFF"], "q"), sections["EPROPDAT"])
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _column(self, section: memoryview, typecode: str) -> Sequence[Any]:
+        if _LITTLE_ENDIAN:
+            return self._view(section.cast(typecode))
+        column = array(typecode, bytes(section))
+        column.byteswap()
+        return column
+
+    @staticmethod
+    def _blob(column: Tuple[Sequence[int], memoryview], i: int) -> bytes:
+        offsets, data = column
+        return bytes(data[offsets[i]:offsets[i + 1]])
+
+    # --- Vertices ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.vertex_labels)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def vertex_id(self, i: int) -> ID:
+        if self._int_ids:
+            return self._ids[i]
+        return self._blob(self._ids, i).decode("utf-8")
+
+    def label(self, i: int) -> str:
+        return self.labels[self.vertex_labels[i]]
+
+    def properties(self, i: int) -> Dict[str, Any]:
+        return json.loads(self._blob(self._vertex_properties, i))
+
+    def element_map(self, i: int) -> Dict[Any, Any]:
+        """Vertex i in elementMap() form (T.id, T.label, properties)."""
+        return {T.id: self.vertex_id(i), T.label: self.label(i), **self.properties(i)}
+
+    def entity(self, i: int) -> BaseEntity:
+        """Vertex i hydrated as its entity class (resolved by label)."""
+        entity_class = entity_type(self.label(i))
+        if entity_class is None:
+            raise ValueError(f"No entity class is defined for the vertex label '{self.label(i)}'")
+        return hydrator_for(entity_class).hydrate(self.element_map(i))
+
+    def index_of(self, vid: ID) -> Optional[int]:
+        """Vertex number of a graph id (the id -> number map is built on first use)."""
+        if self._index is None:
+            self._index = {self.vertex_id(i): i for i in range(len(self))}
+        return self._index.get(vid)
+
+    def lookup(self, label: str, key: str, value: Any) -> List[int]:
+        """Vertices of 'label' whose property 'key' equals 'value' (index built on first use)."""
+        index = self._lookups.get((label, key))
+        if index is None:
+            index = {}
+            wanted = self.labels.index(label) if label in self.labels else -1
+            for i in range(len(self)):
+                if self.vertex_labels[i] == wanted:
+                    found = self.properties(i).get(key)
+                    if found is not None:
+                        index.setdefault(found, []).append(i)
+            self._lookups[(label, key)] = index
+        return index.get(value, [])
+
+    # --- Edges ---------------------------------------------------------------
+
+    def edge_slots(self, i: int) -> range:
+        """Slots of the outgoing edges of vertex i."""
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def edge_label(self, slot: int) -> str:
+        return self.labels[self.edge_labels[slot]]
+
+    def edge_properties(self, slot: int) -> Dict[str, Any]:
+        return json.loads(self._blob(self._edge_properties, slot))
+
+    def relationship(self, slot: int) -> Relationship:
+        """Edge of a slot hydrated as its Relationship class (resolved by label)."""
+        relationship_class = relationship_type(self.edge_label(slot))
+        if relationship_class is None:
+            raise ValueError(f"No Relationship model is defined for the edge label '{self.edge_label(slot)}'")
+        return relationship_class(**self.edge_properties(slot))
+
+    def related(self, i: int, relation: Optional[str] = None) -> List[Related]:
+        """Outgoing edges of vertex i (optionally one label) with their target entities."""
+        return [
+            Related(self.relationship(slot), self.entity(self.targets[slot]))
+            for slot in self.edge_slots(i)
+            if relation is None or self.edge_label(slot) == relation
+        ]
+
+    # --- Conversion & lifetime -------------------------------------------------
+
+    def to_graph(self) -> InMemoryGraph:
+        """Full InMemoryGraph copy (e.g. for an InMemoryEntityManager); decodes every element."""
+        graph = InMemoryGraph()
+        for i in range(len(self)):
+            graph.add_vertex(self.label(i), self.properties(i), id=self.vertex_id(i))
+        for i in range(len(self)):
+            source = self.vertex_id(i)
+            for slot in self.edge_slots(i):
+                graph.add_edge(self.edge_label(slot), source, self.vertex_id(self.targets[slot]), self.edge_properties(slot))
+        return graph
+
+    def iter_entities(self, label: Optional[str] = None) -> Iterator[BaseEntity]:
+        for i in range(len(self)):
+            if label is None or self.label(i) == label:
+                yield self.entity(i)
+
+    def close(self) -> None:
+        """Unmaps the file; columns and views obtained from the snapshot become invalid."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "GraphSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
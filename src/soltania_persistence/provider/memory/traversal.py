@@ -0,0 +1,1050 @@
+"""
+Local execution of Gremlin bytecode against an InMemoryGraph.
+
+gremlinpython traversals are built client-side as Bytecode and normally sent to a
+Gremlin Server. LocalRemoteConnection plugs into the same RemoteConnection hook,
+so 'traversal().withRemote(LocalRemoteConnection(graph))' gives a regular 'g'
+whose traversals run in process. Only the steps used by this project's managers
+and repositories are supported; anything else raises UnsupportedStepError.
+"""
+import operator
+import random
+import re
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from gremlin_python.driver.remote_connection import RemoteConnection, RemoteTraversal
+from gremlin_python.process.traversal import (
+    Bytecode, Cardinality, Direction, Operator, Order, P, Pop, Scope, T, TextP, Traverser,
+)
+from gremlin_python.structure.graph import Edge, Path, Vertex
+
+from soltania_persistence.provider.memory.graph import InMemoryGraph
+
+
+class UnsupportedStepError(NotImplementedError):
+    """Raised for bytecode the local interpreter does not implement."""
+    pass
+
+
+# --- Traversers & programs ---
+
+class _Traverser:
+    """A traverser: current object, path history (objects + step labels), sack and loop counters."""
+    __slots__ = ("obj", "path", "labels", "sack", "loops")
+
+    def __init__(self, obj: Any, path: tuple = (), labels: tuple = (), sack: Any = None, loops: tuple = ()):
+        self.obj = obj
+        self.path = path
+        self.labels = labels
+        self.sack = sack
+        self.loops = loops
+
+    def split(self, obj: Any) -> "_Traverser":
+        """Moves to a new object and records it in the path."""
+        return _Traverser(obj, self.path + (obj,), self.labels + (frozenset(),), self.sack, self.loops)
+
+    def detach(self, obj: Any) -> "_Traverser":
+        """New object, fresh path (output of a reducing barrier)."""
+        return _Traverser(obj, (obj,), (frozenset(),), self.sack, ())
+
+    def copy(self, **changes: Any) -> "_Traverser":
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return _Traverser(**values)
+
+
+class _Step:
+    __slots__ = ("name", "args", "by", "mods", "is_start", "index")
+
+    def __init__(self, name: str, args: list):
+        self.name = name
+        self.args = args
+        self.by: List[list] = []
+        self.mods: Dict[str, Any] = {}
+        self.is_start = False
+        self.index: Optional[Tuple[str, str, Any]] = None
+
+
+class _Program:
+    """Compiled (child) traversal: a list of steps."""
+    __slots__ = ("steps",)
+
+    def __init__(self, steps: List[_Step]):
+        self.steps = steps
+
+
+class _Context:
+    def __init__(self, graph: InMemoryGraph):
+        self.graph = graph
+        self.sack_initial: Any = None
+        self.sack_merge: Any = None
+        self.side_effects: Dict[str, Any] = {}
+        # Per-step state (dedup sets) shared by every pass of a repeat() body
+        self.step_state: Dict[int, Any] = {}
+
+
+_MODULATORS = ("until", "emit", "times")
+_STEPS: Dict[str, Callable[[_Context, _Step, Iterable[_Traverser]], Iterator[_Traverser]]] = {}
+
+
+def _step(*names: str):
+    def register(fn):
+        for name in names:
+            _STEPS[name] = fn
+        return fn
+    return register
+
+
+def _compile_arg(arg: Any) -> Any:
+    if isinstance(arg, Bytecode):
+        return _compile(arg.step_instructions)
+    if isinstance(arg, list):
+        return [_compile_arg(a) for a in arg]
+    return arg
+
+
+def _split_infix(instructions: list, connective: str) -> Optional[List[list]]:
+    """Splits 'a.or_().b' style bytecode into its branches (None if no infix connective)."""
+    if not any(inst[0] == connective and len(inst) == 1 for inst in instructions):
+        return None
+    branches: List[list] = [[]]
+    for inst in instructions:
+        if inst[0] == connective and len(inst) == 1:
+            branches.append([])
+        else:
+            branches[-1].append(inst)
+    return branches
+
+
+def _compile(instructions: list) -> _Program:
+    for connective in ("or", "and"):
+        branches = _split_infix(instructions, connective)
+        if branches is not None:
+            return _Program([_Step(connective, [_compile(b) for b in branches])])
+
+    steps: List[_Step] = []
+    pending: Dict[str, Any] = {}
+    for inst in instructions:
+        name, args = inst[0], [_compile_arg(a) for a in inst[1:]]
+        if name == "by":
+            steps[-1].by.append(args)
+        elif name in ("to", "from"):
+            steps[-1].mods[name] = args[0]
+        elif name in _MODULATORS:
+            if steps and steps[-1].name == "repeat" and name not in steps[-1].mods:
+                steps[-1].mods[name] = (args, False)
+            else:
+                pending[name] = (args, True)
+        elif name == "with":
+            continue
+        else:
+            step = _Step(name, args)
+            if name == "repeat":
+                step.mods.update(pending)
+                pending = {}
+            steps.append(step)
+
+    _fold_index_lookups(steps)
+    return _Program(steps)
+
+
+def _fold_index_lookups(steps: List[_Step]) -> None:
+    """V().hasLabel(l).has(k, v) with a plain value is answered from the property index."""
+    for i, step in enumerate(steps[:-2]):
+        if step.name != "V" or step.args:
+            continue
+        has_label, has = steps[i + 1], steps[i + 2]
+        if (has_label.name == "hasLabel" and len(has_label.args) == 1 and isinstance(has_label.args[0], str)
+                and has.name == "has" and len(has.args) == 2 and isinstance(has.args[0], str)
+                and not isinstance(has.args[1], (P, _Program))):
+            step.index = (has_label.args[0], has.args[0], has.args[1])
+
+
+def _run(ctx: _Context, program: _Program, traversers: Iterable[_Traverser]) -> Iterator[_Traverser]:
+    stream: Iterable[_Traverser] = traversers
+    for step in program.steps:
+        try:
+            handler = _STEPS[step.name]
+        except KeyError:
+            raise UnsupportedStepError(f"Step '{step.name}' is not supported by the in-memory provider") from None
+        stream = handler(ctx, step, stream)
+    return iter(stream)
+
+
+def _run_one(ctx: _Context, program: _Program, t: _Traverser) -> Iterator[_Traverser]:
+    """Runs a child traversal for one traverser; like a TinkerPop local child, it starts from fresh step state."""
+    saved, ctx.step_state = ctx.step_state, {}
+    try:
+        return iter(list(_run(ctx, program, (t,))))
+    finally:
+        ctx.step_state = saved
+
+
+def _first(ctx: _Context, program: _Program, t: _Traverser, default: Any = None) -> Any:
+    for result in _run_one(ctx, program, t):
+        return result.obj
+    return default
+
+
+def _produces(ctx: _Context, program: _Program, t: _Traverser) -> bool:
+    for _ in _run_one(ctx, program, t):
+        return True
+    return False
+
+
+# --- Element helpers ---
+
+def _vertex(ctx: _Context, vid: Any) -> Vertex:
+    return Vertex(vid, ctx.graph.vertices[vid].label)
+
+
+def _edge(ctx: _Context, eid: Any) -> Edge:
+    record = ctx.graph.edges[eid]
+    return Edge(eid, _vertex(ctx, record.out_v), record.label, _vertex(ctx, record.in_v))
+
+
+def _record(ctx: _Context, obj: Any):
+    if isinstance(obj, Vertex):
+        return ctx.graph.vertices.get(obj.id)
+    if isinstance(obj, Edge):
+        return ctx.graph.edges.get(obj.id)
+    return None
+
+
+def _properties(ctx: _Context, obj: Any) -> Dict[str, Any]:
+    if isinstance(obj, dict):
+        return obj
+    record = _record(ctx, obj)
+    return record.properties if record is not None else {}
+
+
+def _is_id_token(key: Any) -> bool:
+    return key in (T.id, T.id_)
+
+
+def _get(ctx: _Context, obj: Any, key: Any) -> Any:
+    """Property (or map entry / token) of an object; _MISSING when absent."""
+    if _is_id_token(key):
+        return obj.id if isinstance(obj, (Vertex, Edge)) else obj.get(key, _MISSING) if isinstance(obj, dict) else _MISSING
+    if key == T.label:
+        return obj.label if isinstance(obj, (Vertex, Edge)) else obj.get(key, _MISSING) if isinstance(obj, dict) else _MISSING
+    return _properties(ctx, obj).get(key, _MISSING)
+
+
+class _Missing:
+    def __repr__(self):
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+def _element_map(ctx: _Context, obj: Any, keys: Sequence[str]) -> Dict[Any, Any]:
+    record = _record(ctx, obj)
+    result: Dict[Any, Any] = {T.id: obj.id, T.label: obj.label}
+    if isinstance(obj, Edge):
+        result[Direction.IN] = {T.id: record.in_v, T.label: ctx.graph.vertices[record.in_v].label}
+        result[Direction.OUT] = {T.id: record.out_v, T.label: ctx.graph.vertices[record.out_v].label}
+    for key, value in record.properties.items():
+        if not keys or key in keys:
+            result[key] = value
+    return result
+
+
+def _by_value(ctx: _Context, spec: list, t: _Traverser) -> Any:
+    """Evaluates a by() modulator for a traverser ([] = identity, key, token or child traversal)."""
+    if not spec or isinstance(spec[0], Order):
+        return t.obj
+    modulator = spec[0]
+    if isinstance(modulator, _Program):
+        return _first(ctx, modulator, t, _MISSING)
+    return _get(ctx, t.obj, modulator)
+
+
+def _by_for(step: _Step, position: int) -> list:
+    """by() modulators are applied round-robin."""
+    return step.by[position % len(step.by)] if step.by else []
+
+
+# --- Predicates ---
+
+def _compare(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def test(value: Any, expected: Any) -> bool:
+        try:
+            return op(value, expected)
+        except TypeError:
+            return False
+    return test
+
+
+_PREDICATES: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "neq": operator.ne,
+    "gt": _compare(operator.gt),
+    "gte": _compare(operator.ge),
+    "lt": _compare(operator.lt),
+    "lte": _compare(operator.le),
+    "within": lambda value, expected: value in expected,
+    "without": lambda value, expected: value not in expected,
+    "containing": lambda value, expected: isinstance(value, str) and expected in value,
+    "notContaining": lambda value, expected: isinstance(value, str) and expected not in value,
+    "startingWith": lambda value, expected: isinstance(value, str) and value.startswith(expected),
+    "notStartingWith": lambda value, expected: isinstance(value, str) and not value.startswith(expected),
+    "endingWith": lambda value, expected: isinstance(value, str) and value.endswith(expected),
+    "notEndingWith": lambda value, expected: isinstance(value, str) and not value.endswith(expected),
+    "regex": lambda value, expected: isinstance(value, str) and re.search(expected, value) is not None,
+}
+
+
+def _test(predicate: Any, value: Any) -> bool:
+    if value is _MISSING:
+        return False
+    if not isinstance(predicate, (P, TextP)):
+        return value == predicate
+    op = predicate.operator
+    if op == "and":
+        return _test(predicate.value, value) and _test(predicate.other, value)
+    if op == "or":
+        return _test(predicate.value, value) or _test(predicate.other, value)
+    if op == "not":
+        return not _test(predicate.value, value)
+    if op == "between":
+        return _compare(lambda v, _: predicate.value <= v < predicate.other)(value, None)
+    if op == "inside":
+        return _compare(lambda v, _: predicate.value < v < predicate.other)(value, None)
+    if op == "outside":
+        return _compare(lambda v, _: v < predicate.value or v > predicate.other)(value, None)
+    try:
+        return _PREDICATES[op](value, predicate.value)
+    except KeyError:
+        raise UnsupportedStepError(f"Predicate '{op}' is not supported by the in-memory provider") from None
+
+
+# --- Start / graph steps ---
+
+def _ids_of(args: list) -> List[Any]:
+    ids: List[Any] = []
+    for arg in args:
+        if isinstance(arg, (list, tuple, set)):
+            ids.extend(_ids_of(list(arg)))
+        else:
+            ids.append(arg.id if isinstance(arg, (Vertex, Edge)) else arg)
+    return ids
+
+
+@_step("V")
+def _v(ctx, step, traversers):
+    for t in traversers:
+        if step.index is not None:
+            vids = ctx.graph.lookup(*step.index)
+        elif step.args:
+            vids = [vid for vid in _ids_of(step.args) if vid in ctx.graph.vertices]
+        else:
+            vids = ctx.graph.vertex_ids()
+        for vid in vids:
+            yield t.split(_vertex(ctx, vid))
+
+
+@_step("E")
+def _e(ctx, step, traversers):
+    for t in traversers:
+        eids = [eid for eid in _ids_of(step.args) if eid in ctx.graph.edges] if step.args else list(ctx.graph.edges)
+        for eid in eids:
+            yield t.split(_edge(ctx, eid))
+
+
+@_step("inject")
+def _inject(ctx, step, traversers):
+    if not step.is_start:
+        yield from traversers
+    root = _Traverser(None, sack=ctx.sack_initial)
+    for value in step.args:
+        yield root.split(value)
+
+
+@_step("addV")
+def _add_v(ctx, step, traversers):
+    label = step.args[0] if step.args else "vertex"
+    for t in traversers:
+        yield t.split(_vertex(ctx, ctx.graph.add_vertex(label)))
+
+
+def _endpoint(ctx: _Context, spec: Any, t: _Traverser) -> Any:
+    if isinstance(spec, _Program):
+        spec = _first(ctx, spec, t)
+    elif isinstance(spec, str):
+        spec = _select_one(t, spec, Pop.last)
+    if spec is None or spec is _MISSING:
+        raise ValueError("addE() endpoint did not resolve to a vertex")
+    return spec.id if isinstance(spec, Vertex) else spec
+
+
+@_step("addE")
+def _add_e(ctx, step, traversers):
+    label = step.args[0]
+    for t in traversers:
+        out_v = _endpoint(ctx, step.mods["from"], t) if "from" in step.mods else t.obj.id
+        in_v = _endpoint(ctx, step.mods["to"], t) if "to" in step.mods else t.obj.id
+        yield t.split(_edge(ctx, ctx.graph.add_edge(label, out_v, in_v)))
+
+
+@_step("property")
+def _property(ctx, step, traversers):
+    args = list(step.args)
+    if args and isinstance(args[0], Cardinality):
+        args = args[1:]
+    key, value = args[0], args[1]
+    for t in traversers:
+        resolved = _first(ctx, value, t) if isinstance(value, _Program) else value
+        if isinstance(t.obj, Vertex):
+            ctx.graph.set_vertex_property(t.obj.id, key, resolved)
+        elif isinstance(t.obj, Edge):
+            ctx.graph.set_edge_property(t.obj.id, key, resolved)
+        yield t
+
+
+@_step("drop")
+def _drop(ctx, step, traversers):
+    for t in list(traversers):
+        if isinstance(t.obj, Vertex):
+            ctx.graph.remove_vertex(t.obj.id)
+        elif isinstance(t.obj, Edge):
+            ctx.graph.remove_edge(t.obj.id)
+    return iter(())
+
+
+# --- Navigation ---
+
+def _navigate(direction: str, to_vertex: bool, other_end: Optional[str] = None):
+    def handler(ctx, step, traversers):
+        labels = tuple(step.args)
+        for t in traversers:
+            if not isinstance(t.obj, Vertex):
+                continue
+            for eid in ctx.graph.edge_ids(t.obj.id, direction, labels):
+                if not to_vertex:
+                    yield t.split(_edge(ctx, eid))
+                    continue
+                record = ctx.graph.edges[eid]
+                if direction == "OUT":
+                    yield t.split(_vertex(ctx, record.in_v))
+                elif direction == "IN":
+                    yield t.split(_vertex(ctx, record.out_v))
+                else:
+                    other = record.in_v if record.out_v == t.obj.id else record.out_v
+                    yield t.split(_vertex(ctx, other))
+    return handler
+
+
+_STEPS["out"] = _navigate("OUT", True)
+_STEPS["in"] = _navigate("IN", True)
+_STEPS["both"] = _navigate("BOTH", True)
+_STEPS["outE"] = _navigate("OUT", False)
+_STEPS["inE"] = _navigate("IN", False)
+_STEPS["bothE"] = _navigate("BOTH", False)
+
+
+@_step("outV", "inV", "bothV", "otherV")
+def _edge_vertices(ctx, step, traversers):
+    for t in traversers:
+        if not isinstance(t.obj, Edge):
+            continue
+        record = ctx.graph.edges[t.obj.id]
+        if step.name == "outV":
+            ends = [record.out_v]
+        elif step.name == "inV":
+            ends = [record.in_v]
+        elif step.name == "bothV":
+            ends = [record.out_v, record.in_v]
+        else:
+            previous = t.path[-2] if len(t.path) > 1 else None
+            came_from = previous.id if isinstance(previous, Vertex) else None
+            ends = [record.in_v if came_from == record.out_v else record.out_v]
+        for vid in ends:
+            yield t.split(_vertex(ctx, vid))
+
+
+# --- Map steps ---
+
+@_step("id")
+def _id(ctx, step, traversers):
+    for t in traversers:
+        yield t.split(t.obj.id)
+
+
+@_step("label")
+def _label(ctx, step, traversers):
+    for t in traversers:
+        yield t.split(t.obj.label)
+
+
+@_step("values")
+def _values(ctx, step, traversers):
+    for t in traversers:
+        props = _properties(ctx, t.obj)
+        for key, value in props.items():
+            if not step.args or key in step.args:
+                yield t.split(value)
+
+
+@_step("elementMap")
+def _element_map_step(ctx, step, traversers):
+    for t in traversers:
+        yield t.split(_element_map(ctx, t.obj, step.args))
+
+
+@_step("valueMap")
+def _value_map(ctx, step, traversers):
+    args = [a for a in step.args if not isinstance(a, bool)]
+    with_tokens = bool(step.args and step.args[0] is True)
+    for t in traversers:
+        result: Dict[Any, Any] = {}
+        if with_tokens:
+            result[T.id], result[T.label] = t.obj.id, t.obj.label
+        for key, value in _properties(ctx, t.obj).items():
+            if not args or key in args:
+                result[key] = value if isinstance(t.obj, Edge) else [value]
+        yield t.split(result)
+
+
+@_step("constant")
+def _constant(ctx, step, traversers):
+    for t in traversers:
+        yield t.split(step.args[0])
+
+
+@_step("identity")
+def _identity(ctx, step, traversers):
+    return iter(traversers)
+
+
+@_step("unfold")
+def _unfold(ctx, step, traversers):
+    for t in traversers:
+        obj = t.obj
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                yield t.split({key: value})
+        elif isinstance(obj, (list, tuple, set, Path)):
+            for item in (obj.objects if isinstance(obj, Path) else obj):
+                yield t.split(item)
+        else:
+            yield t
+
+
+@_step("loops")
+def _loops(ctx, step, traversers):
+    for t in traversers:
+        yield t.split(t.loops[-1] if t.loops else 0)
+
+
+def _select_one(t: _Traverser, key: str, pop: Any) -> Any:
+    if isinstance(t.obj, dict) and key in t.obj:
+        return t.obj[key]
+    matches = [obj for obj, labels in zip(t.path, t.labels) if key in labels]
+    if not matches:
+        return _MISSING
+    if pop == Pop.all_:
+        return matches
+    return matches[0] if pop == Pop.first else matches[-1]
+
+
+@_step("select")
+def _select(ctx, step, traversers):
+    args = list(step.args)
+    pop = args.pop(0) if args and isinstance(args[0], Pop) else Pop.last
+    for t in traversers:
+        values = [_select_one(t, key, pop) for key in args]
+        if any(v is _MISSING for v in values):
+            continue
+        if step.by:
+            values = [_by_value(ctx, _by_for(step, i), t.copy(obj=v)) for i, v in enumerate(values)]
+        yield t.split(values[0] if len(args) == 1 else dict(zip(args, values)))
+
+
+@_step("project")
+def _project(ctx, step, traversers):
+    for t in traversers:
+        result = {}
+        for i, key in enumerate(step.args):
+            value = _by_value(ctx, step.by[i] if i < len(step.by) else [], t)
+            if value is not _MISSING:
+                result[key] = value
+        yield t.split(result)
+
+
+@_step("path")
+def _path(ctx, step, traversers):
+    for t in traversers:
+        objects = []
+        for i, obj in enumerate(t.path):
+            spec = _by_for(step, i)
+            objects.append(_by_value(ctx, spec, _Traverser(obj, (obj,), (frozenset(),), t.sack, t.loops)))
+        yield t.split(Path([set(labels) for labels in t.labels], objects))
+
+
+@_step("sack")
+def _sack(ctx, step, traversers):
+    if not step.args:
+        for t in traversers:
+            yield t.split(t.sack)
+        return
+    op = _SACK_OPERATORS[step.args[0]]
+    for t in traversers:
+        value = _by_value(ctx, step.by[0] if step.by else [], t)
+        yield t.copy(sack=op(t.sack, value)) if value is not _MISSING else t
+
+
+_SACK_OPERATORS: Dict[Any, Callable[[Any, Any], Any]] = {
+    Operator.sum_: operator.add,
+    Operator.minus: operator.sub,
+    Operator.mult: operator.mul,
+    Operator.div: operator.truediv,
+    Operator.min: min,
+    Operator.min_: min,
+    Operator.max: max,
+    Operator.max_: max,
+    Operator.assign: lambda _, value: value,
+    Operator.and_: lambda a, b: a and b,
+    Operator.or_: lambda a, b: a or b,
+    Operator.addAll: lambda a, b: list(a) + list(b),
+    Operator.add_all: lambda a, b: list(a) + list(b),
+}
+
+
+@_step("as")
+def _as(ctx, step, traversers):
+    for t in traversers:
+        if not t.labels:
+            yield t
+            continue
+        labels = t.labels[:-1] + (t.labels[-1] | frozenset(step.args),)
+        yield t.copy(labels=labels)
+
+
+# --- Filter steps ---
+
+@_step("has")
+def _has(ctx, step, traversers):
+    args = step.args
+    if len(args) == 3:
+        label, key, predicate = args
+    elif len(args) == 2:
+        label, (key, predicate) = None, args
+    else:
+        label, key, predicate = None, args[0], _MISSING
+    for t in traversers:
+        if label is not None and getattr(t.obj, "label", None) != label:
+            continue
+        if isinstance(predicate, _Program):
+            value = _get(ctx, t.obj, key)
+            if value is not _MISSING and _produces(ctx, predicate, t.copy(obj=value)):
+                yield t
+            continue
+        value = _get(ctx, t.obj, key)
+        if predicate is _MISSING:
+            if value is not _MISSING:
+                yield t
+        elif _test(predicate, value):
+            yield t
+
+
+@_step("hasNot")
+def _has_not(ctx, step, traversers):
+    for t in traversers:
+        if _get(ctx, t.obj, step.args[0]) is _MISSING:
+            yield t
+
+
+def _matches_any(values: list, actual: Any) -> bool:
+    for value in values:
+        if isinstance(value, (P, TextP)):
+            if _test(value, actual):
+                return True
+        elif value == actual:
+            return True
+    return False
+
+
+@_step("hasLabel")
+def _has_label(ctx, step, traversers):
+    for t in traversers:
+        if _matches_any(list(step.args), getattr(t.obj, "label", _MISSING)):
+            yield t
+
+
+@_step("hasId")
+def _has_id(ctx, step, traversers):
+    ids = [a if isinstance(a, (P, TextP)) else a for a in _ids_of([a for a in step.args if not isinstance(a, P)])]
+    ids += [a for a in step.args if isinstance(a, P)]
+    for t in traversers:
+        if _matches_any(ids, getattr(t.obj, "id", _MISSING)):
+            yield t
+
+
+@_step("is")
+def _is(ctx, step, traversers):
+    for t in traversers:
+        if _test(step.args[0], t.obj):
+            yield t
+
+
+@_step("where", "filter")
+def _where(ctx, step, traversers):
+    for t in traversers:
+        if _produces(ctx, step.args[0], t):
+            yield t
+
+
+@_step("not")
+def _not(ctx, step, traversers):
+    for t in traversers:
+        if not _produces(ctx, step.args[0], t):
+            yield t
+
+
+@_step("and")
+def _and(ctx, step, traversers):
+    for t in traversers:
+        if all(_produces(ctx, child, t) for child in step.args):
+            yield t
+
+
+@_step("or")
+def _or(ctx, step, traversers):
+    for t in traversers:
+        if any(_produces(ctx, child, t) for child in step.args):
+            yield t
+
+
+@_step("simplePath")
+def _simple_path(ctx, step, traversers):
+    for t in traversers:
+        if len(set(t.path)) == len(t.path):
+            yield t
+
+
+@_step("cyclicPath")
+def _cyclic_path(ctx, step, traversers):
+    for t in traversers:
+        if len(set(t.path)) != len(t.path):
+            yield t
+
+
+@_step("dedup")
+def _dedup(ctx, step, traversers):
+    seen = ctx.step_state.setdefault(id(step), set())
+    for t in traversers:
+        key = _by_value(ctx, _by_for(step, 0), t)
+        marker = repr(key) if isinstance(key, (dict, list)) else key
+        if marker not in seen:
+            seen.add(marker)
+            yield t
+
+
+def _scope_args(args: list) -> Tuple[bool, list]:
+    if args and isinstance(args[0], Scope):
+        return args[0] == Scope.local, args[1:]
+    return False, args
+
+
+@_step("limit")
+def _limit(ctx, step, traversers):
+    local, args = _scope_args(step.args)
+    if local:
+        for t in traversers:
+            yield t.copy(obj=list(t.obj)[:args[0]]) if isinstance(t.obj, (list, tuple)) else t
+        return
+    if args[0] <= 0:
+        return
+    for i, t in enumerate(traversers, 1):
+        yield t
+        if i >= args[0]:
+            return
+
+
+@_step("range")
+def _range(ctx, step, traversers):
+    local, (low, high) = _scope_args(step.args)
+    if local:
+        for t in traversers:
+            items = list(t.obj)
+            yield t.copy(obj=items[low:high if high >= 0 else None])
+        return
+    for i, t in enumerate(traversers):
+        if high >= 0 and i >= high:
+            return
+        if i >= low:
+            yield t
+
+
+@_step("skip")
+def _skip(ctx, step, traversers):
+    for i, t in enumerate(traversers):
+        if i >= step.args[-1]:
+            yield t
+
+
+@_step("tail")
+def _tail(ctx, step, traversers):
+    count = step.args[-1] if step.args else 1
+    return iter(list(traversers)[-count:] if count else [])
+
+
+# --- Branch steps ---
+
+@_step("repeat")
+def _repeat(ctx, step, traversers):
+    """
+    repeat() is evaluated breadth-first: the body runs over the whole frontier, which
+    also gives barrier()/order() inside the body their intended per-level meaning.
+    until()/emit() declared before repeat() are checked before the first pass.
+    """
+    body = step.args[0]
+    until, until_first = step.mods.get("until", (None, False))
+    emit, emit_first = step.mods.get("emit", (None, False))
+    times = step.mods.get("times", (None, False))[0]
+
+    def done(t: _Traverser) -> bool:
+        if times is not None and t.loops[-1] >= times[0]:
+            return True
+        if until is not None:
+            predicate = until[0]
+            return _produces(ctx, predicate, t) if isinstance(predicate, _Program) else _test(predicate, t.obj)
+        return False
+
+    def emitted(t: _Traverser) -> bool:
+        if emit is None:
+            return False
+        return not emit or _produces(ctx, emit[0], t)
+
+    def leave(t: _Traverser) -> _Traverser:
+        return t.copy(loops=t.loops[:-1])
+
+    frontier = []
+    for t in traversers:
+        t = t.copy(loops=t.loops + (0,))
+        if until_first and done(t):
+            yield leave(t)
+            continue
+        if emit_first and emitted(t):
+            yield leave(t)
+        frontier.append(t)
+
+    while frontier:
+        next_frontier = []
+        for t in _run(ctx, body, frontier):
+            t = t.copy(loops=t.loops[:-1] + (t.loops[-1] + 1,))
+            if done(t):
+                yield leave(t)
+                continue
+            if emitted(t):
+                yield leave(t)
+            next_frontier.append(t)
+        frontier = next_frontier
+
+
+@_step("local")
+def _local(ctx, step, traversers):
+    for t in traversers:
+        yield from _run_one(ctx, step.args[0], t)
+
+
+@_step("map")
+def _map(ctx, step, traversers):
+    for t in traversers:
+        value = _first(ctx, step.args[0], t, _MISSING)
+        if value is not _MISSING:
+            yield t.split(value)
+
+
+@_step("flatMap")
+def _flat_map(ctx, step, traversers):
+    for t in traversers:
+        for result in _run_one(ctx, step.args[0], t):
+            yield t.split(result.obj)
+
+
+@_step("union")
+def _union(ctx, step, traversers):
+    for t in traversers:
+        for child in step.args:
+            yield from _run_one(ctx, child, t)
+
+
+@_step("coalesce")
+def _coalesce(ctx, step, traversers):
+    for t in traversers:
+        for child in step.args:
+            results = list(_run_one(ctx, child, t))
+            if results:
+                yield from results
+                break
+
+
+@_step("optional")
+def _optional(ctx, step, traversers):
+    for t in traversers:
+        results = list(_run_one(ctx, step.args[0], t))
+        yield from results if results else (t,)
+
+
+@_step("sideEffect")
+def _side_effect(ctx, step, traversers):
+    for t in traversers:
+        for _ in _run_one(ctx, step.args[0], t):
+            pass
+        yield t
+
+
+# --- Barriers & reducers ---
+
+@_step("barrier")
+def _barrier(ctx, step, traversers):
+    return iter(list(traversers))
+
+
+@_step("discard", "none")
+def _discard(ctx, step, traversers):
+    for _ in traversers:
+        pass
+    return iter(())
+
+
+@_step("order")
+def _order(ctx, step, traversers):
+    local, _ = _scope_args(step.args)
+    items = list(traversers)
+    if local:
+        for t in items:
+            yield t.copy(obj=sorted(t.obj))
+        return
+    specs = step.by or [[]]
+    for spec in reversed(specs):
+        direction = next((a for a in spec if isinstance(a, Order)), Order.asc)
+        if direction == Order.shuffle:
+            random.shuffle(items)
+            continue
+        items.sort(key=lambda t: _sort_key(_by_value(ctx, spec, t)), reverse=direction == Order.desc)
+    yield from items
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value))
+
+
+@_step("count")
+def _count(ctx, step, traversers):
+    local, _ = _scope_args(step.args)
+    if local:
+        for t in traversers:
+            yield t.split(len(t.obj) if hasattr(t.obj, "__len__") else 1)
+        return
+    items = list(traversers)
+    yield _Traverser(None, sack=ctx.sack_initial).detach(len(items))
+
+
+@_step("fold")
+def _fold(ctx, step, traversers):
+    yield _Traverser(None, sack=ctx.sack_initial).detach([t.obj for t in traversers])
+
+
+def _reducer(fn: Callable[[list], Any]):
+    def handler(ctx, step, traversers):
+        local, _ = _scope_args(step.args)
+        if local:
+            for t in traversers:
+                values = list(t.obj)
+                if values:
+                    yield t.split(fn(values))
+            return
+        values = [t.obj for t in traversers]
+        if values:
+            yield _Traverser(None, sack=ctx.sack_initial).detach(fn(values))
+    return handler
+
+
+_STEPS["sum"] = _reducer(sum)
+_STEPS["min"] = _reducer(min)
+_STEPS["max"] = _reducer(max)
+_STEPS["mean"] = _reducer(lambda values: sum(values) / len(values))
+
+
+@_step("aggregate", "store")
+def _aggregate(ctx, step, traversers):
+    local, args = _scope_args(step.args)
+    bucket = ctx.side_effects.setdefault(args[0], [])
+    items = list(traversers) if step.name == "aggregate" and not local else traversers
+    for t in items:
+        bucket.append(_by_value(ctx, _by_for(step, 0), t))
+        yield t
+
+
+@_step("cap")
+def _cap(ctx, step, traversers):
+    for _ in traversers:
+        pass
+    values = {key: ctx.side_effects.get(key, []) for key in step.args}
+    result = values[step.args[0]] if len(step.args) == 1 else values
+    yield _Traverser(None).detach(result)
+
+
+@_step("group", "groupCount")
+def _group(ctx, step, traversers):
+    result: Dict[Any, Any] = {}
+    for t in traversers:
+        key = _by_value(ctx, _by_for(step, 0), t)
+        if step.name == "groupCount":
+            result[key] = result.get(key, 0) + 1
+        else:
+            value = _by_value(ctx, step.by[1], t) if len(step.by) > 1 else t.obj
+            result.setdefault(key, []).append(value)
+    yield _Traverser(None).detach(result)
+
+
+# --- Entry points ---
+
+def execute(graph: InMemoryGraph, bytecode: Bytecode) -> List[Any]:
+    """Runs a bytecode traversal against the graph and returns the result objects."""
+    ctx = _Context(graph)
+    for inst in bytecode.source_instructions:
+        if inst[0] == "withSack":
+            ctx.sack_initial = inst[1]
+            ctx.sack_merge = inst[2] if len(inst) > 2 else None
+        elif inst[0] == "withSideEffect":
+            ctx.side_effects[inst[1]] = inst[2]
+
+    program = _compile(bytecode.step_instructions)
+    if program.steps:
+        program.steps[0].is_start = True
+    root = _Traverser(None, sack=ctx.sack_initial)
+    with graph._lock:
+        return [t.obj for t in _run(ctx, program, (root,))]
+
+
+class LocalRemoteConnection(RemoteConnection):
+    """RemoteConnection that executes bytecode in process against an InMemoryGraph."""
+
+    def __init__(self, graph: InMemoryGraph):
+        super().__init__("memory://", "g")
+        self.graph = graph
+
+    def submit(self, bytecode: Bytecode) -> RemoteTraversal:
+        results = execute(self.graph, bytecode)
+        return RemoteTraversal(iter([Traverser(obj, 1) for obj in results]))
+
+    def submit_async(self, bytecode: Bytecode) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(self.submit(bytecode))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,312 @@
+import asyncio
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from gremlin_python.process.anonymous_traversal import traversal
+
+from soltania_persistence.core.domain import OUT, BaseEntity, Relationship, ID
+from soltania_persistence.core.interfaces import AsyncEntityManager
+from soltania_persistence.provider.tinkerpop.eager import (
+    Include,
+    attach_includes,
+    attach_related,
+    eager_projection,
+    normalize_includes,
+    prefetch_traversal,
+)
+from soltania_persistence.provider.tinkerpop.hydration import hydrator_for
+from soltania_persistence.provider.tinkerpop.projection import project_fields, projection_type, to_record
+from soltania_persistence.provider.tinkerpop.manager import (
+    DEFAULT_BATCH_SIZE,
+    _add_vertex,
+    _chunks,
+    _extract_id,
+    _get_or_create,
+    _hydrate,
+    _open_connection,
+    _persist_batch,
+    _relationships_batch,
+    _require_saved,
+    _update_batch,
+    _upsert_batch,
+)
+
+E = TypeVar("E", bound=BaseEntity)
+
+# Pool size the driver uses when none is given
+DRIVER_POOL_SIZE = 8
+
+
+class AsyncGremlinEntityManager(AsyncEntityManager):
+    """
+    asyncio-native Gremlin EntityManager.
+    Traversals are handed to the driver's promise() API from the loop's default
+    executor and their results awaited on the caller's event loop. Each request
+    in flight holds a pooled connection and two driver workers (one waiting for
+    the response, one reading it), so concurrency is bounded by the pool:
+    'max_in_flight' defaults to the pool size, and further requests wait on the
+    loop without holding any thread.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_in_flight: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_content_length: Optional[int] = None,
+        message_serializer: Any = None,
+        trusted_hydration: bool = False,
+    ):
+        if max_in_flight is None:
+            # More would only wait for a free connection inside an executor thread
+            max_in_flight = pool_size or DRIVER_POOL_SIZE
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        self.url = url
+        self.max_in_flight = max_in_flight
+        # Skip Pydantic validation when rebuilding entities read from the graph
+        self.trusted_hydration = trusted_hydration
+        if max_workers is None:
+            # The driver's submit_async() waits for each response inside a worker while another
+            # worker reads it: with its default (one per connection) a full pool deadlocks
+            max_workers = 2 * (pool_size or DRIVER_POOL_SIZE)
+        self.connection = _open_connection(url, pool_size, max_workers, max_content_length, message_serializer)
+        self.g = traversal().withRemote(self.connection)
+        # One semaphore per event loop, created on first use: the manager can be
+        # built outside a loop and used from several (e.g. successive asyncio.run())
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> "AsyncGremlinEntityManager":
+        """Builds a manager from an AppConfig (URL and driver options)."""
+        return cls(settings.gremlin_url, **{**settings.gremlin_driver_options, **kwargs})
+
+    async def submit(self, t: Any) -> List[Any]:
+        """Sends a traversal and awaits its full result list."""
+        async with self._semaphore():
+            # The driver opens pooled connections lazily with run_until_complete(), which
+            # fails on a thread running an event loop: the request is handed over from a worker
+            future = await asyncio.get_running_loop().run_in_executor(None, t.promise, lambda done: done.toList())
+            return await asyncio.wrap_future(future)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """'max_in_flight' semaphore of the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return semaphore
+
+    async def iterate(self, t: Any) -> AsyncIterator[Any]:
+        """Async iteration over the results of a traversal."""
+        for result in await self.submit(t):
+            yield result
+
+    async def close(self):
+        """Closes the connection to the Gremlin server."""
+        await asyncio.to_thread(self.connection.close)
+
+    async def persist(self, entity: E) -> E:
+        """Saves an entity (Vertex) to the Graph DB; an entity with an id is updated instead."""
+        if entity.id is not None:
+            return await self.update(entity)
+        try:
+            results = await self.submit(_add_vertex(self.g, entity))
+        except Exception as e:
+            print(f"❌ Error persisting {entity.__label__}: {e}")
+            raise e
+
+        entity.id = _extract_id(results[0]) if results else None
+        return entity
+
+    async def update(self, entity: E) -> E:
+        """Writes every property of a saved entity in one round trip (None values are removed)."""
+        if entity.id is None:
+            raise ValueError("Entity must be saved before being updated")
+        try:
+            results = await self.submit(_update_batch(self.g, [(entity, entity.model_dump(exclude={"id"}))]))
+        except Exception as e:
+            print(f"❌ Error updating {entity.__label__}: {e}")
+            raise e
+
+        updated = results[0] if results else 0
+        if updated != 1:
+            raise RuntimeError(f"Batch updated {updated} entities out of 1")
+        return entity
+
+    async def persist_all(self, entities: Sequence[E], batch_size: int = DEFAULT_BATCH_SIZE) -> List[E]:
+        """
+        Saves several entities, one traversal per chunk.
+        Chunks are submitted concurrently (bounded by max_in_flight).
+        """
+        entities = list(entities)
+        chunks = list(_chunks(entities, batch_size))
+        try:
+            results = await asyncio.gather(*(self.submit(_persist_batch(self.g, c)) for c in chunks))
+        except Exception as e:
+            print(f"❌ Error persisting batch of {len(entities)} entities: {e}")
+            raise e
+
+        for chunk, ids in zip(chunks, results):
+            if len(ids) != len(chunk):
+                raise RuntimeError(f"Batch persist returned {len(ids)} ids for {len(chunk)} entities")
+            for entity, obj_id in zip(chunk, ids):
+                entity.id = obj_id
+        return entities
+
+    async def upsert(self, entity: E, key_fields: Sequence[str]) -> E:
+        """Get-or-create in a single round trip (fold().coalesce(unfold(), addV()))."""
+        t = _get_or_create(self.g, entity, key_fields)
+        try:
+            results = await self.submit(t)
+        except Exception as e:
+            print(f"❌ Error upserting {entity.__label__}: {e}")
+            raise e
+
+        if not results:
+            raise RuntimeError(f"Upsert of {entity.__label__} returned no id")
+        entity.id = results[0]
+        return entity
+
+    async def upsert_all(
+        self, entities: Sequence[E], key_fields: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[E]:
+        """Batched get-or-create, chunks submitted concurrently."""
+        entities = list(entities)
+        batches = [(chunk, *_upsert_batch(self.g, chunk, key_fields)) for chunk in _chunks(entities, batch_size)]
+        try:
+            results = await asyncio.gather(*(self.submit(t) for _, t, _ in batches))
+        except Exception as e:
+            print(f"❌ Error upserting batch of {len(entities)} entities: {e}")
+            raise e
+
+        for (chunk, _, keys), result in zip(batches, results):
+            if not result:
+                raise RuntimeError(f"Batch upsert returned no ids for {len(chunk)} entities")
+            ids = result[0]
+            for key, entity in zip(keys, chunk):
+                entity.id = ids[key]
+        return entities
+
+    def _load(self, entity_class: Type[E], result: dict) -> E:
+        return _hydrate(entity_class, result, self.trusted_hydration)
+
+    def _hydrate_row(self, entity_class: Type[E], result: Any, includes: Tuple[Tuple[str, str], ...]) -> E:
+        if includes:
+            return attach_includes(self._load(entity_class, result["v"]), includes, result, self._load)
+        return self._load(entity_class, result)
+
+    async def find(self, entity_class: Type[E], entity_id: ID, include: Optional[Sequence[Include]] = None) -> Optional[E]:
+        """Finds an entity by its database id ('include': see the sync manager)."""
+        label = entity_class.__label__
+        includes = normalize_includes(include)
+        t = self.g.V(entity_id).hasLabel(label)
+        try:
+            results = await self.submit(t.map(eager_projection(includes)) if includes else t.elementMap())
+        except Exception as e:
+            print(f"Error finding {label}: {e}")
+            return None
+        return self._hydrate_row(entity_class, results[0], includes) if results else None
+
+    async def find_by_property(
+        self,
+        entity_class: Type[E],
+        property_name: str,
+        value: Any,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[Include]] = None,
+    ) -> Optional[E]:
+        """Finds a single entity by a specific property ('fields', 'include': see the sync manager)."""
+        label = entity_class.__label__
+        t = self.g.V().hasLabel(label).has(property_name, value).limit(1)
+        record_type = projection_type(entity_class, fields) if fields is not None else None
+        includes = normalize_includes(include)
+        if record_type is not None and includes:
+            raise ValueError("'fields' and 'include' cannot be combined: records carry no relations")
+        try:
+            if record_type is not None:
+                results = await self.submit(t.map(project_fields(record_type._fields)))
+            elif includes:
+                results = await self.submit(t.map(eager_projection(includes)))
+            else:
+                results = await self.submit(t.elementMap())
+        except Exception as e:
+            print(f"Error finding {label}: {e}")
+            return None
+        if not results:
+            return None
+        if record_type is not None:
+            return to_record(record_type, results[0])
+        return self._hydrate_row(entity_class, results[0], includes)
+
+    async def prefetch(
+        self,
+        entities: Sequence[E],
+        relation: Union[str, Type[Relationship]],
+        direction: str = OUT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[E]:
+        """Loads one relation of many entities, one traversal per chunk, chunks submitted concurrently."""
+        entities = list(entities)
+        ((label, direction),) = normalize_includes([(relation, direction)])
+        if any(entity.id is None for entity in entities):
+            raise ValueError("Entities must be saved before prefetching their relationships")
+
+        by_id: Dict[ID, List[E]] = {}
+        for entity in entities:
+            by_id.setdefault(entity.id, []).append(entity)
+        chunks = list(_chunks(list(by_id), batch_size))
+        try:
+            results = await asyncio.gather(*(self.submit(prefetch_traversal(self.g, c, label, direction)) for c in chunks))
+        except Exception as e:
+            print(f"❌ Error prefetching '{label}' for {len(by_id)} entities: {e}")
+            raise e
+
+        found = {row["id"]: row["r"] for rows in results for row in rows}
+        for obj_id, same_id in by_id.items():
+            for entity in same_id:
+                attach_related(entity, label, direction, found.get(obj_id, []), self._load)
+        return entities
+
+    async def find_all_by_property(self, entity_class: Type[E], property_name: str, value: Any) -> AsyncIterator[E]:
+        """Async iteration over every entity of 'entity_class' matching a property."""
+        t = self.g.V().hasLabel(entity_class.__label__).has(property_name, value).elementMap()
+        hydrator = hydrator_for(entity_class)
+        async for result in self.iterate(t):
+            yield hydrator.hydrate(result, self.trusted_hydration)
+
+    async def create_relationship(self, from_entity: BaseEntity, to_entity: BaseEntity, relationship: Relationship):
+        """Creates an edge between two saved vertices."""
+        await self.create_relationships([(from_entity, to_entity, relationship)])
+
+    async def create_relationships(
+        self,
+        relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Creates several edges, one traversal per chunk, chunks submitted concurrently."""
+        relationships = list(relationships)
+        _require_saved(relationships)
+
+        chunks = list(_chunks(relationships, batch_size))
+        try:
+            results = await asyncio.gather(*(self.submit(_relationships_batch(self.g, c)) for c in chunks))
+        except Exception as e:
+            print(f"Error creating batch of {len(relationships)} relationships: {e}")
+            raise e
+
+        for chunk, result in zip(chunks, results):
+            created = result[0] if result else 0
+            if created != len(chunk):
+                raise RuntimeError(f"Batch created {created} relationships out of {len(chunk)}")
+
+    async def clear_database(self):
+        """DANGER: Deletes all vertices and edges in the database."""
+        try:
+            await self.submit(self.g.V().drop())
+        except Exception as e:
+            print(f"Error clearing DB: {e}")
@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from gremlin_python.process.graph_traversal import __
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.core.domain import (
+    IN,
+    OUT,
+    BaseEntity,
+    Related,
+    Relationship,
+    entity_type,
+    relation_label,
+    relationship_type,
+)
+from soltania_persistence.provider.tinkerpop.hydration import element_label, element_properties
+
+# A relation to load: edge label or Relationship class (outgoing edges), or a (relation, direction) pair
+Include = Union[str, Type[Relationship], Tuple[Union[str, Type[Relationship]], str]]
+
+
+def normalize_includes(include: Optional[Sequence[Include]]) -> Tuple[Tuple[str, str], ...]:
+    """(edge label, direction) pairs of an include=[...] argument; unknown labels raise ValueError."""
+    if include is None:
+        return ()
+    if isinstance(include, str):
+        raise TypeError("include must be a sequence of relations, not a single string")
+
+    specs = []
+    for item in include:
+        relation, direction = item if isinstance(item, tuple) else (item, OUT)
+        label = relation_label(relation)
+        if direction not in (OUT, IN):
+            raise ValueError(f"Unknown direction '{direction}' for relation '{label}' (expected '{OUT}' or '{IN}')")
+        if relationship_type(label) is None:
+            raise ValueError(f"No Relationship model is defined for the edge label '{label}'")
+        if (label, direction) not in specs:
+            specs.append((label, direction))
+    return tuple(specs)
+
+
+def related_traversal(label: str, direction: str) -> Any:
+    """Anonymous traversal folding the edges of one relation with their other endpoint: [{'e', 'v'}...]."""
+    edges, other = (__.outE(label), __.inV()) if direction == OUT else (__.inE(label), __.outV())
+    return edges.project("e", "v").by(__.elementMap()).by(other.elementMap()).fold()
+
+
+def eager_projection(includes: Sequence[Tuple[str, str]]) -> Any:
+    """
+    project('v', 'r0', 'r1'...) of the current vertex: its element map and, per
+    included relation, its edges and endpoint vertices. One traversal, no N+1.
+    """
+    keys = [f"r{i}" for i in range(len(includes))]
+    t = __.project("v", *keys).by(__.elementMap())
+    for label, direction in includes:
+        t = t.by(related_traversal(label, direction))
+    return t
+
+
+def _relationship(label: str, edge: Dict[Any, Any]) -> Relationship:
+    # Edge element maps also carry the id, label and endpoints: keep the properties
+    return relationship_type(label)(**element_properties(edge))
+
+
+def endpoint_class(row: Dict[Any, Any], default: Type[BaseEntity]) -> Type[BaseEntity]:
+    """Entity class of a vertex element map, by its label ('default' when the labels match)."""
+    label = element_label(row)
+    if label is None or label == default.__label__:
+        return default
+    cls = entity_type(label)
+    if cls is None:
+        raise ValueError(f"No entity class is defined for the vertex label '{label}'")
+    return cls
+
+
+def attach_related(
+    entity: BaseEntity,
+    label: str,
+    direction: str,
+    pairs: Sequence[Dict[str, Any]],
+    load: Callable[[Type[BaseEntity], Dict[Any, Any]], BaseEntity],
+) -> List[Related]:
+    """
+    Hydrates the {'e': edge map, 'v': vertex map} pairs of one relation and
+    stores them on 'entity'. 'load' builds (or reuses) the endpoint entity.
+    """
+    related = [
+        Related(_relationship(label, pair["e"]), load(endpoint_class(pair["v"], type(entity)), pair["v"]))
+        for pair in pairs
+    ]
+    entity._set_related(label, direction, related)
+    return related
+
+
+def attach_includes(
+    entity: BaseEntity,
+    includes: Sequence[Tuple[str, str]],
+    row: Dict[str, Any],
+    load: Callable[[Type[BaseEntity], Dict[Any, Any]], BaseEntity],
+) -> BaseEntity:
+    """Attaches every included relation of an eager_projection() row to 'entity'."""
+    for i, (label, direction) in enumerate(includes):
+        attach_related(entity, label, direction, row[f"r{i}"], load)
+    return entity
+
+
+def prefetch_traversal(g: Any, ids: Sequence[Any], label: str, direction: str) -> Any:
+    """V(ids) projected to {'id', 'r'}: the relation of every vertex of a chunk in one round trip."""
+    return g.V(*ids).project("id", "r").by(T.id).by(related_traversal(label, direction))
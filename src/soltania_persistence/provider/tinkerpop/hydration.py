@@ -0,0 +1,122 @@
+from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from gremlin_python.process.traversal import Direction, T
+from pydantic_core import PydanticUndefined
+
+from soltania_persistence.core.domain import BaseEntity
+
+E = TypeVar("E", bound=BaseEntity)
+
+_REQUIRED, _DEFAULT, _FACTORY = 0, 1, 2
+
+# Element-map keys as GraphSON 2 writes them: its maps are JSON objects, so the
+# T / Direction keys arrive as strings (GraphBinary and GraphSON 3 keep the enums)
+_STRING_ELEMENT_KEYS = frozenset(("id", "label", "IN", "OUT"))
+
+
+def element_id(element_map: Dict[Any, Any]) -> Any:
+    """Id of an element map: T.id, or 'id' (GraphSON 2)."""
+    obj_id = element_map.get(T.id)
+    return element_map.get("id") if obj_id is None else obj_id
+
+
+def element_label(element_map: Dict[Any, Any]) -> Optional[str]:
+    """Label of an element map: T.label, or 'label' (GraphSON 2)."""
+    label = element_map.get(T.label)
+    return element_map.get("label") if label is None else label
+
+
+def edge_endpoint(edge_map: Dict[Any, Any], direction: Direction) -> Dict[Any, Any]:
+    """{id, label} map of an edge endpoint: Direction.OUT / IN, or 'OUT' / 'IN' (GraphSON 2)."""
+    endpoint = edge_map.get(direction)
+    return edge_map[direction.name] if endpoint is None else endpoint
+
+
+def element_properties(element_map: Dict[Any, Any]) -> Dict[str, Any]:
+    """The properties of an element map, without its id, label and endpoints."""
+    return {k: v for k, v in element_map.items() if isinstance(k, str) and k not in _STRING_ELEMENT_KEYS}
+
+
+class Hydrator(Generic[E]):
+    """
+    Element map -> entity mapper compiled once per entity class.
+
+    The field names (element-map keys, T.id for the id) and the field defaults
+    are resolved at construction, so hydrating a row is a single pass over the
+    fields. Two modes:
+    - validated (default): one Pydantic validation call;
+    - trusted: no validation at all, the instance is assembled like
+      model_construct() does. Only for data written by this library.
+    """
+
+    def __init__(self, entity_class: Type[E]):
+        self.entity_class = entity_class
+        fields = entity_class.model_fields
+        self.names: Tuple[str, ...] = tuple(name for name in fields if name != "id")
+        # Trusted mode, in field order: (name, kind, default) where kind is
+        # _REQUIRED, _DEFAULT (constant) or _FACTORY (default_factory)
+        self.fill: List[Tuple[str, int, Any]] = []
+        for name in self.names:
+            field = fields[name]
+            if field.default_factory is not None:
+                self.fill.append((name, _FACTORY, field.default_factory))
+            elif field.default is not PydanticUndefined:
+                self.fill.append((name, _DEFAULT, field.default))
+            else:
+                self.fill.append((name, _REQUIRED, None))
+        # Private attribute defaults (copied per instance), None when there are none
+        private = entity_class.__private_attributes__
+        self.private = {name: attr.get_default() for name, attr in private.items()} or None
+
+    def hydrate(self, result: Dict[Any, Any], trusted: bool = False) -> E:
+        """Builds one entity from an elementMap() result (element_id(), inlined)."""
+        obj_id = result.get(T.id)
+        if obj_id is None:
+            obj_id = result.get("id")
+
+        if not trusted:
+            # Lookups by field name (str hashing) rather than iterating the map:
+            # the T.* enum keys have a slow Python-level __hash__/__eq__
+            values = {name: result[name] for name in self.names if name in result}
+            # id assigned after validation, like before: graph ids need not be str/int
+            entity = self.entity_class(**values)
+            entity.id = obj_id
+            return entity
+
+        values = {"id": obj_id}
+        fields_set = {"id"}
+        for name, kind, default in self.fill:
+            if name in result:
+                values[name] = result[name]
+                fields_set.add(name)
+            elif kind == _DEFAULT:
+                values[name] = default
+            elif kind == _FACTORY:
+                values[name] = default()
+
+        entity = self.entity_class.__new__(self.entity_class)
+        _set = object.__setattr__
+        _set(entity, "__dict__", values)
+        _set(entity, "__pydantic_fields_set__", fields_set)
+        _set(entity, "__pydantic_extra__", None)
+        _set(entity, "__pydantic_private__", dict(self.private) if self.private is not None else None)
+        return entity
+
+    def hydrate_many(self, results: Iterable[Dict[Any, Any]], trusted: bool = False) -> List[E]:
+        """Bulk variant of hydrate()."""
+        hydrate = self.hydrate
+        return [hydrate(result, trusted) for result in results]
+
+
+def hydrator_for(entity_class: Type[E]) -> Hydrator[E]:
+    """Returns the Hydrator of a class, compiled on first use and cached on the class itself."""
+    hydrator = entity_class.__dict__.get("__hydrator__")
+    if hydrator is None:
+        hydrator = Hydrator(entity_class)
+        type.__setattr__(entity_class, "__hydrator__", hydrator)
+    return hydrator
+
+
+def hydrate_many(entity_class: Type[E], results: Iterable[Dict[Any, Any]], trusted: bool = False) -> List[E]:
+    """Hydrates a list of elementMap() results with the class hydrator."""
+    return hydrator_for(entity_class).hydrate_many(results, trusted)
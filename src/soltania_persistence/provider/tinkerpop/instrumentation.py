@@ -0,0 +1,210 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from gremlin_python.driver.remote_connection import RemoteConnection, RemoteTraversal
+from gremlin_python.process.traversal import Traverser
+from gremlin_python.structure.graph import Element, Path
+
+from soltania_persistence.core.instrumentation import Instrumentation, OperationEvent
+
+# Operation name of traversals submitted outside a manager method (repository queries)
+RAW_TRAVERSAL = "traversal"
+
+
+class _Scope:
+    __slots__ = ("round_trips", "results", "payload_bytes")
+
+    def __init__(self):
+        self.round_trips = self.results = self.payload_bytes = 0
+
+
+# Operation being measured on the current thread / task (the outermost one)
+_current_scope: ContextVar[Optional[_Scope]] = ContextVar("soltania_operation_scope", default=None)
+
+
+def approximate_size(obj: Any) -> int:
+    """
+    Rough wire size of a result in bytes (GraphBinary-like: 8-byte numbers,
+    length-prefixed strings and collections). Meant for trends, not accounting.
+    """
+    if obj is None or isinstance(obj, bool):
+        return 1
+    if isinstance(obj, (int, float)):
+        return 8
+    if isinstance(obj, str):
+        return 4 + len(obj.encode("utf-8"))
+    if isinstance(obj, Enum):
+        return 2
+    if isinstance(obj, dict):
+        return 4 + sum(approximate_size(k) + approximate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return 4 + sum(approximate_size(item) for item in obj)
+    if isinstance(obj, Path):
+        return approximate_size(obj.objects) + approximate_size(obj.labels)
+    if isinstance(obj, Element):
+        return approximate_size(obj.id) + approximate_size(obj.label)
+    return len(str(obj))
+
+
+def _bytecode_label(bytecode: Any) -> str:
+    """Label of a raw traversal: first hasLabel()/addV()/addE() argument, '' if none."""
+    for instruction in getattr(bytecode, "step_instructions", ()):
+        if instruction[0] in ("hasLabel", "addV", "addE") and len(instruction) > 1 and isinstance(instruction[1], str):
+            return instruction[1]
+    return ""
+
+
+@contextmanager
+def operation_scope(instrumentation: Optional[Instrumentation], operation: str, label: str) -> Iterator[None]:
+    """
+    Measures the enclosed block as one operation: latency, plus the round trips,
+    results and payload of the traversals it submits. Nested scopes are folded
+    into the outermost one; a None instrumentation measures nothing.
+    """
+    if instrumentation is None or _current_scope.get() is not None:
+        yield
+        return
+
+    scope = _Scope()
+    token = _current_scope.set(scope)
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_scope.reset(token)
+        instrumentation.record(OperationEvent(
+            operation, label, duration, scope.round_trips, scope.results, scope.payload_bytes, error
+        ))
+
+
+def record_round_trip(results: Sequence[Any]) -> None:
+    """Adds one round trip returning 'results' (plain objects) to the current operation scope, if any."""
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.round_trips += 1
+        scope.results += len(results)
+        scope.payload_bytes += sum(approximate_size(result) for result in results)
+
+
+def _first_label(args: Sequence[Any]) -> str:
+    return getattr(args[0], "__label__", "") if args else ""
+
+
+def batch_label(args: Sequence[Any]) -> str:
+    """
+    Label of a batched call: its first entity, the relationship of its first
+    triple or the entity of its first (entity, changes) pair.
+    """
+    items = args[0] if args else None
+    first = items[0] if isinstance(items, Sequence) and items else None
+    if isinstance(first, tuple):
+        first = next((item for item in reversed(first) if hasattr(item, "__label__")), None)
+    return getattr(first, "__label__", "")
+
+
+def relationship_label(args: Sequence[Any]) -> str:
+    return getattr(args[2], "__label__", "") if len(args) > 2 else ""
+
+
+def instrumented(operation: str, label_of: Callable[[Sequence[Any]], str] = _first_label) -> Callable:
+    """
+    Decorates an EntityManager method so it reports to 'self.instrumentation'.
+    'label_of' receives the positional arguments. Costs one attribute check when disabled.
+    """
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            try:
+                label = label_of(args)
+            except Exception:
+                label = ""
+            with operation_scope(instrumentation, operation, label):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class InstrumentedConnection(RemoteConnection):
+    """
+    RemoteConnection wrapper measuring every round trip for the owning manager.
+
+    - owner.instrumentation: round trips, results and payload size are added to
+      the current operation scope; a traversal submitted on its own (e.g. a
+      repository query on em.g) is reported as a RAW_TRAVERSAL operation
+      labelled after its first hasLabel()/addV()/addE();
+    - owner.slow_query_log: traversals slower than its threshold are recorded.
+    Both None: requests go straight to the wrapped connection.
+    """
+
+    def __init__(self, connection: RemoteConnection, owner: Any):
+        super().__init__(connection.url, connection.traversal_source)
+        self.connection = connection
+        self.owner = owner
+
+    def submit(self, bytecode):
+        instrumentation = self.owner.instrumentation
+        slow_query_log = self.owner.slow_query_log
+        if instrumentation is None and slow_query_log is None:
+            return self.connection.submit(bytecode)
+
+        with operation_scope(instrumentation, RAW_TRAVERSAL, _bytecode_label(bytecode)):
+            start = time.perf_counter()
+            try:
+                traversers = list(self.connection.submit(bytecode).traversers)
+            except Exception as e:
+                if slow_query_log is not None:
+                    slow_query_log.observe(bytecode, time.perf_counter() - start, 0, error=e)
+                raise
+            duration = time.perf_counter() - start
+
+            results = 0
+            scope = _current_scope.get()
+            for traverser in traversers:
+                is_traverser = isinstance(traverser, Traverser)
+                results += traverser.bulk if is_traverser else 1
+                if scope is not None:
+                    scope.payload_bytes += approximate_size(traverser.object if is_traverser else traverser)
+            if scope is not None:
+                scope.round_trips += 1
+                scope.results += results
+
+        if slow_query_log is not None:
+            slow_query_log.observe(bytecode, duration, results, submit=self._objects)
+        return RemoteTraversal(iter(traversers))
+
+    def _objects(self, bytecode) -> List[Any]:
+        """Submits 'bytecode' unmeasured (profile() re-runs) and returns the result objects."""
+        return [t.object if isinstance(t, Traverser) else t for t in self.connection.submit(bytecode).traversers]
+
+    def submit_async(self, bytecode):
+        return self.connection.submit_async(bytecode)
+
+    def is_closed(self):
+        return self.connection.is_closed()
+
+    def is_session_bound(self):
+        return self.connection.is_session_bound()
+
+    def create_session(self):
+        return self.connection.create_session()
+
+    def commit(self):
+        return self.connection.commit()
+
+    def rollback(self):
+        return self.connection.rollback()
+
+    def close(self):
+        return self.connection.close()
@@ -1,98 +1,731 @@
-from typing import Type, TypeVar, Optional, List, Any, Union
+import functools
+import time
+from typing import Type, TypeVar, Optional, List, Any, Dict, Union, Iterator, Sequence, Tuple
+from gremlin_python.driver import serializer
+from gremlin_python.driver.client import Client
 from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
 from gremlin_python.process.anonymous_traversal import traversal
 from gremlin_python.process.graph_traversal import __
-from gremlin_python.process.traversal import T  # Crucial for accessing T.id or T.label
+from gremlin_python.process.traversal import P, T, Cardinality, Pop, Scope  # Crucial for accessing T.id or T.label
 
+from soltania_persistence.core.cache import CacheStats, IdentityMap
+from soltania_persistence.core.instrumentation import Instrumentation
 from soltania_persistence.core.interfaces import EntityManager
-from soltania_persistence.core.domain import BaseEntity, Relationship
+from soltania_persistence.core.schema import SCHEMA_DIALECTS, IndexSpec, index_specs, schema_script
+from soltania_persistence.core.domain import OUT, BaseEntity, Relationship, ID
+from soltania_persistence.provider._common import DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE, _chunks, _hydrate, _require_saved
+from soltania_persistence.provider.tinkerpop.eager import (
+    Include,
+    attach_includes,
+    attach_related,
+    eager_projection,
+    normalize_includes,
+    prefetch_traversal,
+)
+from soltania_persistence.provider.tinkerpop.hydration import element_id, hydrator_for
+from soltania_persistence.provider.tinkerpop.instrumentation import (
+    InstrumentedConnection,
+    batch_label,
+    instrumented,
+    operation_scope,
+    record_round_trip,
+    relationship_label,
+)
+from soltania_persistence.provider.tinkerpop.projection import project_fields, projection_type, to_record
+from soltania_persistence.provider.tinkerpop.slow_queries import SlowQueryLog
+from soltania_persistence.provider.tinkerpop.templates import TraversalTemplate, execute_script
 
 # Define a generic type E bound to BaseEntity
 E = TypeVar("E", bound=BaseEntity)
 
+# Default number of entities kept in the identity map (0 disables it)
+DEFAULT_CACHE_SIZE = 1000
+
+# Vertices of a label from which a lookup on an undeclared key is reported (None disables it)
+DEFAULT_UNINDEXED_LOOKUP_THRESHOLD = 10_000
+
+
+# Message serializers selectable by name (AppConfig.gremlin_message_serializer)
+SERIALIZERS = {
+    "graphbinary": serializer.GraphBinarySerializersV1,
+    "graphson": serializer.GraphSONSerializersV3d0,
+    "graphson-v2": serializer.GraphSONSerializersV2d0,
+}
+
+
+def _resolve_serializer(message_serializer: Any) -> Any:
+    """Accepts a serializer name, a serializer instance, or None (driver default)."""
+    if message_serializer is None or not isinstance(message_serializer, str):
+        return message_serializer
+    try:
+        return SERIALIZERS[message_serializer.lower()]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown message serializer '{message_serializer}' (expected one of {sorted(SERIALIZERS)})"
+        ) from None
+
+
+def _driver_options(
+    pool_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    max_content_length: Optional[int] = None,
+    message_serializer: Any = None,
+) -> dict:
+    """Driver keyword arguments, only forwarding the options that were set."""
+    options: dict = {"pool_size": pool_size, "max_workers": max_workers}
+    if max_content_length is not None:
+        options["max_content_length"] = max_content_length
+    if message_serializer is not None:
+        options["message_serializer"] = _resolve_serializer(message_serializer)
+    return options
+
+
+def _open_connection(
+    url: str,
+    pool_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    max_content_length: Optional[int] = None,
+    message_serializer: Any = None,
+) -> DriverRemoteConnection:
+    """Opens the driver connection, only forwarding the options that were set."""
+    return DriverRemoteConnection(url, 'g', **_driver_options(pool_size, max_workers, max_content_length, message_serializer))
+
+
+def _add_vertex(t: Any, entity: BaseEntity) -> Any:
+    """Appends addV(label) and the entity properties (except 'id') to a traversal."""
+    t = t.addV(entity.__label__)
+    data = entity.model_dump(exclude={"id"}, exclude_none=True)
+    for key, value in data.items():
+        t = t.property(key, value)
+    return t
+
+
+def _get_or_create(t: Any, entity: BaseEntity, key_fields: Sequence[str]) -> Any:
+    """
+    Appends the get-or-create idiom to a traversal:
+    V().hasLabel(label).has(key, value)...fold().coalesce(unfold(), addV(...)).id()
+    The lookup and the creation happen server-side in the same request.
+    """
+    if not key_fields:
+        raise ValueError("upsert requires at least one key field")
+
+    t = t.V().hasLabel(entity.__label__)
+    for key in key_fields:
+        value = getattr(entity, key)
+        if value is None:
+            raise ValueError(f"Key field '{key}' of {type(entity).__name__} must not be None")
+        t = t.has(key, value)
+    return t.fold().coalesce(__.unfold(), _add_vertex(__, entity)).id_()
+
+
+def _persist_batch(g: Any, chunk: Sequence[BaseEntity]) -> Any:
+    """
+    Chained addV() sequence for a chunk; every new vertex is tagged with the same
+    step label so select(Pop.all_) returns the ids in input order.
+    """
+    t = g
+    for entity in chunk:
+        t = _add_vertex(t, entity).as_("v")
+    return t.select(Pop.all_, "v").unfold().id_()
+
+
+def _relationships_batch(g: Any, chunk: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]]) -> Any:
+    """
+    Chained V(source).addE(label).to(V(target)) sequence, counted at the end
+    so the server reports how many edges were actually created.
+    """
+    t = g
+    for from_entity, to_entity, relationship in chunk:
+        t = t.V(from_entity.id).addE(relationship.__label__).to(__.V(to_entity.id))
+        data = relationship.model_dump(exclude_none=True)
+        for key, value in data.items():
+            t = t.property(key, value)
+        t = t.as_("e")
+    return t.select(Pop.all_, "e").count(Scope.local)
+
+
+def _update_batch(g: Any, chunk: Sequence[Tuple[BaseEntity, Dict[str, Any]]]) -> Any:
+    """
+    One union() branch per entity: V(id).property(single, key, value)... where a
+    None value drops the property. Counted at the end so the server reports how
+    many of the vertices were found and updated.
+    """
+    branches = []
+    for entity, values in chunk:
+        t = __.V(entity.id)
+        for key, value in values.items():
+            if value is None:
+                t = t.sideEffect(__.properties(key).drop())
+            else:
+                t = t.property(Cardinality.single, key, value)
+        branches.append(t)
+    return g.inject(0).union(*branches).count()
+
+
+def _remove_relationships_batch(g: Any, chunk: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]]) -> Any:
+    """
+    One union() branch per triple dropping the first matching edge
+    (label, target and properties), counted so the server reports how many went.
+    """
+    branches = []
+    for from_entity, to_entity, relationship in chunk:
+        t = __.V(from_entity.id).outE(relationship.__label__).where(__.inV().hasId(to_entity.id))
+        for key, value in relationship.model_dump(exclude_none=True).items():
+            t = t.has(key, value)
+        branches.append(t.limit(1).sideEffect(__.drop()))
+    return g.inject(0).union(*branches).count()
+
+
+def _upsert_batch(g: Any, chunk: Sequence[BaseEntity], key_fields: Sequence[str]) -> Tuple[Any, List[str]]:
+    """
+    Each entity becomes a project() key whose by() runs the get-or-create idiom,
+    so the ids come back keyed by their position in the chunk.
+    """
+    keys = [f"u{i}" for i in range(len(chunk))]
+    t = g.inject(0).project(*keys)
+    for entity in chunk:
+        t = t.by(_get_or_create(__, entity, key_fields))
+    return t, keys
+
+
+def _extract_id(result: Any) -> Optional[ID]:
+    """Reads the id of an addV() result (Vertex object or element map)."""
+    # Case 1: Driver returns a Vertex object (access via attribute)
+    if hasattr(result, 'id'):
+        return result.id
+
+    # Case 2: Driver returns a Dictionary/Map (access via .get())
+    if isinstance(result, dict):
+        # T.id (Enum: GraphBinary, GraphSON 3) first, then string 'id' (GraphSON 2)
+        return element_id(result)
+
+    print(f"⚠️ Warning: Unknown result type in persist: {type(result)}")
+    return None
+
+
+def _element_or_eager(t: Any, includes: Tuple[Tuple[str, str], ...]) -> Any:
+    return t.map(eager_projection(includes)) if includes else t.elementMap()
+
+
+@functools.lru_cache(maxsize=None)
+def _find_template(label: str, includes: Tuple[Tuple[str, str], ...] = ()) -> TraversalTemplate:
+    """V(id).hasLabel(label) as an element map, or with its included relations (eager_projection)."""
+    def build(g, entity_id):
+        return _element_or_eager(g.V(entity_id).hasLabel(label), includes)
+    return TraversalTemplate(build, "entity_id", name=f"find:{label}")
+
+
+@functools.lru_cache(maxsize=None)
+def _find_by_property_template(
+    label: str, key: str, fields: Optional[Tuple[str, ...]] = None, includes: Tuple[Tuple[str, str], ...] = ()
+) -> TraversalTemplate:
+    """
+    V().hasLabel(label).has(key, value) returning the first match: whole,
+    projected on 'fields', or with its included relations.
+    """
+    def build(g, value):
+        t = g.V().hasLabel(label).has(key, value).limit(1)
+        return _element_or_eager(t, includes) if fields is None else t.map(project_fields(fields))
+    return TraversalTemplate(build, "value", name=f"find_by_property:{label}.{key}")
+
+
 class GremlinEntityManager(EntityManager):
-    def __init__(self, url: str):
+    """
+    EntityManager backed by a Gremlin Server.
+
+    A single instance is safe to share across threads: the driver keeps a
+    thread-safe pool of 'pool_size' websocket connections (one request in flight
+    per connection), every call builds its own traversal from the immutable 'g'
+    source, and the identity map is guarded by a lock. Size the pool to the
+    number of threads expected to query concurrently.
+    """
+
+    instrumentation: Optional[Instrumentation] = None
+    slow_query_log: Optional[SlowQueryLog] = None
+
+    def __init__(
+        self,
+        url: str,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        pool_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_content_length: Optional[int] = None,
+        message_serializer: Any = None,
+        trusted_hydration: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        slow_query_threshold: Optional[float] = None,
+        profile_slow_queries: bool = False,
+        script_templates: bool = False,
+        schema_dialect: Optional[str] = None,
+        unindexed_lookup_threshold: Optional[int] = DEFAULT_UNINDEXED_LOOKUP_THRESHOLD,
+    ):
+        if schema_dialect is not None and schema_dialect.lower() not in SCHEMA_DIALECTS:
+            raise ValueError(f"Unknown schema dialect '{schema_dialect}' (expected one of {sorted(SCHEMA_DIALECTS)})")
         self.url = url
+        # Skip Pydantic validation when rebuilding entities read from the graph
+        self.trusted_hydration = trusted_hydration
+        # Run traversal templates on the script endpoint (compiled once, cached by the server)
+        self.script_templates = script_templates
+        # Backend whose indexes ensure_schema() creates (None = declared only, nothing sent)
+        self.schema_dialect = schema_dialect
+        # Lookups on undeclared keys are reported once per (label, key) when the label is this large
+        self.unindexed_lookup_threshold = unindexed_lookup_threshold
+        self._unindexed_checked: set = set()
+        # Receives latency / round-trip / payload events (e.g. a MetricsCollector); None = disabled
+        self.instrumentation = instrumentation
+        # Traversals slower than 'slow_query_threshold' seconds (None = disabled), optionally profiled
+        if slow_query_threshold is not None:
+            self.slow_query_log = SlowQueryLog(slow_query_threshold, profile=profile_slow_queries)
         # Initialize Gremlin connection
         # 'g' is the standard traversal source name
-        self.connection = DriverRemoteConnection(url, 'g')
-        self.g = traversal().withRemote(self.connection)
+        self.connection = _open_connection(url, pool_size, max_workers, max_content_length, message_serializer)
+        # Client for scripts (script templates, ensure_schema), with the same options;
+        # its websockets are only opened by the first script
+        self.client = Client(url, 'g', **_driver_options(pool_size, max_workers, max_content_length, message_serializer))
+        # Traversals built on 'g' (repositories included) are measured by the wrapper
+        self.g = traversal().withRemote(InstrumentedConnection(self.connection, self))
+        # Persistence context: entities persisted or loaded by this manager
+        self.identity_map = IdentityMap(cache_size)
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> "GremlinEntityManager":
+        """Builds a manager from an AppConfig (URL, driver options and slow-query log settings)."""
+        return cls.from_url(settings.gremlin_url, settings, **kwargs)
+
+    @classmethod
+    def from_url(cls, url: str, settings: Any = None, **kwargs: Any) -> "GremlinEntityManager":
+        """Manager for a ws:// or wss:// URL, with the options of 'settings' (an AppConfig) if given."""
+        if settings is None:
+            return cls(url, **kwargs)
+        options = {
+            **settings.gremlin_driver_options,
+            **settings.gremlin_slow_query_options,
+            "script_templates": settings.gremlin_script_templates,
+            "schema_dialect": settings.gremlin_schema_dialect,
+            "unindexed_lookup_threshold": settings.gremlin_unindexed_lookup_threshold,
+        }
+        return cls(url, **{**options, **kwargs})
 
     def close(self):
-        """Closes the connection to the Gremlin server."""
+        """Closes the connection and the script client to the Gremlin server."""
+        self.client.close()
         self.connection.close()
 
+    def cache_stats(self) -> CacheStats:
+        """Hit/miss/eviction counters of the identity map."""
+        return self.identity_map.stats()
+
+    @staticmethod
+    def _natural_key(entity: BaseEntity, key_fields: Sequence[str]):
+        values = [getattr(entity, field) for field in key_fields]
+        return IdentityMap.natural_key(entity.__label__, key_fields, values)
+
+    @staticmethod
+    def _unique_keys(entity: BaseEntity) -> List[Any]:
+        """Natural keys of the unique fields of an entity (see BaseEntity.__indexes__)."""
+        return [
+            IdentityMap.natural_key(entity.__label__, (field,), (getattr(entity, field),))
+            for field, unique in entity.__indexes__.items()
+            if unique and getattr(entity, field, None) is not None
+        ]
+
+    def _register(self, entity: BaseEntity, key_fields: Sequence[str] = ()) -> None:
+        """
+        Adds a persisted entity to the identity map, reachable by id, by its
+        unique fields and by 'key_fields'.
+        """
+        key = self._natural_key(entity, key_fields) if key_fields else None
+        self.identity_map.register(entity, key, *self._unique_keys(entity))
+
+    def _register_new(self, entity: BaseEntity) -> None:
+        """
+        Registers a freshly written vertex under its unique keys, so lookups on
+        them are served from the identity map. Its other property values may be
+        shared with cached entities: those natural keys are dropped so the next
+        lookup asks the server.
+        """
+        data = entity.model_dump(exclude={"id"}, exclude_none=True)
+        shared = {field: value for field, value in data.items() if not entity.__indexes__.get(field)}
+        self.identity_map.invalidate_values(entity.__label__, shared)
+        self._register(entity)
+
+    @instrumented("persist")
     def persist(self, entity: E) -> E:
         """
         Saves an entity (Vertex) to the Graph DB.
         Handles both object-based and dictionary-based responses from the driver.
         """
         label = entity.__label__
-        
+
+        # Already saved: write its current properties instead of creating a duplicate
+        if entity.id is not None:
+            return self.update(entity)
+
         # Start traversal: create a new Vertex with the specific label
-        t = self.g.addV(label)
-        
-        # Add properties from the Pydantic model
-        # We exclude 'id' because it is generated by the DB
-        data = entity.model_dump(exclude={"id"}, exclude_none=True)
-        
-        for key, value in data.items():
-            t = t.property(key, value)
-            
+        # and the properties of the Pydantic model ('id' is generated by the DB)
+        t = _add_vertex(self.g, entity)
+
         try:
             # Execute the query
             result = t.next()
-            
-            # --- ROBUST ID EXTRACTION ---
-            # Case 1: Driver returns a Vertex object (access via attribute)
-            if hasattr(result, 'id'):
-                entity.id = result.id
-            
-            # Case 2: Driver returns a Dictionary/Map (access via .get())
-            elif isinstance(result, dict):
-                # Try T.id (Enum) first, then string 'id' as fallback
-                entity.id = result.get(T.id, result.get('id'))
-            
-            else:
-                print(f"⚠️ Warning: Unknown result type in persist: {type(result)}")
-            # -----------------------------
-                
+            entity.id = _extract_id(result)
+            self._register_new(entity)
+            self._bump_version()
             return entity
             
         except Exception as e:
             print(f"❌ Error persisting {label}: {e}")
             raise e
 
-    def find_by_property(self, entity_class: Type[E], property_name: str, value: Any) -> Optional[E]:
+    @instrumented("persist_all", batch_label)
+    def persist_all(self, entities: Sequence[E], batch_size: int = DEFAULT_BATCH_SIZE) -> List[E]:
+        """
+        Saves several entities (Vertices) using one round trip per chunk.
+        Ids are assigned back in input order.
+        """
+        entities = list(entities)
+        for chunk in _chunks(entities, batch_size):
+            try:
+                ids = _persist_batch(self.g, chunk).toList()
+            except Exception as e:
+                print(f"❌ Error persisting batch of {len(chunk)} entities: {e}")
+                raise e
+
+            if len(ids) != len(chunk):
+                raise RuntimeError(f"Batch persist returned {len(ids)} ids for {len(chunk)} entities")
+
+            for entity, obj_id in zip(chunk, ids):
+                entity.id = obj_id
+                self._register_new(entity)
+            self._bump_version()
+
+        return entities
+
+    @instrumented("upsert")
+    def upsert(self, entity: E, key_fields: Sequence[str], use_cache: bool = True) -> E:
+        """
+        Get-or-create in a single round trip: returns the entity with the id of the
+        existing vertex matching 'key_fields', or of the vertex created for it.
+        When the key is already in the identity map no request is sent at all.
+        """
+        # Built first so invalid keys are rejected even on a cache hit
+        t = _get_or_create(self.g, entity, key_fields)
+        if use_cache:
+            cached = self.identity_map.find(self._natural_key(entity, key_fields))
+            if cached is not None:
+                entity.id = cached.id
+                return entity
+
+        try:
+            entity.id = t.next()
+        except Exception as e:
+            print(f"❌ Error upserting {entity.__label__}: {e}")
+            raise e
+
+        self._register(entity, key_fields)
+        self._bump_version()
+        return entity
+
+    @instrumented("upsert_all", batch_label)
+    def upsert_all(
+        self,
+        entities: Sequence[E],
+        key_fields: Sequence[str],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        use_cache: bool = True,
+    ) -> List[E]:
+        """
+        Batched get-or-create: one round trip per chunk.
+        Entities whose key is already in the identity map are not sent.
+        """
+        entities = list(entities)
+        pending = []
+        for entity in entities:
+            cached = self.identity_map.find(self._natural_key(entity, key_fields)) if use_cache else None
+            if cached is not None:
+                entity.id = cached.id
+            else:
+                pending.append(entity)
+
+        for chunk in _chunks(pending, batch_size):
+            t, keys = _upsert_batch(self.g, chunk, key_fields)
+            try:
+                ids = t.next()
+            except Exception as e:
+                print(f"❌ Error upserting batch of {len(chunk)} entities: {e}")
+                raise e
+
+            for key, entity in zip(keys, chunk):
+                entity.id = ids[key]
+                self._register(entity, key_fields)
+            self._bump_version()
+
+        return entities
+
+    @instrumented("update_all", batch_label)
+    def update_all(
+        self, changes: Sequence[Tuple[BaseEntity, Dict[str, Any]]], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> None:
+        """
+        Writes property changes of saved entities using one round trip per chunk.
+        Each item is an (entity, {property: new value}) pair; None drops the property.
+        """
+        changes = [(entity, values) for entity, values in changes if values]
+        for entity, _ in changes:
+            if entity.id is None:
+                raise ValueError("Entity must be saved before being updated")
+
+        for chunk in _chunks(changes, batch_size):
+            try:
+                updated = _update_batch(self.g, chunk).next()
+            except Exception as e:
+                print(f"❌ Error updating batch of {len(chunk)} entities: {e}")
+                raise e
+
+            # Natural keys built on the previous values must not resolve anymore
+            for entity, _ in chunk:
+                self.identity_map.invalidate(entity)
+                self._register_new(entity)
+            self._bump_version()
+            if updated != len(chunk):
+                raise RuntimeError(f"Batch updated {updated} entities out of {len(chunk)}")
+
+    def _load(self, entity_class: Type[E], result: dict, refresh: bool = False) -> E:
+        """
+        Entity of an element map: the identity-map instance if there is one, else
+        hydrated and registered, so each id maps to one instance. With 'refresh'
+        the cached instance is updated in place with the values read.
+        """
+        cached = self.identity_map.peek(element_id(result))
+        if isinstance(cached, entity_class) and not refresh:
+            return cached
+        entity = _hydrate(entity_class, result, self.trusted_hydration)
+        if isinstance(cached, entity_class):
+            cached.__dict__.update(entity.__dict__)
+            entity = cached
+        self._register(entity)
+        return entity
+
+    @instrumented("find")
+    def find(
+        self,
+        entity_class: Type[E],
+        entity_id: ID,
+        use_cache: bool = True,
+        include: Optional[Sequence[Include]] = None,
+    ) -> Optional[E]:
+        """
+        Finds an entity by its database id (served from the identity map when possible).
+        'include' eagerly loads relations in the same traversal (see find_by_property).
+        """
+        includes = normalize_includes(include)
+        if use_cache and not includes:
+            cached = self.identity_map.get(entity_id)
+            if isinstance(cached, entity_class):
+                return cached
+
+        label = entity_class.__label__
+        try:
+            results = self.execute(_find_template(label, includes), entity_id=entity_id)
+        except Exception as e:
+            print(f"Error finding {label}: {e}")
+            return None
+        if not results:
+            return None
+        result = results[0]
+
+        if includes:
+            return attach_includes(self._load(entity_class, result["v"]), includes, result, self._load)
+        return self._load(entity_class, result, refresh=not use_cache)
+
+    @instrumented("find_by_property")
+    def find_by_property(
+        self,
+        entity_class: Type[E],
+        property_name: str,
+        value: Any,
+        *,
+        use_cache: bool = True,
+        fields: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[Include]] = None,
+    ) -> Optional[E]:
         """
         Finds a single entity by a specific property (e.g., name, email).
+        Lookups on a unique key (Field(json_schema_extra={"unique": True})) are
+        kept in the identity map; pass use_cache=False to force a server read.
+        Other keys always go to the server (several vertices may match, the
+        first one is returned) and are reported once if the label is large.
+        With 'fields', only those properties are shipped (project() on the server)
+        and a typed record is returned instead; records bypass the identity map.
+        With 'include' (edge labels or Relationship classes, optionally as
+        (relation, 'in') pairs), the edges and their endpoint vertices come back
+        in the same traversal: entity.related("connects_to").
         """
+        includes = normalize_includes(include)
+        if fields is not None:
+            if includes:
+                raise ValueError("'fields' and 'include' cannot be combined: records carry no relations")
+            return self._find_record(entity_class, property_name, value, fields)
+
         label = entity_class.__label__
+        unique = entity_class.__indexes__.get(property_name)
+        # Only a unique key identifies the entity: other lookups are not cache-eligible
+        key = IdentityMap.natural_key(label, (property_name,), (value,)) if unique else None
+        if key is not None and use_cache and not includes:
+            cached = self.identity_map.find(key)
+            if isinstance(cached, entity_class):
+                return cached
+        if unique is None:
+            self._check_unindexed(label, property_name)
+
         try:
             # Use elementMap() to fetch all properties and the ID in one go
-            result = self.g.V().hasLabel(label).has(property_name, value).elementMap().next()
-            
-            if not result:
-                return None
-                
-            # Extract ID
-            obj_id = result.get(T.id, result.get('id'))
-            
-            # Clean dictionary for Pydantic (remove T.id, T.label keys)
-            clean_data = {k: v for k, v in result.items() if isinstance(k, str)}
-            
-            # Rehydrate entity
-            entity = entity_class(**clean_data)
-            entity.id = obj_id
-            return entity
-            
-        except StopIteration:
-            # Gremlin throws StopIteration when no result is found
+            results = self.execute(_find_by_property_template(label, property_name, None, includes), value=value)
+        except Exception as e:
+            print(f"Error finding {label}: {e}")
+            return None
+
+        if not results or not results[0]:
             return None
+
+        if includes:
+            entity = attach_includes(self._load(entity_class, results[0]["v"]), includes, results[0], self._load)
+            self.identity_map.register(entity, key)
+            return entity
+
+        entity = self._load(entity_class, results[0], refresh=not use_cache)
+        self.identity_map.register(entity, key)
+        return entity
+
+    @instrumented("prefetch", batch_label)
+    def prefetch(
+        self,
+        entities: Sequence[E],
+        relation: Union[str, Type[Relationship]],
+        direction: str = OUT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[E]:
+        """
+        Eagerly loads one relation of many entities: one round trip per chunk
+        returns the edges and endpoint vertices of every entity of the chunk.
+        The results are attached to the entities (entity.related(relation)).
+        """
+        entities = list(entities)
+        ((label, direction),) = normalize_includes([(relation, direction)])
+        if any(entity.id is None for entity in entities):
+            raise ValueError("Entities must be saved before prefetching their relationships")
+
+        by_id: Dict[ID, List[E]] = {}
+        for entity in entities:
+            by_id.setdefault(entity.id, []).append(entity)
+
+        for chunk in _chunks(list(by_id), batch_size):
+            try:
+                rows = prefetch_traversal(self.g, chunk, label, direction).toList()
+            except Exception as e:
+                print(f"❌ Error prefetching '{label}' for {len(chunk)} entities: {e}")
+                raise e
+
+            found = {row["id"]: row["r"] for row in rows}
+            for obj_id in chunk:
+                for entity in by_id[obj_id]:
+                    attach_related(entity, label, direction, found.get(obj_id, []), self._load)
+        return entities
+
+    def _check_unindexed(self, label: str, key: str) -> None:
+        """Warns (once per label and key) about a lookup on an undeclared key of a large label."""
+        threshold = self.unindexed_lookup_threshold
+        if threshold is None or (label, key) in self._unindexed_checked:
+            return
+        self._unindexed_checked.add((label, key))
+        try:
+            # limit() bounds the count: at most 'threshold' vertices are scanned
+            size = self.g.V().hasLabel(label).limit(threshold).count().next()
+        except Exception as e:
+            print(f"⚠️ Warning: Could not count '{label}' vertices: {e}")
+            return
+        if size >= threshold:
+            print(
+                f"⚠️ Warning: Unindexed lookup on {label}.{key} ({size:,}+ vertices): "
+                f"declare the field indexed or unique and run ensure_schema()"
+            )
+
+    def _find_record(self, entity_class: Type[E], property_name: str, value: Any, fields: Sequence[str]) -> Any:
+        record_type = projection_type(entity_class, fields)
+        label = entity_class.__label__
+        try:
+            results = self.execute(_find_by_property_template(label, property_name, record_type._fields), value=value)
         except Exception as e:
             print(f"Error finding {label}: {e}")
             return None
+        return to_record(record_type, results[0]) if results else None
 
+    def execute(self, template: TraversalTemplate, **values: Any) -> List[Any]:
+        """
+        Runs a traversal template with 'values' as bindings. By default the
+        pre-built bytecode is sent; with script_templates the template's Groovy
+        script goes to the script endpoint, where the server compiles it once
+        and reuses it for every later set of bindings.
+        """
+        if not self.script_templates:
+            return template.traversal(self.g, **values).toList()
+
+        with operation_scope(self.instrumentation, "script", template.name):
+            start = time.perf_counter()
+            try:
+                results = execute_script(self.client, template, values)
+            except Exception as e:
+                if self.slow_query_log is not None:
+                    self.slow_query_log.observe(template.bytecode(**values), time.perf_counter() - start, 0, error=e)
+                raise
+            duration = time.perf_counter() - start
+            record_round_trip(results)
+        if self.slow_query_log is not None and duration >= self.slow_query_log.threshold:
+            self.slow_query_log.observe(template.bytecode(**values), duration, len(results))
+        return results
+
+    def find_all(self, entity_class: Type[E], **filters: Any) -> Iterator[E]:
+        """
+        Lazily iterates over the 'entity_class' vertices matching the property
+        filters, e.g. find_all(Station, zone=1). See stream() for paging.
+        """
+        return self.stream(entity_class, DEFAULT_PAGE_SIZE, **filters)
+
+    def stream(self, entity_class: Type[E], page_size: int = DEFAULT_PAGE_SIZE, **filters: Any) -> Iterator[E]:
+        """
+        Generator paging through the server by id (keyset paging): each page is
+        the next 'page_size' vertices with an id greater than the last one read,
+        so the server never re-reads earlier pages, memory stays constant
+        whatever the result size and the first entities are available after
+        the first page. Entities come in id order; vertices written during the
+        stream are not skipped or repeated because of it.
+        Streamed entities are not added to the identity map.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+
+        label = entity_class.__label__
+        hydrator = hydrator_for(entity_class)
+        last_id = None
+        while True:
+            t = self.g.V().hasLabel(label)
+            for key, value in filters.items():
+                t = t.has(key, value)
+            if last_id is not None:
+                t = t.has(T.id, P.gt(last_id))
+            try:
+                with operation_scope(self.instrumentation, "stream", label):
+                    page = t.order().by(T.id).limit(page_size).elementMap().toList()
+            except Exception as e:
+                print(f"❌ Error streaming {label}: {e}")
+                raise e
+
+            yield from hydrator.hydrate_many(page, self.trusted_hydration)
+            if len(page) < page_size:
+                return
+            last_id = element_id(page[-1])
+
+    @instrumented("create_relationship", relationship_label)
     def create_relationship(self, from_entity: BaseEntity, to_entity: BaseEntity, relationship: Relationship):
         """
         Crée une arête (Edge) entre deux sommets.
@@ -119,7 +752,98 @@ class GremlinEntityManager(EntityManager):
         except Exception as e:
             print(f"Error creating relationship: {e}")
             raise e
+        self._bump_version()
             
+    @instrumented("create_relationships", batch_label)
+    def create_relationships(
+        self,
+        relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Creates several edges using one round trip per chunk.
+        Each item is a (from_entity, to_entity, relationship) triple.
+        """
+        relationships = list(relationships)
+        _require_saved(relationships)
+
+        for chunk in _chunks(relationships, batch_size):
+            try:
+                # No result at all when a source vertex is missing: reported as 0 below
+                results = _relationships_batch(self.g, chunk).toList()
+            except Exception as e:
+                print(f"Error creating batch of {len(chunk)} relationships: {e}")
+                raise e
+
+            self._bump_version()
+            created = results[0] if results else 0
+            if created != len(chunk):
+                raise RuntimeError(f"Batch created {created} relationships out of {len(chunk)}")
+
+    @instrumented("remove_all", batch_label)
+    def remove_all(self, entities: Sequence[BaseEntity], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """Deletes vertices (with their edges) by id, one round trip per chunk."""
+        entities = list(entities)
+        if any(entity.id is None for entity in entities):
+            raise ValueError("Entities must be saved before being removed")
+
+        for chunk in _chunks(entities, batch_size):
+            try:
+                self.g.V(*(entity.id for entity in chunk)).drop().iterate()
+            except Exception as e:
+                print(f"❌ Error removing batch of {len(chunk)} entities: {e}")
+                raise e
+            for entity in chunk:
+                self.identity_map.invalidate(entity)
+            self._bump_version()
+
+    @instrumented("remove_relationships", batch_label)
+    def remove_relationships(
+        self,
+        relationships: Sequence[Tuple[BaseEntity, BaseEntity, Relationship]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Deletes one edge per (from_entity, to_entity, relationship) triple,
+        one round trip per chunk; missing edges raise RuntimeError.
+        """
+        relationships = list(relationships)
+        _require_saved(relationships)
+
+        for chunk in _chunks(relationships, batch_size):
+            try:
+                results = _remove_relationships_batch(self.g, chunk).toList()
+            except Exception as e:
+                print(f"❌ Error removing batch of {len(chunk)} relationships: {e}")
+                raise e
+
+            self._bump_version()
+            removed = results[0] if results else 0
+            if removed != len(chunk):
+                raise RuntimeError(f"Batch removed {removed} relationships out of {len(chunk)}")
+
+    @instrumented("ensure_schema", batch_label)
+    def ensure_schema(self, entity_classes: Sequence[Type[BaseEntity]]) -> List[IndexSpec]:
+        """
+        Creates the indexes declared on the classes with one script (see
+        core.schema for the TinkerGraph and JanusGraph versions). Without a
+        schema_dialect nothing is sent: the specs are only returned.
+        """
+        specs = index_specs(entity_classes)
+        if not specs:
+            return specs
+        if self.schema_dialect is None:
+            print(f"⚠️ Warning: No schema dialect configured, {len(specs)} declared index(es) not created")
+            return specs
+        try:
+            self.client.submit(schema_script(self.schema_dialect, specs)).all().result()
+        except Exception as e:
+            print(f"❌ Error creating indexes on {self.schema_dialect}: {e}")
+            raise e
+        print(f"✅ Schema ensured: {', '.join(spec.name for spec in specs)}")
+        return specs
+
+    @instrumented("clear_database")
     def clear_database(self):
         """
         DANGER: Deletes all vertices and edges in the database.
@@ -128,4 +852,7 @@ class GremlinEntityManager(EntityManager):
         try:
             self.g.V().drop().iterate()
         except Exception as e:
-            print(f"Error clearing DB: {e}")
\ No newline at end of file
+            print(f"Error clearing DB: {e}")
+        finally:
+            self.identity_map.clear()
+            self._bump_version()
\ No newline at end of file
@@ -0,0 +1,64 @@
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple, Type
+
+from gremlin_python.process.graph_traversal import __
+from gremlin_python.process.traversal import T
+from pydantic import BaseModel
+
+from soltania_persistence.core.domain import ID
+
+_record_types: Dict[Tuple[type, Tuple[str, ...]], type] = {}
+_lock = threading.Lock()
+
+
+def _normalize(model: Type[BaseModel], fields: Sequence[str]) -> Tuple[str, ...]:
+    if isinstance(fields, str):
+        raise TypeError("fields must be a list of field names, not a string")
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields for {model.__name__}: {unknown}")
+    # 'id' is always part of a record; the caller's order is kept otherwise
+    return tuple(dict.fromkeys(name for name in fields if name != "id"))
+
+
+def projection_type(model: Type[BaseModel], fields: Sequence[str]) -> type:
+    """
+    Lightweight typed record (NamedTuple) of 'id' plus the projected fields of
+    an entity or relationship class. Field types follow the model annotations,
+    made Optional since a stored element may lack a property.
+    Created once per (class, fields) pair.
+    """
+    names = _normalize(model, fields)
+    key = (model, names)
+    record_type = _record_types.get(key)
+    if record_type is None:
+        with _lock:
+            record_type = _record_types.get(key)
+            if record_type is None:
+                annotations = [("id", Optional[ID])]
+                annotations += [(name, Optional[model.model_fields[name].annotation]) for name in names]
+                record_type = NamedTuple(f"{model.__name__}Record", annotations)
+                record_type.__new__.__defaults__ = (None,) * len(annotations)
+                _record_types[key] = record_type
+    return record_type
+
+
+def project_fields(fields: Sequence[str]) -> Any:
+    """
+    Anonymous traversal mapping an element to {'id': ..., field: value, ...}.
+    Only those properties are serialized by the server; absent ones are omitted.
+    """
+    names = [name for name in fields if name != "id"]
+    t = __.project("id", *names).by(T.id)
+    for name in names:
+        t = t.by(__.values(name))
+    return t
+
+
+def to_record(record_type: type, result: Dict[Any, Any]) -> Any:
+    """Builds a record from a project_fields() result or a full elementMap()."""
+    obj_id = result.get("id")
+    if obj_id is None:
+        obj_id = result.get(T.id)
+    # Lookups by field name: the T.* enum keys of element maps hash slowly
+    return record_type(obj_id, *(result.get(name) for name in record_type._fields[1:]))
@@ -0,0 +1,200 @@
+import hashlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from gremlin_python.process.traversal import Binding, Bytecode, P
+
+# Default number of slow queries kept by a SlowQueryLog (oldest dropped first)
+DEFAULT_SLOW_QUERY_ENTRIES = 1000
+
+# Steps whose arguments are property keys / labels / step labels: part of the query shape
+_NAME_STEPS = {
+    "hasLabel", "values", "properties", "valueMap", "elementMap", "project", "select", "as", "by",
+    "addV", "addE", "out", "in", "both", "outE", "inE", "bothE", "cap", "aggregate", "store",
+}
+# Steps whose arguments are all names except the last one (has(key, value), property(key, value)...)
+_LEADING_NAME_STEPS = {"has", "property", "with", "withSideEffect", "option"}
+# Steps writing to the graph: such traversals are never re-run for profiling
+_MUTATING_STEPS = {"addV", "addE", "property", "drop", "mergeV", "mergeE"}
+
+
+@dataclass(frozen=True)
+class StepTiming:
+    """One step of a profile() breakdown."""
+    name: str
+    duration_ms: float
+    traversers: Optional[int]
+    elements: Optional[int]
+    percent: Optional[float]
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    """A traversal that exceeded the slow-query threshold (or failed after it)."""
+    fingerprint: str
+    # Query shape with '_0', '_1'... placeholders for the literal values
+    query: str
+    bindings: Dict[str, Any]
+    duration: float
+    results: int
+    recorded_at: float
+    error: Optional[str] = None
+    # Per-step breakdown of a profile() re-run (profiling mode, read-only traversals)
+    profile: Optional[Tuple[StepTiming, ...]] = None
+    profile_error: Optional[str] = None
+
+
+class _Shape:
+    """Renders bytecode as text, moving literal values into numbered bindings."""
+
+    def __init__(self):
+        self.bindings: Dict[str, Any] = {}
+
+    def parameter(self, value: Any) -> str:
+        if isinstance(value, Binding):
+            self.bindings[value.key] = value.value
+            return value.key
+        name = f"_{len(self.bindings)}"
+        self.bindings[name] = value
+        return name
+
+    def argument(self, value: Any, is_name: bool) -> str:
+        if isinstance(value, Bytecode):
+            return self.render(value, "__")
+        if isinstance(value, P):
+            arguments = [self.argument(v, False) for v in (value.value, value.other) if v is not None]
+            return f"{type(value).__name__}.{value.operator}({', '.join(arguments)})"
+        if isinstance(value, Enum):
+            return f"{type(value).__name__}.{value.name}"
+        if is_name and isinstance(value, str):
+            return repr(value)
+        return self.parameter(value)
+
+    def render(self, bytecode: Bytecode, source: str) -> str:
+        parts = [source]
+        for instructions in (bytecode.source_instructions, bytecode.step_instructions):
+            for name, *args in instructions:
+                rendered = []
+                for i, arg in enumerate(args):
+                    is_name = name in _NAME_STEPS or (name in _LEADING_NAME_STEPS and i < len(args) - 1)
+                    rendered.append(self.argument(arg, is_name))
+                parts.append(f"{name}({', '.join(rendered)})")
+        return ".".join(parts)
+
+
+def fingerprint(bytecode: Bytecode) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    (fingerprint, query shape, bindings) of a traversal. Traversals differing
+    only by their literal values (ids, names, limits) share a fingerprint.
+    """
+    shape = _Shape()
+    query = shape.render(bytecode, "g")
+    bindings = {**getattr(bytecode, "bindings", {}), **shape.bindings}
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+    return digest, query, bindings
+
+
+def is_read_only(bytecode: Bytecode) -> bool:
+    """True if neither the traversal nor its child traversals write to the graph."""
+    for name, *args in list(bytecode.source_instructions) + list(bytecode.step_instructions):
+        if name in _MUTATING_STEPS:
+            return False
+        if any(isinstance(arg, Bytecode) and not is_read_only(arg) for arg in args):
+            return False
+    return True
+
+
+def _milliseconds(duration: Any) -> float:
+    # GraphBinary sends nanoseconds as a long, GraphSON milliseconds as a double
+    return duration / 1e6 if isinstance(duration, int) else float(duration)
+
+
+def parse_profile(metrics: Any) -> Tuple[StepTiming, ...]:
+    """Per-step timings of a deserialized TraversalMetrics ({'dur', 'metrics': [...]})."""
+    steps = []
+    for metric in metrics.get("metrics", []) if isinstance(metrics, dict) else []:
+        counts = metric.get("counts") or {}
+        annotations = metric.get("annotations") or {}
+        steps.append(StepTiming(
+            name=metric.get("name", "?"),
+            duration_ms=_milliseconds(metric.get("dur", 0)),
+            traversers=counts.get("traverserCount"),
+            elements=counts.get("elementCount"),
+            percent=annotations.get("percentDur"),
+        ))
+    return tuple(steps)
+
+
+class SlowQueryLog:
+    """
+    Bounded, thread-safe log of the traversals slower than 'threshold' seconds.
+    With 'profile', a slow read-only traversal is submitted a second time with
+    profile() appended and the per-step timings are stored with the entry
+    (this doubles the cost of that query: meant for tuning sessions).
+    """
+
+    def __init__(self, threshold: float, profile: bool = False, max_entries: int = DEFAULT_SLOW_QUERY_ENTRIES):
+        if threshold < 0:
+            raise ValueError("threshold must be >= 0")
+        self.threshold = threshold
+        self.profile = profile
+        self._entries: "deque[SlowQuery]" = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        bytecode: Bytecode,
+        duration: float,
+        results: int,
+        error: Optional[BaseException] = None,
+        submit: Optional[Callable[[Bytecode], List[Any]]] = None,
+    ) -> Optional[SlowQuery]:
+        """
+        Records the traversal if it was slow. 'submit' runs a bytecode and returns
+        its result objects; it is only used for the profile() re-run.
+        """
+        if duration < self.threshold:
+            return None
+
+        digest, query, bindings = fingerprint(bytecode)
+        profile, profile_error = None, None
+        if self.profile and submit is not None and error is None and is_read_only(bytecode):
+            profiled = Bytecode(bytecode)
+            profiled.bindings = dict(getattr(bytecode, "bindings", {}))
+            profiled.add_step("profile")
+            try:
+                results_of_profile = submit(profiled)
+                profile = parse_profile(results_of_profile[0]) if results_of_profile else ()
+            except Exception as e:
+                profile_error = str(e)
+
+        entry = SlowQuery(
+            fingerprint=digest,
+            query=query,
+            bindings=bindings,
+            duration=duration,
+            results=results,
+            recorded_at=time.time(),
+            error=str(error) if error is not None else None,
+            profile=profile,
+            profile_error=profile_error,
+        )
+        with self._lock:
+            self._entries.append(entry)
+        return entry
+
+    def entries(self) -> List[SlowQuery]:
+        """Recorded slow queries, oldest first."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
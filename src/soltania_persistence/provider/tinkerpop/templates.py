@@ -0,0 +1,134 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from gremlin_python.process.graph_traversal import GraphTraversal, GraphTraversalSource
+from gremlin_python.process.translator import Translator
+from gremlin_python.process.traversal import Binding, Bindings, Bytecode, P, TraversalStrategies
+from gremlin_python.structure.graph import Graph
+
+
+class _ScriptTranslator(Translator):
+    """Groovy translation where a binding becomes a script variable named after its key."""
+
+    def process_binding(self, binding):
+        return binding.key
+
+
+def _contains_binding(arg: Any) -> bool:
+    if isinstance(arg, Binding):
+        return True
+    if isinstance(arg, Bytecode):
+        return any(_contains_binding(a) for i in arg.source_instructions + arg.step_instructions for a in i[1:])
+    if isinstance(arg, P):
+        return _contains_binding(arg.value) or _contains_binding(arg.other)
+    if isinstance(arg, (list, tuple, set)):
+        return any(_contains_binding(a) for a in arg)
+    if isinstance(arg, dict):
+        return any(_contains_binding(k) or _contains_binding(v) for k, v in arg.items())
+    return False
+
+
+def _substitute(arg: Any, values: Dict[str, Any]) -> Any:
+    """Copy of 'arg' where every Binding is replaced by its value (bound objects are not copied)."""
+    if isinstance(arg, Binding):
+        return values[arg.key]
+    if isinstance(arg, Bytecode):
+        bytecode = Bytecode()
+        bytecode.source_instructions = [_substitute_instruction(i, values) for i in arg.source_instructions]
+        bytecode.step_instructions = [_substitute_instruction(i, values) for i in arg.step_instructions]
+        return bytecode
+    if isinstance(arg, P):
+        return type(arg)(arg.operator, _substitute(arg.value, values), _substitute(arg.other, values))
+    if isinstance(arg, list):
+        return [_substitute(a, values) for a in arg]
+    if isinstance(arg, set):
+        return {_substitute(a, values) for a in arg}
+    if isinstance(arg, dict):
+        return {_substitute(k, values): _substitute(v, values) for k, v in arg.items()}
+    return arg
+
+
+def _substitute_instruction(instruction: list, values: Dict[str, Any]) -> list:
+    return [instruction[0], *(_substitute(a, values) for a in instruction[1:])]
+
+
+class TraversalTemplate:
+    """
+    Traversal defined once with named parameters and executed with bindings.
+
+    'build(g, *params)' is called a single time with Binding placeholders; each
+    execution then only copies the instructions that hold a parameter instead of
+    replaying the fluent API. The same definition gives a Groovy script with the
+    parameters as variables (see 'script'), for the server's script endpoint,
+    which compiles a script once and caches it for every later set of bindings.
+
+        FIND_STATION = TraversalTemplate(lambda g, name: g.V().has('station', 'name', name), "name")
+        em.execute(FIND_STATION, name="Nation")
+
+    A parameter stands for one argument: P.within(param) binds a single value,
+    not a list (gremlinpython wraps the placeholder in a list).
+    """
+
+    def __init__(self, build: Callable[..., Any], *params: str, name: Optional[str] = None):
+        if len(set(params)) != len(params):
+            raise ValueError(f"Duplicate template parameters: {params}")
+        self.build = build
+        self.params: Tuple[str, ...] = params
+        self.name = name or getattr(build, "__name__", "template")
+        self._bytecode: Optional[Bytecode] = None
+        # Per instruction (source instructions first): True if it holds a parameter
+        self._bound: Tuple[bool, ...] = ()
+        self._script: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _compile(self) -> Bytecode:
+        if self._bytecode is None:
+            with self._lock:
+                if self._bytecode is None:
+                    source = GraphTraversalSource(Graph(), TraversalStrategies())
+                    traversal = self.build(source, *(Bindings.of(p, None) for p in self.params))
+                    bytecode = traversal.bytecode
+                    instructions = bytecode.source_instructions + bytecode.step_instructions
+                    self._bound = tuple(any(_contains_binding(a) for a in i[1:]) for i in instructions)
+                    self._bytecode = bytecode
+        return self._bytecode
+
+    def _check(self, values: Dict[str, Any]) -> None:
+        if len(values) != len(self.params) or any(p not in values for p in self.params):
+            missing = [p for p in self.params if p not in values]
+            unknown = [k for k in values if k not in self.params]
+            raise ValueError(f"Template '{self.name}': missing parameters {missing}, unknown parameters {unknown}")
+
+    def bytecode(self, **values: Any) -> Bytecode:
+        """Bytecode of the template with the parameters replaced by 'values'."""
+        self._check(values)
+        template = self._compile()
+        bound = iter(self._bound)
+        bytecode = Bytecode()
+        bytecode.source_instructions = [
+            _substitute_instruction(i, values) if next(bound) else i for i in template.source_instructions
+        ]
+        bytecode.step_instructions = [
+            _substitute_instruction(i, values) if next(bound) else i for i in template.step_instructions
+        ]
+        return bytecode
+
+    def traversal(self, g: GraphTraversalSource, **values: Any) -> GraphTraversal:
+        """Ready-to-run traversal on 'g' (its remote connection and strategies)."""
+        return GraphTraversal(g.graph, g.traversal_strategies, self.bytecode(**values))
+
+    @property
+    def script(self) -> str:
+        """Groovy script of the template, parameters left as variables (computed once)."""
+        if self._script is None:
+            self._script = _ScriptTranslator("g").translate(self._compile())
+        return self._script
+
+    def __repr__(self) -> str:
+        return f"TraversalTemplate({self.name}, params={list(self.params)})"
+
+
+def execute_script(client: Any, template: TraversalTemplate, values: Dict[str, Any]) -> List[Any]:
+    """Submits the template script with 'values' as bindings through a driver Client."""
+    template._check(values)
+    return client.submit(template.script, bindings=values).all().result()
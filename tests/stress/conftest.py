@@ -0,0 +1,10 @@
+import pytest
+
+from soltania_persistence.provider.memory.server import GremlinStandInServer
+
+
+@pytest.fixture(scope="module")
+def stand_in_server():
+    """Stand-in Gremlin Server answering every request after 20 ms."""
+    with GremlinStandInServer(latency=0.02) as server:
+        yield server
@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.provider.tinkerpop.async_manager import AsyncGremlinEntityManager
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+
+pytestmark = pytest.mark.stress
+
+REQUESTS = 64
+THREADS = 8
+
+
+def threaded_concurrency(server, pool_size: int) -> int:
+    """Most requests the server answered at once while THREADS threads shared one manager."""
+    em = GremlinEntityManager(server.url, pool_size=pool_size)
+    try:
+        server.max_in_flight = 0
+        with ThreadPoolExecutor(THREADS) as pool:
+            results = list(pool.map(lambda _: em.g.inject(1).next(), range(REQUESTS)))
+    finally:
+        em.close()
+    assert results == [1] * REQUESTS
+    return server.max_in_flight
+
+
+def async_concurrency(server, pool_size: int) -> int:
+    """Most requests the server answered at once while the async manager persisted 8 chunks."""
+    em = AsyncGremlinEntityManager(server.url, pool_size=pool_size)
+    stations = [Station(name=f"S{i}") for i in range(40)]
+    try:
+        server.max_in_flight = 0
+        saved = asyncio.run(em.persist_all(stations, batch_size=5))
+    finally:
+        asyncio.run(em.close())
+    assert len({s.id for s in saved}) == 40
+    return server.max_in_flight
+
+
+def test_threads_overlap_up_to_the_pool_size(stand_in_server):
+    """
+    Scenario: 8 threads share one manager against a server with 20 ms latency.
+    Expected: one request at a time on a pool of 1; several at once on a pool of 8.
+    """
+    assert threaded_concurrency(stand_in_server, pool_size=1) == 1
+    assert 1 < threaded_concurrency(stand_in_server, pool_size=8) <= 8
+
+
+def test_async_chunks_overlap(stand_in_server):
+    """
+    Scenario: 8 chunks persisted by the async manager, 20 ms per round trip.
+    Expected: one chunk at a time on a pool of 1; several in flight together on a pool of 8.
+    """
+    assert async_concurrency(stand_in_server, pool_size=1) == 1
+    assert 1 < async_concurrency(stand_in_server, pool_size=8) <= 8
@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+from gremlin_python.driver.remote_connection import RemoteConnection, RemoteTraversal
+from gremlin_python.process.traversal import Traverser
+
+from soltania_persistence.provider.tinkerpop import manager as manager_module
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+
+
+class FakeRemoteConnection(RemoteConnection):
+    """
+    Stand-in for DriverRemoteConnection: records every submitted bytecode
+    and answers with the next canned result list, or with responder(bytecode)
+    when a responder is set. Safe to share between threads.
+    """
+    def __init__(self, url, traversal_source="g", **kwargs):
+        super().__init__(url, traversal_source)
+        self.kwargs = kwargs
+        self.submitted = []
+        self.responses = []
+        self.responder = None
+        self.closed = False
+        # Simulated server latency for submit_async, and in-flight bookkeeping
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.RLock()
+
+    def submit(self, bytecode):
+        with self._lock:
+            self.submitted.append(bytecode)
+            if self.responder is not None:
+                results = self.responder(bytecode)
+            else:
+                results = self.responses.pop(0) if self.responses else []
+        if isinstance(results, Exception):
+            raise results
+        return RemoteTraversal(iter([Traverser(r) for r in results]))
+
+    def submit_async(self, bytecode):
+        future = Future()
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        def answer():
+            time.sleep(self.delay)
+            with self._lock:
+                self.in_flight -= 1
+                try:
+                    future.set_result(self.submit(bytecode))
+                except Exception as e:
+                    future.set_exception(e)
+
+        threading.Thread(target=answer, daemon=True).start()
+        return future
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_connection(monkeypatch):
+    """Patches the driver so GremlinEntityManager never opens a websocket."""
+    created = []
+
+    def factory(url, traversal_source="g", **kwargs):
+        conn = FakeRemoteConnection(url, traversal_source, **kwargs)
+        created.append(conn)
+        return conn
+
+    monkeypatch.setattr(manager_module, "DriverRemoteConnection", factory)
+    return created
+
+
+@pytest.fixture
+def gremlin_em(fake_connection):
+    """A GremlinEntityManager wired to a FakeRemoteConnection."""
+    em = GremlinEntityManager("ws://fake:8182/gremlin")
+    em.fake = fake_connection[0]
+    return em
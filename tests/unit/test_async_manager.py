@@ -0,0 +1,160 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.repositories.async_metro_repository import AsyncMetroRepository
+from soltania_persistence.provider.tinkerpop.async_manager import AsyncGremlinEntityManager
+
+
+def element_map(obj_id, name):
+    return {T.id: obj_id, T.label: "station", "name": name, "zone": 1}
+
+
+def make_em(fake_connection, **kwargs):
+    em = AsyncGremlinEntityManager("ws://fake:8182/gremlin", **kwargs)
+    return em, fake_connection[0]
+
+
+def test_persist_and_find_are_awaitable(fake_connection):
+    em, fake = make_em(fake_connection)
+    fake.responses = [[{T.id: 3}], [element_map(3, "Nation")]]
+
+    async def scenario():
+        saved = await em.persist(Station(name="Nation"))
+        found = await em.find_by_property(Station, "name", "Nation")
+        return saved, found
+
+    saved, found = asyncio.run(scenario())
+
+    assert saved.id == 3
+    assert found.id == 3 and found.name == "Nation"
+
+
+def test_persist_updates_a_saved_entity(fake_connection):
+    """An entity with an id is written in place instead of getting a duplicate vertex."""
+    em, fake = make_em(fake_connection)
+    fake.responses = [[1], [0]]
+    nation = Station(id=3, name="Nation", zone=2)
+
+    assert asyncio.run(em.persist(nation)) is nation
+    assert [step[0] for step in fake.submitted[0].step_instructions] == ["inject", "union", "count"]
+
+    with pytest.raises(RuntimeError, match="updated 0 entities"):
+        asyncio.run(em.persist(nation))
+
+
+def test_requests_overlap_up_to_the_in_flight_limit(fake_connection):
+    """
+    Scenario: 12 lookups issued at once with max_in_flight=4 and 50 ms server latency.
+    Expected: 4 requests overlap (never more), total time ~3 latencies instead of 12.
+    """
+    em, fake = make_em(fake_connection, max_in_flight=4)
+    fake.delay = 0.05
+    fake.responses = [[element_map(i, f"S{i}")] for i in range(12)]
+
+    async def scenario():
+        return await asyncio.gather(*(em.find_by_property(Station, "name", f"S{i}") for i in range(12)))
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 12
+    assert fake.max_in_flight == 4
+
+
+def test_manager_is_usable_from_successive_event_loops(fake_connection):
+    """
+    Scenario: a manager built outside any loop, used by two asyncio.run() calls
+    with more requests than max_in_flight.
+    Expected: both runs complete; the limit holds in each loop.
+    """
+    em, fake = make_em(fake_connection, max_in_flight=2)
+    fake.delay = 0.01
+    fake.responder = lambda bytecode: [
+        element_map(0, step[2]) for step in bytecode.step_instructions if step[:2] == ["has", "name"]
+    ]
+
+    async def scenario():
+        return await asyncio.gather(*(em.find_by_property(Station, "name", f"S{i}") for i in range(4)))
+
+    for _ in range(2):
+        assert [s.name for s in asyncio.run(scenario())] == ["S0", "S1", "S2", "S3"]
+    assert fake.max_in_flight == 2
+
+
+def test_in_flight_limit_follows_the_pool_size(fake_connection):
+    assert make_em(fake_connection)[0].max_in_flight == 8
+    assert make_em(fake_connection, pool_size=3)[0].max_in_flight == 3
+    assert fake_connection[-1].kwargs["max_workers"] == 6
+    assert make_em(fake_connection, pool_size=3, max_in_flight=5)[0].max_in_flight == 5
+
+
+def test_find_all_by_property_async_iteration(fake_connection):
+    em, fake = make_em(fake_connection)
+    fake.responses = [[element_map(1, "A"), element_map(2, "A")]]
+
+    async def scenario():
+        return [s.id async for s in em.find_all_by_property(Station, "name", "A")]
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_async_repository_fastest_path(fake_connection):
+    em, fake = make_em(fake_connection)
+    route = {"total_time": 90.0, "path_data": [element_map(1, "A"), {"line": "1"}, element_map(2, "B")]}
+    fake.responses = [[element_map(1, "A")], [element_map(2, "B")], [route]]
+
+    result = asyncio.run(AsyncMetroRepository(em).find_fastest_path("A", "B"))
+
+    assert result["total_time"] == 90.0
+    assert len(fake.submitted) == 3
+
+
+def test_empty_replies_raise_a_runtime_error(fake_connection):
+    em, fake = make_em(fake_connection)
+    a, b = Station(name="A", id=1), Station(name="B", id=2)
+    fake.responses = [[], [], []]
+
+    with pytest.raises(RuntimeError, match="no id"):
+        asyncio.run(em.upsert(Station(name="A"), ["name"]))
+    with pytest.raises(RuntimeError, match="no ids"):
+        asyncio.run(em.upsert_all([Station(name="A")], ["name"]))
+    with pytest.raises(RuntimeError, match="created 0 relationships out of 1"):
+        asyncio.run(em.create_relationships([(a, b, Connection(line="1", duration=60))]))
+
+
+FULL_POOL_SCENARIO = """
+import asyncio
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.provider.memory.server import GremlinStandInServer
+from soltania_persistence.provider.tinkerpop.async_manager import AsyncGremlinEntityManager
+
+with GremlinStandInServer(latency=0.01) as server:
+    em = AsyncGremlinEntityManager(server.url, pool_size=2)
+
+    async def scenario():
+        saved = await em.persist_all([Station(name=f"S{i}") for i in range(8)], batch_size=1)
+        found = await asyncio.gather(*(em.find_by_property(Station, "name", s.name) for s in saved))
+        return saved, found
+
+    saved, found = asyncio.run(scenario())
+    asyncio.run(em.close())
+    print(len({s.id for s in saved}), sum(f.id == s.id for f, s in zip(found, saved)))
+"""
+
+
+def test_full_pool_over_a_real_driver_connection():
+    """
+    Scenario: against the stand-in server, more requests in flight than pooled
+    connections, the connections being opened lazily from the event loop.
+    Expected: every request completes (the driver connects from a worker thread,
+    and has enough workers to read the responses of a full pool).
+    """
+    # In a subprocess: a deadlocked driver pool would keep the test process from exiting
+    result = subprocess.run([sys.executable, "-c", FULL_POOL_SCENARIO], capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["8", "8"]
@@ -0,0 +1,97 @@
+import pytest
+from gremlin_python.process.traversal import Pop
+
+from soltania_persistence.examples.metro_network.models import Station, Connection
+
+
+def steps(bytecode):
+    """Returns the step names of a bytecode, in order."""
+    return [inst[0] for inst in bytecode.step_instructions]
+
+
+def test_persist_all_sends_one_traversal_per_chunk(gremlin_em):
+    """
+    Scenario: 5 stations persisted with batch_size=2.
+    Expected: 3 round trips, ids assigned back in input order.
+    """
+    stations = [Station(name=f"S{i}") for i in range(5)]
+    gremlin_em.fake.responses = [[10, 11], [12, 13], [14]]
+
+    result = gremlin_em.persist_all(stations, batch_size=2)
+
+    assert [s.id for s in result] == [10, 11, 12, 13, 14]
+    assert len(gremlin_em.fake.submitted) == 3
+
+    first = gremlin_em.fake.submitted[0]
+    assert steps(first).count("addV") == 2
+    assert ["select", Pop.all_, "v"] in first.step_instructions
+
+
+def test_persist_all_rejects_partial_results(gremlin_em):
+    """A chunk that does not return one id per entity must fail loudly."""
+    gremlin_em.fake.responses = [[10]]
+
+    with pytest.raises(RuntimeError):
+        gremlin_em.persist_all([Station(name="A"), Station(name="B")])
+
+
+def test_create_relationships_batches_edges(gremlin_em):
+    """
+    Scenario: 3 edges created with batch_size=2.
+    Expected: 2 round trips with chained addE steps carrying the edge properties.
+    """
+    a, b, c = Station(id=1, name="A"), Station(id=2, name="B"), Station(id=3, name="C")
+    conn = Connection(line="1", duration=90)
+    gremlin_em.fake.responses = [[2], [1]]
+
+    gremlin_em.create_relationships([(a, b, conn), (b, c, conn), (c, a, conn)], batch_size=2)
+
+    assert len(gremlin_em.fake.submitted) == 2
+    first = gremlin_em.fake.submitted[0]
+    assert steps(first).count("addE") == 2
+    assert ["property", "duration", 90] in first.step_instructions
+
+
+def test_create_relationships_requires_saved_entities(gremlin_em):
+    """Unsaved endpoints are rejected before anything is sent."""
+    with pytest.raises(ValueError):
+        gremlin_em.create_relationships([(Station(name="A"), Station(id=2, name="B"), Connection(line="1", duration=1))])
+
+    assert gremlin_em.fake.submitted == []
+
+
+def test_missing_endpoint_is_reported_as_a_short_batch(gremlin_em):
+    """
+    Scenario: a source vertex no longer exists, so the chained addE traversal
+    (and a removal matching nothing) returns no result at all.
+    Expected: the count check raises a RuntimeError, not a bare StopIteration.
+    """
+    a, gone = Station(id=1, name="A"), Station(id=99, name="Gone")
+    conn = Connection(line="1", duration=90)
+    gremlin_em.fake.responses = [[], []]
+
+    with pytest.raises(RuntimeError, match="created 0 relationships out of 1"):
+        gremlin_em.create_relationships([(gone, a, conn)])
+    with pytest.raises(RuntimeError, match="removed 0 relationships out of 1"):
+        gremlin_em.remove_relationships([(gone, a, conn)])
+
+
+def test_remove_all_drops_one_chunk_per_round_trip(gremlin_em):
+    stations = [Station(id=i, name=f"S{i}") for i in range(3)]
+    gremlin_em.fake.responses = [[], []]
+
+    gremlin_em.remove_all(stations, batch_size=2)
+
+    assert [steps(b) for b in gremlin_em.fake.submitted] == [["V", "drop", "discard"]] * 2
+
+
+def test_remove_relationships_counts_dropped_edges(gremlin_em):
+    """A triple with no matching edge makes the batch fail loudly."""
+    a, b = Station(id=1, name="A"), Station(id=2, name="B")
+    conn = Connection(line="1", duration=90)
+    gremlin_em.fake.responses = [[1]]
+
+    with pytest.raises(RuntimeError):
+        gremlin_em.remove_relationships([(a, b, conn), (b, a, conn)])
+
+    assert steps(gremlin_em.fake.submitted[0]) == ["inject", "union", "count"]
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+from gremlin_python.driver.serializer import GraphBinarySerializersV1, GraphSONSerializersV3d0
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.config import AppConfig
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+
+
+def test_driver_options_are_passed_from_settings(fake_connection):
+    """Pool, workers, content length and serializer from AppConfig reach the driver."""
+    settings = AppConfig(
+        gremlin_pool_size=16,
+        gremlin_max_workers=32,
+        gremlin_max_content_length=1024,
+        gremlin_message_serializer="graphson",
+    )
+
+    em = GremlinEntityManager.from_settings(settings)
+
+    kwargs = fake_connection[0].kwargs
+    assert kwargs["pool_size"] == 16
+    assert kwargs["max_workers"] == 32
+    assert kwargs["max_content_length"] == 1024
+    assert isinstance(kwargs["message_serializer"], GraphSONSerializersV3d0)
+    # The script client is built with the same options
+    assert (em.client._url, em.client._pool_size) == (settings.gremlin_url, 16)
+    assert isinstance(em.client._message_serializer, GraphSONSerializersV3d0)
+    em.close()
+    assert em.client.is_closed()
+
+
+def test_default_settings_use_graphbinary(fake_connection):
+    GremlinEntityManager.from_settings(AppConfig())
+
+    kwargs = fake_connection[0].kwargs
+    assert kwargs["pool_size"] is None
+    assert isinstance(kwargs["message_serializer"], GraphBinarySerializersV1)
+
+
+def test_unknown_serializer_is_rejected(fake_connection):
+    with pytest.raises(ValueError):
+        GremlinEntityManager("ws://fake:8182/gremlin", message_serializer="xml")
+
+
+def test_manager_is_shared_safely_across_threads(gremlin_em):
+    """
+    Scenario: 8 threads look up their own station, 50 times each, on the same manager.
+    Expected: no errors, and every thread always gets its own station (never
+    another thread's): one server read each, the other lookups served from the
+    identity map.
+    """
+    def responder(bytecode):
+        (name,) = [step[2] for step in bytecode.step_instructions if step[:2] == ["has", "name"]]
+        return [{T.id: int(name[1:]), T.label: "station", "name": name}]
+
+    gremlin_em.fake.responder = responder
+    start = threading.Barrier(8)
+    errors, found = [], {}
+
+    def worker(i):
+        start.wait()
+        try:
+            results = [gremlin_em.find_by_property(Station, "name", f"S{i}") for _ in range(50)]
+            found[i] = {(station.id, station.name) for station in results}
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert found == {i: {(i, f"S{i}")} for i in range(8)}
+    assert len(gremlin_em.fake.submitted) == 8
+    stats = gremlin_em.cache_stats()
+    assert (stats.hits, stats.misses) == (8 * 49, 8)
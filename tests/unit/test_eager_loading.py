@@ -0,0 +1,104 @@
+import pytest
+from gremlin_python.process.traversal import Direction, T
+
+from soltania_persistence.core.domain import IN
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.examples.learning_paths.models import LearningUnit, Dependency
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+
+
+def station_map(obj_id, name):
+    return {T.id: obj_id, T.label: "station", "name": name}
+
+
+def edge_map(obj_id, out_v, in_v, line, duration):
+    return {T.id: obj_id, T.label: "connects_to", Direction.OUT: {T.id: out_v}, Direction.IN: {T.id: in_v},
+            "line": line, "duration": duration}
+
+
+@pytest.fixture
+def metro_em():
+    em = InMemoryEntityManager()
+    a, b, c = em.persist_all([Station(name="A"), Station(name="B"), Station(name="C")])
+    em.create_relationships([
+        (a, b, Connection(line="1", duration=60)),
+        (a, c, Connection(line="2", duration=90)),
+        (b, c, Connection(line="1", duration=30)),
+    ])
+    return em
+
+
+def test_include_loads_edges_and_neighbors(metro_em):
+    station = MetroRepository(metro_em).find_with_connections("A")
+
+    related = station.related("connects_to")
+    assert [(r.relationship.line, r.entity.name) for r in related] == [("1", "B"), ("2", "C")]
+    assert isinstance(related[0].relationship, Connection) and isinstance(related[0].entity, Station)
+
+
+def test_relations_not_loaded_raise(metro_em):
+    station = metro_em.find_by_property(Station, "name", "A")
+    with pytest.raises(KeyError):
+        station.related(Connection)
+    with pytest.raises(ValueError):
+        metro_em.find_by_property(Station, "name", "A", include=["no_such_edge"])
+    with pytest.raises(ValueError):
+        metro_em.find_by_property(Station, "name", "A", fields=["name"], include=[Connection])
+
+
+def test_prefetch_incoming_edges(metro_em):
+    stations = list(metro_em.find_all(Station))
+    metro_em.prefetch(stations, Connection, direction=IN, batch_size=2)
+
+    incoming = {s.name: sorted(r.entity.name for r in s.related(Connection, IN)) for s in stations}
+    assert incoming == {"A": [], "B": ["A"], "C": ["A", "B"]}
+
+
+def test_prerequisites_are_incoming_dependencies():
+    em = InMemoryEntityManager()
+    repo = CurriculumRepository(em)
+    python, django = repo.save_units([
+        LearningUnit(slug="python", title="Python", category="dev", hours=10),
+        LearningUnit(slug="django", title="Django", category="web", hours=20),
+    ])
+    repo.add_prerequisites([(python, django)])
+
+    unit = repo.find_with_prerequisites("django")
+    assert [r.entity.slug for r in unit.related(Dependency, IN)] == ["python"]
+
+
+def test_gremlin_include_is_one_traversal(gremlin_em):
+    """
+    Scenario: find_by_property with include, the neighbor already in the identity map.
+    Expected: one round trip; the cached neighbor instance is reused.
+    """
+    gremlin_em.fake.responses = [[station_map(2, "B")]]
+    b = gremlin_em.find(Station, 2)
+    gremlin_em.fake.responses = [[{
+        "v": station_map(1, "A"),
+        "r0": [{"e": edge_map(10, 1, 2, "1", 60), "v": station_map(2, "B")}],
+    }]]
+
+    a = gremlin_em.find_by_property(Station, "name", "A", include=["connects_to"])
+
+    assert len(gremlin_em.fake.submitted) == 2
+    steps = [i[0] for i in gremlin_em.fake.submitted[1].step_instructions]
+    assert steps == ["V", "hasLabel", "has", "limit", "map"]
+    (related,) = a.related(Connection)
+    assert related.entity is b and related.relationship == Connection(line="1", duration=60)
+
+
+def test_gremlin_prefetch_batches(gremlin_em):
+    stations = [Station(id=i, name=f"S{i}") for i in (1, 2, 3)]
+    gremlin_em.fake.responses = [
+        [{"id": 1, "r": [{"e": edge_map(10, 1, 2, "1", 60), "v": station_map(2, "S2")}]}, {"id": 2, "r": []}],
+        [{"id": 3, "r": []}],
+    ]
+
+    gremlin_em.prefetch(stations, "connects_to", batch_size=2)
+
+    assert len(gremlin_em.fake.submitted) == 2
+    assert gremlin_em.fake.submitted[0].step_instructions[0] == ["V", 1, 2]
+    assert [len(s.related("connects_to")) for s in stations] == [1, 0, 0]
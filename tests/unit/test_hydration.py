@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.provider.tinkerpop.hydration import Hydrator, hydrate_many, hydrator_for
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+
+NOW = datetime(2024, 1, 1)
+
+
+def element_map(obj_id, name, **extra):
+    return {T.id: obj_id, T.label: "station", "name": name, "created_at": NOW, "updated_at": NOW, **extra}
+
+
+class Interchange(Station):
+    lines: int = 2
+
+
+def test_hydrator_is_compiled_once_per_class():
+    assert hydrator_for(Station) is hydrator_for(Station)
+    assert hydrator_for(Interchange) is not hydrator_for(Station)
+    assert "lines" in hydrator_for(Interchange).names
+
+
+def test_trusted_and_validated_modes_agree():
+    result = element_map(5, "Nation", zone=2, unknown_property="ignored")
+    hydrator = Hydrator(Station)
+
+    validated = hydrator.hydrate(result)
+    trusted = hydrator.hydrate(result, trusted=True)
+
+    assert type(trusted) is Station
+    assert trusted == validated
+    assert trusted.model_dump() == {"id": 5, "name": "Nation", "zone": 2, "created_at": NOW, "updated_at": NOW}
+
+
+def test_trusted_mode_fills_defaults_and_skips_validation():
+    station = hydrator_for(Station).hydrate({T.id: 1, "name": "Nation", "zone": "not-an-int"}, trusted=True)
+
+    assert station.zone == "not-an-int"
+    assert isinstance(station.created_at, datetime)
+    assert station.model_fields_set == {"id", "name", "zone"}
+
+
+def test_hydrate_many():
+    stations = hydrate_many(Station, [element_map(i, f"S{i}") for i in range(3)], trusted=True)
+    assert [(s.id, s.name, s.zone) for s in stations] == [(0, "S0", 1), (1, "S1", 1), (2, "S2", 1)]
+
+
+def test_manager_opt_in_trusted_hydration(fake_connection):
+    em = GremlinEntityManager("ws://fake:8182/gremlin", trusted_hydration=True)
+    em.fake = fake_connection[-1]
+    em.fake.responses = [[element_map(3, "Nation", zone="2")]]
+
+    station = em.find_by_property(Station, "name", "Nation")
+
+    # Not validated, so the value is kept as stored
+    assert station.zone == "2"
+    assert station.id == 3
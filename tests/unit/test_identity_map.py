@@ -0,0 +1,127 @@
+from soltania_persistence.core.cache import IdentityMap, LRUCache
+from soltania_persistence.examples.metro_network.models import Station
+from gremlin_python.process.traversal import T
+
+
+def element_map(obj_id, name):
+    return {T.id: obj_id, T.label: "station", "name": name, "zone": 1}
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")          # 'b' is now the least recently used
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 0, 1, 2)
+
+
+def test_identity_map_eviction_drops_natural_keys():
+    identity_map = IdentityMap(max_size=1)
+    key_a = IdentityMap.natural_key("station", ("name",), ("A",))
+    identity_map.register(Station(id=1, name="A"), key_a)
+    identity_map.register(Station(id=2, name="B"))
+
+    assert identity_map.find(key_a) is None
+    assert identity_map.stats().evictions == 1
+
+
+def test_find_by_property_is_served_from_identity_map(gremlin_em):
+    """
+    Scenario: the same station is looked up twice.
+    Expected: one server round trip, same instance returned, counters updated.
+    """
+    gremlin_em.fake.responses = [[element_map(5, "Nation")]]
+
+    first = gremlin_em.find_by_property(Station, "name", "Nation")
+    second = gremlin_em.find_by_property(Station, "name", "Nation")
+
+    assert first is second
+    assert first.id == 5
+    assert len(gremlin_em.fake.submitted) == 1
+    assert gremlin_em.find(Station, 5) is first
+    stats = gremlin_em.cache_stats()
+    assert stats.hits == 2
+    assert stats.misses == 1
+
+
+def test_use_cache_false_forces_server_read(gremlin_em):
+    gremlin_em.fake.responses = [[element_map(5, "Nation")], [element_map(5, "Nation")]]
+
+    gremlin_em.find_by_property(Station, "name", "Nation")
+    gremlin_em.find_by_property(Station, "name", "Nation", use_cache=False)
+
+    assert len(gremlin_em.fake.submitted) == 2
+
+
+def test_upsert_hit_skips_round_trip(gremlin_em):
+    """Importers re-upserting a known station do not go to the server again."""
+    gremlin_em.fake.responses = [[9]]
+    gremlin_em.upsert(Station(name="Bastille"), key_fields=["name"])
+
+    again = gremlin_em.upsert(Station(name="Bastille"), key_fields=["name"])
+
+    assert again.id == 9
+    assert len(gremlin_em.fake.submitted) == 1
+
+
+def test_persisted_entities_are_found_by_unique_key(gremlin_em):
+    """
+    Scenario: a station is persisted, then looked up by its unique name and by id.
+    Expected: both lookups return the persisted instance without a round trip.
+    """
+    gremlin_em.fake.responses = [[{T.id: 6}]]
+    bastille = gremlin_em.persist(Station(name="Bastille", zone=1))
+
+    assert gremlin_em.find_by_property(Station, "name", "Bastille") is bastille
+    assert gremlin_em.find(Station, 6) is bastille
+    assert len(gremlin_em.fake.submitted) == 1
+
+
+def test_one_instance_per_id(gremlin_em):
+    """
+    Scenario: a cached station comes back from a lookup on a non-unique key,
+    then from a forced server read with new values.
+    Expected: the cached instance every time, refreshed in place by the forced read.
+    """
+    # Name lookup, size check of the undeclared 'zone' key, zone lookup, forced read
+    gremlin_em.fake.responses = [
+        [element_map(5, "Nation")], [1], [element_map(5, "Nation")], [{**element_map(5, "Nation"), "zone": 2}]
+    ]
+    nation = gremlin_em.find_by_property(Station, "name", "Nation")
+
+    assert gremlin_em.find_by_property(Station, "zone", 1) is nation
+    assert gremlin_em.find(Station, 5, use_cache=False) is nation
+    assert nation.zone == 2
+
+
+def test_persist_and_clear_database_invalidate(gremlin_em):
+    gremlin_em.fake.responses = [[5], [{T.id: 6}], [], [element_map(7, "Nation")]]
+    nation = gremlin_em.upsert(Station(name="Nation", zone=1), key_fields=["zone"])
+
+    # Another station of the same zone: the non-unique key must ask the server again,
+    # the unique name of the cached station still resolves
+    gremlin_em.persist(Station(name="Bastille", zone=1))
+    assert gremlin_em.identity_map.find(IdentityMap.natural_key("station", ("zone",), (1,))) is None
+    assert gremlin_em.find_by_property(Station, "name", "Nation") is nation
+    assert gremlin_em.find(Station, 6) is not None
+
+    gremlin_em.clear_database()
+    assert len(gremlin_em.identity_map) == 0
+    assert gremlin_em.find_by_property(Station, "name", "Nation").id == 7
+
+
+def test_cache_size_zero_disables_identity_map(fake_connection):
+    from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+    em = GremlinEntityManager("ws://fake:8182/gremlin", cache_size=0)
+    fake = fake_connection[0]
+    fake.responses = [[element_map(5, "Nation")], [element_map(5, "Nation")]]
+
+    em.find_by_property(Station, "name", "Nation")
+    em.find_by_property(Station, "name", "Nation")
+
+    assert len(fake.submitted) == 2
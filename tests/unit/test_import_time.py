@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+import soltania_persistence
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(soltania_persistence.__file__)))
+EXAMPLES = os.path.join(SRC, "soltania_persistence", "examples")
+
+HEAVY_MODULES = ("pydantic", "pydantic_settings", "gremlin_python", "aiohttp")
+
+
+def run(*args, **env):
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": SRC, **env},
+    )
+
+
+def loaded_modules(code):
+    """Heavy modules loaded by 'code' in a fresh interpreter."""
+    probe = f"import sys, json\n{code}\nprint(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    return json.loads(run("-c", probe).stdout.splitlines()[-1])
+
+
+def test_package_and_registry_import_no_driver():
+    assert loaded_modules("import soltania_persistence") == []
+    assert loaded_modules("from soltania_persistence.core import registry") == ["pydantic"]
+    # The settings are only built on first access
+    assert loaded_modules(
+        "import soltania_persistence.config as config\nassert 'settings' not in vars(config)"
+    ) == ["pydantic", "pydantic_settings"]
+
+
+def test_cli_help_imports_nothing_heavy():
+    """
+    Scenario: 'help' of both demo scripts, in a fresh interpreter.
+    Expected: the usage is printed without importing pydantic, the settings or the driver.
+    """
+    for script in ("metro_network/main.py", "learning_paths/main.py"):
+        path = os.path.join(EXAMPLES, script)
+        assert run(path, "help").stdout.startswith("Usage:")
+        assert loaded_modules(f"sys.argv = [{path!r}, 'help']\nimport runpy\nrunpy.run_path({path!r}, run_name='__main__')") == []
+
+
+def test_memory_provider_does_not_load_the_gremlin_provider():
+    """
+    Scenario: import the in-memory provider in a fresh interpreter.
+    Expected: neither the Gremlin entity manager nor the network stack is loaded.
+    """
+    code = "import soltania_persistence.provider.memory.manager"
+    assert "aiohttp" not in loaded_modules(code)
+    probe = f"import sys\n{code}\nprint('soltania_persistence.provider.tinkerpop.manager' in sys.modules)"
+    assert run("-c", probe).stdout.splitlines()[-1] == "False"
@@ -0,0 +1,80 @@
+import pytest
+from gremlin_python.process.traversal import T
+from gremlin_python.structure.graph import Vertex
+
+from soltania_persistence.core.instrumentation import MetricsCollector, OperationEvent
+from soltania_persistence.examples.metro_network.models import Station, Connection
+
+
+def element_map(obj_id, name):
+    return {T.id: obj_id, T.label: "station", "name": name}
+
+
+@pytest.fixture
+def collector(gremlin_em):
+    gremlin_em.instrumentation = MetricsCollector()
+    return gremlin_em.instrumentation
+
+
+def test_operations_are_measured_per_label(gremlin_em, collector):
+    """
+    Scenario: persist, a cache hit and a batched create_relationships.
+    Expected: one series per (operation, label) with round trips, results and payload.
+    """
+    gremlin_em.fake.responses = [[Vertex(1, "station")], [Vertex(2, "station")]]
+    a = gremlin_em.persist(Station(name="A"))
+    b = gremlin_em.persist(Station(name="B"))
+    gremlin_em.find(Station, a.id)  # identity map hit: no round trip
+    gremlin_em.fake.responses = [[2]]
+    gremlin_em.create_relationships([(a, b, Connection(line="1", duration=60)), (b, a, Connection(line="1", duration=60))])
+
+    stats = collector.snapshot()
+    persist = stats[("persist", "station")]
+    assert (persist.count, persist.round_trips, persist.results, persist.errors) == (2, 2, 2, 0)
+    assert persist.payload_bytes == 2 * (8 + 4 + len("station"))
+    assert stats[("find", "station")].round_trips == 0
+    assert stats[("create_relationships", "connects_to")].round_trips == 1
+    assert persist.buckets[-1] == (float("inf"), 2)
+
+
+def test_raw_traversals_and_stream_pages(gremlin_em, collector):
+    gremlin_em.fake.responses = [[element_map(1, "A"), element_map(2, "B")], [element_map(3, "C")]]
+    assert len(list(gremlin_em.stream(Station, page_size=2))) == 3
+
+    gremlin_em.fake.responses = [[5]]
+    assert gremlin_em.g.V().hasLabel("station").count().next() == 5
+
+    stats = collector.snapshot()
+    assert (stats[("stream", "station")].count, stats[("stream", "station")].results) == (2, 3)
+    assert stats[("traversal", "station")].round_trips == 1
+
+
+def test_errors_are_counted_and_raised(gremlin_em, collector):
+    gremlin_em.fake.responses = [RuntimeError("boom")]
+    with pytest.raises(RuntimeError):
+        gremlin_em.persist(Station(name="A"))
+
+    assert collector.snapshot()[("persist", "station")].errors == 1
+
+
+def test_disabled_instrumentation_records_nothing(gremlin_em):
+    gremlin_em.fake.responses = [[Vertex(1, "station")]]
+    assert gremlin_em.persist(Station(name="A")).id == 1
+    assert gremlin_em.instrumentation is None
+
+
+def test_prometheus_export_and_quantiles():
+    collector = MetricsCollector(buckets=[0.1, 1.0])
+    for duration in (0.05, 0.5, 0.5, 2.0):
+        collector.record(OperationEvent("find", 'we"ird', duration, 1, 1, 10))
+
+    stats = collector.snapshot()[("find", 'we"ird')]
+    assert [count for _, count in stats.buckets] == [1, 3, 4]
+    assert stats.quantile(0.5) == pytest.approx(0.55)
+    assert stats.mean_seconds == pytest.approx(0.7625)
+
+    text = collector.to_prometheus()
+    assert "# TYPE soltania_operation_duration_seconds histogram" in text
+    assert 'soltania_operation_duration_seconds_bucket{operation="find",label="we\\"ird",le="+Inf"} 4' in text
+    assert 'soltania_operation_round_trips_total{operation="find",label="we\\"ird"} 4' in text
+    assert text.endswith("\n")
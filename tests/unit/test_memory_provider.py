@@ -0,0 +1,140 @@
+import pytest
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.provider.memory.graph import InMemoryGraph
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.memory.traversal import UnsupportedStepError
+from soltania_persistence.provider.tinkerpop.manager import _persist_batch, _relationships_batch, _upsert_batch
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+from soltania_persistence.examples.learning_paths.models import LearningUnit
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+
+
+@pytest.fixture
+def memory_em():
+    return InMemoryEntityManager()
+
+
+def test_graph_keeps_property_index_in_sync():
+    """Index lookups follow property updates and vertex removal."""
+    graph = InMemoryGraph()
+    vid = graph.add_vertex("station", {"name": "Nation"})
+
+    assert graph.lookup("station", "name", "Nation") == [vid]
+    graph.set_vertex_property(vid, "name", "Bastille")
+    assert graph.lookup("station", "name", "Nation") == []
+    assert graph.lookup("station", "name", "Bastille") == [vid]
+
+    graph.remove_vertex(vid)
+    assert graph.lookup("station", "name", "Bastille") == []
+
+
+def test_graph_adjacency_lists():
+    """Edges are reachable from both endpoints and removed with their vertices."""
+    graph = InMemoryGraph()
+    a, b = graph.add_vertex("station"), graph.add_vertex("station")
+    eid = graph.add_edge("connects_to", a, b, {"duration": 90})
+
+    assert list(graph.edge_ids(a, "OUT")) == [eid]
+    assert list(graph.edge_ids(b, "IN")) == [eid]
+    assert list(graph.edge_ids(a, "IN")) == []
+
+    graph.remove_vertex(b)
+    assert graph.edges == {}
+    assert list(graph.edge_ids(a, "OUT")) == []
+
+
+def test_manager_crud(memory_em):
+    """persist / find / find_by_property / upsert against the native API."""
+    nation = memory_em.persist(Station(name="Nation"))
+
+    assert memory_em.find(Station, nation.id).name == "Nation"
+    assert memory_em.find_by_property(Station, "name", "Nation").id == nation.id
+    assert memory_em.find_by_property(Station, "name", "Unknown") is None
+
+    again = memory_em.upsert(Station(name="Nation"), key_fields=["name"])
+    created = memory_em.upsert(Station(name="Bastille"), key_fields=["name"])
+    assert again.id == nation.id
+    assert created.id != nation.id
+    assert len(memory_em.graph.vertices) == 2
+
+    memory_em.clear_database()
+    assert memory_em.find(Station, nation.id) is None
+
+
+def test_manager_batches_and_relationships(memory_em):
+    stations = memory_em.upsert_all([Station(name=n) for n in ("A", "B", "A")], key_fields=["name"], batch_size=2)
+    assert stations[0].id == stations[2].id
+
+    memory_em.create_relationships([(stations[0], stations[1], Connection(line="1", duration=60))])
+    (edge,) = memory_em.graph.edges.values()
+    assert (edge.out_v, edge.in_v, edge.properties["duration"]) == (stations[0].id, stations[1].id, 60)
+
+    with pytest.raises(ValueError):
+        memory_em.create_relationship(Station(name="X"), stations[1], Connection(line="1", duration=1))
+
+
+def test_gremlin_batch_traversals_run_locally(memory_em):
+    """The bytecode built by the Gremlin manager has the same meaning in process."""
+    a, b = Station(name="A"), Station(name="B")
+    ids = _persist_batch(memory_em.g, [a, b]).toList()
+    assert len(ids) == 2
+    a.id, b.id = ids
+
+    t, keys = _upsert_batch(memory_em.g, [Station(name="B"), Station(name="C")], ["name"])
+    result = t.next()
+    assert result[keys[0]] == b.id
+    assert result[keys[1]] not in ids
+
+    created = _relationships_batch(memory_em.g, [(a, b, Connection(line="1", duration=5))]).next()
+    assert created == 1
+    assert memory_em.g.V(a.id).out("connects_to").values("name").toList() == ["B"]
+
+
+def test_traversal_element_maps(memory_em):
+    a = memory_em.persist(Station(name="A"))
+    b = memory_em.persist(Station(name="B"))
+    memory_em.create_relationship(a, b, Connection(line="1", duration=5))
+
+    vertex = memory_em.g.V(a.id).elementMap("name").next()
+    assert vertex == {T.id: a.id, T.label: "station", "name": "A"}
+
+    edge = memory_em.g.V(a.id).outE().elementMap().next()
+    assert edge["line"] == "1"
+    assert edge[T.label] == "connects_to"
+
+
+def test_unsupported_step_is_reported(memory_em):
+    with pytest.raises(UnsupportedStepError):
+        memory_em.g.V().pageRank().toList()
+
+
+def test_metro_repository_runs_unchanged(memory_em):
+    """
+    Scenario: A -1-> B -1-> C plus a slow direct A -> C link.
+    Expected: the weighted traversal picks the two-hop route.
+    """
+    repo = MetroRepository(memory_em)
+    a, b, c = repo.save_stations([Station(name=n) for n in ("A", "B", "C")])
+    repo.save_connections([(a, b, "1", 60), (b, c, "1", 60), (a, c, "2", 500)])
+
+    result = repo.find_fastest_path("A", "C")
+
+    assert result["total_time"] == 120
+    names = [step["name"] for step in result["path_data"].objects[::2]]
+    assert names == ["A", "B", "C"]
+
+
+def test_curriculum_repository_runs_unchanged(memory_em):
+    repo = CurriculumRepository(memory_em)
+    basics, python, devops = repo.save_units([
+        LearningUnit(slug=s, title=s.title(), category="c", hours=1) for s in ("basics", "python", "devops")
+    ])
+    repo.add_prerequisites([(basics, python), (python, devops)])
+
+    paths = repo.get_roadmap("devops")
+
+    slugs = [[item["slug"] for item in path.objects[::2]] for path in paths]
+    # emit() returns every prefix, like Gremlin Server
+    assert slugs == [["devops", "python"], ["devops", "python", "basics"]]
@@ -0,0 +1,88 @@
+import pytest
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.tinkerpop.projection import projection_type
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+from soltania_persistence.examples.metro_network.services.routing import RoutingEngine
+from soltania_persistence.examples.learning_paths.models import LearningUnit
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+
+
+@pytest.fixture
+def network():
+    repo = MetroRepository(InMemoryEntityManager())
+    a, b, c = repo.save_stations([Station(name=n, zone=1) for n in ("A", "B", "C")])
+    repo.save_connections([(a, b, "1", 60), (b, c, "2", 60)])
+    return repo
+
+
+def test_find_by_property_sends_project_step(gremlin_em):
+    """
+    Scenario: find_by_property with fields=["name"].
+    Expected: a project('id', 'name') traversal instead of elementMap(), and a typed record.
+    """
+    gremlin_em.fake.responses = [[{"id": 7, "name": "A"}]]
+
+    record = gremlin_em.find_by_property(Station, "name", "A", fields=["name"])
+
+    assert record == (7, "A")
+    assert (record.id, record.name) == (7, "A")
+    assert type(record).__name__ == "StationRecord"
+    bytecode = repr(gremlin_em.fake.submitted[0])
+    assert "elementMap" not in bytecode and "project" in bytecode
+    # Records are not entities: nothing enters the identity map
+    assert gremlin_em.identity_map.stats().size == 0
+
+
+def test_lookup_options_are_keyword_only(gremlin_em, network):
+    """A list passed positionally is rejected by every provider instead of being read as another option."""
+    for em in (gremlin_em, network.em):
+        with pytest.raises(TypeError):
+            em.find_by_property(Station, "name", "A", ["name"])
+
+
+def test_projection_type_is_cached_and_validated():
+    assert projection_type(Station, ["name"]) is projection_type(Station, ["id", "name"])
+    with pytest.raises(ValueError):
+        projection_type(Station, ["nope"])
+
+
+def test_memory_find_by_property_record(network):
+    record = network.em.find_by_property(Station, "name", "B", fields=["name", "zone"])
+
+    assert (record.name, record.zone) == ("B", 1)
+    assert record.id == network.find_by_name("B").id
+    assert network.em.find_by_property(Station, "name", "Z", fields=["name"]) is None
+
+
+@pytest.mark.parametrize("routed", [False, True])
+def test_projected_route(network, routed):
+    if routed:
+        network = MetroRepository(network.em, router=RoutingEngine(network.em))
+
+    result = network.find_fastest_path("A", "C", station_fields=["name"], connection_fields=["line"])
+
+    assert result["total_time"] == 120
+    path = result["path_data"]
+    assert [s.name for s in path[::2]] == ["A", "B", "C"]
+    assert [c.line for c in path[1::2]] == ["1", "2"]
+    assert path[0]._fields == ("id", "name")
+    # Projected and full routes are cached separately
+    assert isinstance(network.find_fastest_path("A", "C")["path_data"][0], dict)
+
+
+def test_projected_roadmap():
+    repo = CurriculumRepository(InMemoryEntityManager())
+    basics, pro = repo.save_units([
+        LearningUnit(slug="basics", title="Basics", category="c", hours=10),
+        LearningUnit(slug="pro", title="Pro", category="c", hours=20),
+    ])
+    repo.add_prerequisites([(basics, pro)])
+
+    roadmap = repo.get_roadmap_dag("pro", fields=["title"])
+
+    assert [(u.slug, u.title, u.hours) for u in roadmap.units] == [("basics", "Basics", 10), ("pro", "Pro", 20)]
+    assert roadmap.dependencies == [("basics", "pro")]
+    assert roadmap.critical_path_hours == 30
+    assert "category" not in roadmap.units[0].__dict__
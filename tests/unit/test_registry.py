@@ -0,0 +1,57 @@
+import pytest
+
+from soltania_persistence import open_entity_manager, register_provider
+from soltania_persistence.config import AppConfig
+from soltania_persistence.core import registry
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """Registrations made by a test are dropped after it."""
+    monkeypatch.setattr(registry, "_PROVIDERS", dict(registry._PROVIDERS))
+    return registry._PROVIDERS
+
+
+def test_provider_is_picked_by_url_scheme(fake_connection):
+    assert isinstance(open_entity_manager("memory://"), InMemoryEntityManager)
+
+    em = open_entity_manager("wss://graph.example:8182/gremlin", cache_size=0)
+    assert isinstance(em, GremlinEntityManager)
+    assert fake_connection[0].url == "wss://graph.example:8182/gremlin"
+
+    with pytest.raises(ValueError, match="sqlite"):
+        open_entity_manager("sqlite:///graph.db")
+
+
+def test_settings_supply_the_url_and_provider_options(fake_connection):
+    settings = AppConfig(gremlin_host="db", gremlin_pool_size=4, gremlin_slow_query_threshold=1.5)
+
+    em = open_entity_manager(settings=settings)
+    assert em.url == "ws://db:8182/gremlin"
+    assert fake_connection[0].kwargs["pool_size"] == 4
+    assert em.slow_query_log.threshold == 1.5
+
+    # Gremlin options do not apply to the in-memory provider
+    assert isinstance(open_entity_manager(settings=AppConfig(persistence_url="memory://")), InMemoryEntityManager)
+
+
+def test_registered_providers_are_imported_on_first_use(providers):
+    class SqliteEntityManager(InMemoryEntityManager):
+        @classmethod
+        def from_url(cls, url, settings=None, **options):
+            em = cls(**options)
+            em.url = url
+            return em
+
+    register_provider("sqlite", SqliteEntityManager)
+    assert open_entity_manager("sqlite:///graph.db").url == "sqlite:///graph.db"
+
+    register_provider("local", "soltania_persistence.provider.memory.manager:InMemoryEntityManager")
+    assert isinstance(providers["local"], str)
+    assert registry.provider_for("local://") is InMemoryEntityManager
+    assert providers["local"] is InMemoryEntityManager
+
+    with pytest.raises(ValueError):
+        register_provider("bad", "soltania_persistence.provider.memory.manager")
@@ -0,0 +1,56 @@
+import pytest
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.examples.learning_paths.models import LearningUnit, Roadmap
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+
+
+def unit(slug, hours=1):
+    return LearningUnit(slug=slug, title=slug.title(), category="c", hours=hours)
+
+
+@pytest.fixture
+def diamond():
+    """
+    basics -> (scripting, docker) -> pro, with basics shared by both branches.
+    Path mode returns basics twice; the DAG mode must not.
+    """
+    repo = CurriculumRepository(InMemoryEntityManager())
+    basics, scripting, docker, pro = repo.save_units(
+        [unit("basics", 10), unit("scripting", 15), unit("docker", 8), unit("pro", 60)]
+    )
+    repo.add_prerequisites([(basics, scripting), (basics, docker), (scripting, pro), (docker, pro)])
+    return repo
+
+
+def test_roadmap_dag_has_each_unit_once(diamond):
+    roadmap = diamond.get_roadmap_dag("pro")
+
+    slugs = [u.slug for u in roadmap.units]
+    assert sorted(slugs) == ["basics", "docker", "pro", "scripting"]
+    assert slugs[0] == "basics" and slugs[-1] == "pro"
+    assert sorted(roadmap.dependencies) == [
+        ("basics", "docker"), ("basics", "scripting"), ("docker", "pro"), ("scripting", "pro")
+    ]
+    assert roadmap.total_hours == 93
+
+
+def test_roadmap_critical_path(diamond):
+    roadmap = diamond.get_roadmap_dag("pro")
+
+    assert [u.slug for u in roadmap.critical_path] == ["basics", "scripting", "pro"]
+    assert roadmap.critical_path_hours == 85
+
+
+def test_roadmap_for_standalone_or_unknown_unit(diamond):
+    roadmap = diamond.get_roadmap_dag("basics")
+    assert [u.slug for u in roadmap.units] == ["basics"]
+    assert roadmap.critical_path_hours == 10
+
+    assert diamond.get_roadmap_dag("unknown") is None
+
+
+def test_roadmap_build_rejects_cycles():
+    a, b = unit("a"), unit("b")
+    with pytest.raises(ValueError):
+        Roadmap.build(a, [a, b], [("a", "b"), ("b", "a")])
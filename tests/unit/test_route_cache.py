@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from gremlin_python.structure.graph import Vertex
+
+from soltania_persistence.core.cache import LRUCache
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+
+
+def build_network(**kwargs):
+    em = InMemoryEntityManager()
+    repo = MetroRepository(em, **kwargs)
+    a, b, c = repo.save_stations([Station(name=n) for n in ("A", "B", "C")])
+    repo.save_connections([(a, b, "1", 60), (b, c, "1", 60)])
+    return repo
+
+
+def test_lru_cache_ttl_expires_entries():
+    now = [0.0]
+    cache = LRUCache(max_size=10, ttl=5, clock=lambda: now[0])
+    cache.put("a", 1)
+
+    now[0] = 4.9
+    assert cache.get("a") == 1
+    now[0] = 5.0
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations, stats.size) == (1, 1, 1, 0)
+
+
+def test_writes_bump_graph_version():
+    em = InMemoryEntityManager()
+    a = em.persist(Station(name="A"))
+    assert em.graph_version == 1
+    em.upsert(Station(name="A"), key_fields=["name"])
+    assert em.graph_version == 1
+    em.clear_database()
+    assert em.graph_version == 2
+    assert a.id is not None
+
+
+def test_repeated_route_is_served_from_cache():
+    repo = build_network()
+
+    with patch.object(repo, "_compute_fastest_path", wraps=repo._compute_fastest_path) as spy:
+        first = repo.find_fastest_path("A", "C")
+        second = repo.find_fastest_path("A", "C")
+
+    assert first is second
+    assert spy.call_count == 1
+    stats = repo.route_cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_new_connection_invalidates_cached_routes():
+    repo = build_network()
+    assert repo.find_fastest_path("A", "C")["total_time"] == 120
+
+    a, c = repo.find_by_name("A"), repo.find_by_name("C")
+    repo.save_connection(a, c, "2", 30)
+
+    assert repo.find_fastest_path("A", "C")["total_time"] == 30
+    assert repo.route_cache_stats().hits == 0
+
+
+def test_missing_routes_are_not_cached_and_cache_can_be_disabled():
+    repo = build_network(route_cache_size=0)
+    repo.find_fastest_path("A", "C")
+    repo.find_fastest_path("A", "C")
+    assert repo.route_cache_stats().size == 0
+
+    repo = build_network()
+    assert repo.find_fastest_path("A", "Nowhere") is None
+    assert repo.route_cache_stats().size == 0
+
+
+def test_gremlin_manager_bumps_version_on_writes(gremlin_em):
+    gremlin_em.fake.responses = [[Vertex(7, "station")], [1]]
+    a = gremlin_em.persist(Station(name="A"))
+    b = Station(id=8, name="B")
+    gremlin_em.create_relationships([(a, b, Connection(line="1", duration=5))])
+
+    assert gremlin_em.graph_version == 2
@@ -0,0 +1,138 @@
+import os
+import time
+
+import pytest
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+from soltania_persistence.examples.metro_network.services.importer import NetworkImporter
+from soltania_persistence.examples.metro_network.services import routing
+from soltania_persistence.examples.metro_network.services.routing import RoutingEngine
+
+LINES_JSON = os.path.join(os.path.dirname(routing.__file__), "..", "data", "lines.json")
+
+
+@pytest.fixture
+def network():
+    """Small network: A -60-> B -60-> C, and a slow direct A -500-> C link."""
+    em = InMemoryEntityManager()
+    router = RoutingEngine(em)
+    repo = MetroRepository(em, router=router)
+    a, b, c = repo.save_stations([Station(name=n) for n in ("A", "B", "C")])
+    repo.save_connections([(a, b, "1", 60), (b, c, "1", 60), (a, c, "2", 500)])
+    return repo
+
+
+def test_route_has_traversal_shape(network):
+    result = network.find_fastest_path("A", "C")
+
+    assert result["total_time"] == 120
+    path = result["path_data"]
+    assert [path[i]["name"] for i in range(0, len(path), 2)] == ["A", "B", "C"]
+    assert [path[i]["line"] for i in range(1, len(path), 2)] == ["1", "1"]
+    assert path[1][T.label] == "connects_to"
+
+
+def test_unknown_or_unreachable_station(network):
+    assert network.find_fastest_path("A", "Nowhere") is None
+
+    network.save_station(Station(name="Island"))
+    assert network.find_fastest_path("A", "Island") is None
+
+
+def test_snapshot_refreshes_only_changed_rows(network):
+    """
+    Scenario: a faster A -> C connection is added after the first query.
+    Expected: the next query sees it; only the touched rows are reloaded.
+    """
+    network.find_fastest_path("A", "C")
+    loaded = network.router.snapshot
+    a, c = network.find_by_name("A"), network.find_by_name("C")
+
+    network.save_connection(a, c, "3", 30)
+    assert network.router._dirty == {a.id, c.id}
+
+    result = network.find_fastest_path("A", "C")
+    assert result["total_time"] == 30
+    assert network.router.snapshot is loaded
+    assert not network.router._dirty
+
+
+def test_astar_matches_dijkstra(network):
+    network.router.heuristic = lambda station, goal: 0.0
+    assert network.find_fastest_path("A", "C")["total_time"] == 120
+
+
+def test_exact_route_on_real_network():
+    """The in-process route is never slower than the server-side beam search."""
+    em = InMemoryEntityManager()
+    NetworkImporter(MetroRepository(em), LINES_JSON).run()
+    beam = MetroRepository(em).find_fastest_path("Mairie des Lilas", "Chelles - Gournay")
+
+    routed = MetroRepository(em, router=RoutingEngine(em))
+    exact = routed.find_fastest_path("Mairie des Lilas", "Chelles - Gournay")
+
+    assert exact["total_time"] <= beam["total_time"]
+    durations = [exact["path_data"][i]["duration"] for i in range(1, len(exact["path_data"]), 2)]
+    assert sum(durations) == exact["total_time"]
+
+    start = time.perf_counter()
+    for _ in range(100):
+        routed.router.shortest_path("Mairie des Lilas", "Chelles - Gournay")
+    assert (time.perf_counter() - start) / 100 < 0.01
+
+
+def test_paths_from_one_origin(network):
+    routes = network.find_fastest_paths_from("A", ["B", "C", "Nowhere"])
+
+    assert {name: r["total_time"] for name, r in routes.items()} == {"B": 60, "C": 120}
+    assert routes["C"]["path_data"][-1]["name"] == "C"
+    assert set(network.find_fastest_paths_from("A")) == {"A", "B", "C"}
+
+
+def test_travel_time_matrix(network):
+    matrix = network.travel_time_matrix(["A", "B", "C"], processes=1)
+
+    assert matrix["A", "C"] == 120
+    assert matrix["C", "A"] == 120
+    assert matrix["B", "B"] == 0
+    assert list(matrix.row("B")) == [60, 0, 60]
+
+    with pytest.raises(KeyError):
+        network.travel_time_matrix(["A", "Nowhere"])
+
+
+def test_travel_time_matrix_process_pool_matches_sequential():
+    em = InMemoryEntityManager()
+    repo = MetroRepository(em)
+    NetworkImporter(repo, LINES_JSON).run()
+
+    sequential = repo.travel_time_matrix(processes=1)
+    parallel = repo._routing().travel_time_matrix(processes=2, chunk_size=8)
+
+    assert len(parallel) == len(sequential) == len(em.graph.vertices)
+    assert parallel.data == sequential.data
+    assert parallel["Nation", "Nation"] == 0
+
+
+def test_router_sees_imports_made_after_the_first_route(tmp_path):
+    """
+    Scenario: line 1 (A-B) imported, routed once, then line 2 (B-C) imported.
+    Expected: the importer writes through a UnitOfWork, not the repository, and
+    the router still reloads its snapshot because the graph version changed.
+    """
+    em = InMemoryEntityManager()
+    repo = MetroRepository(em, router=RoutingEngine(em))
+    first, second = tmp_path / "line1.json", tmp_path / "line2.json"
+    first.write_text('{"METRO": {"avg_stop_time": 60, "lines": {"1": ["A", "B"]}}}')
+    second.write_text('{"METRO": {"avg_stop_time": 60, "lines": {"2": ["B", "C"]}}}')
+
+    NetworkImporter(repo, str(first)).run()
+    assert repo.find_fastest_path("A", "B")["total_time"] == 60
+
+    NetworkImporter(repo, str(second)).run()
+    route = repo.find_fastest_path("A", "C")
+    assert route["total_time"] == 120
+    assert [route["path_data"][i]["line"] for i in (1, 3)] == ["1", "2"]
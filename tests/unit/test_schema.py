@@ -0,0 +1,130 @@
+import pytest
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.core.instrumentation import MetricsCollector
+from soltania_persistence.core.schema import IndexSpec, index_specs, schema_script
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+from soltania_persistence.examples.learning_paths.models.nodes import LearningUnit
+from soltania_persistence.examples.metro_network.models import Station
+
+
+class RecordingClient:
+    """Driver Client stand-in: records the submitted scripts."""
+    def __init__(self):
+        self.scripts = []
+
+    def submit(self, script, bindings=None):
+        self.scripts.append(script)
+        return self
+
+    def all(self):
+        return self
+
+    def result(self):
+        return [len(self.scripts)]
+
+
+def unit_map(obj_id, slug, category="Cloud"):
+    return {T.id: obj_id, T.label: "learning_unit", "slug": slug, "title": slug, "category": category, "hours": 1}
+
+
+def test_fields_declare_the_lookup_keys():
+    assert Station.__indexes__ == {"name": True}
+    assert LearningUnit.__indexes__ == {"slug": True, "category": False}
+    assert index_specs([Station, LearningUnit, Station]) == [
+        IndexSpec("station", "name", True),
+        IndexSpec("learning_unit", "slug", True),
+        IndexSpec("learning_unit", "category", False),
+    ]
+
+
+def test_schema_scripts():
+    specs = index_specs([Station, LearningUnit])
+
+    janus = schema_script("janusgraph", specs)
+    assert janus.count("buildCompositeIndex()") == 3
+    assert janus.count("builder.unique()") == 2
+    assert "mgmt.getGraphIndex('learning_unit_category_index') == null" in janus
+
+    tinker = schema_script("TinkerGraph", index_specs([Station, Station]))
+    assert tinker.count("graph.createIndex('name', Vertex.class)") == 1
+
+    with pytest.raises(ValueError):
+        schema_script("neo4j", specs)
+
+
+def test_ensure_schema_submits_one_script(fake_connection):
+    """
+    Scenario: ensure_schema() on a JanusGraph manager, then on one without a dialect.
+    Expected: a single script for every declared index; nothing sent without a dialect.
+    """
+    em = GremlinEntityManager("ws://fake:8182/gremlin", schema_dialect="janusgraph")
+    em.client = RecordingClient()
+
+    specs = em.ensure_schema([Station, LearningUnit])
+
+    assert [spec.name for spec in specs] == ["station_name_unique", "learning_unit_slug_unique", "learning_unit_category_index"]
+    assert len(em.client.scripts) == 1
+
+    plain = GremlinEntityManager("ws://fake:8182/gremlin")
+    plain.client = RecordingClient()
+    assert plain.ensure_schema([Station]) == [IndexSpec("station", "name", True)]
+    assert plain.client.scripts == []
+
+    with pytest.raises(ValueError):
+        GremlinEntityManager("ws://fake:8182/gremlin", schema_dialect="neo4j")
+
+    assert InMemoryEntityManager().ensure_schema([Station]) == [IndexSpec("station", "name", True)]
+
+
+def test_ensure_schema_and_clear_database_report_their_own_operation(gremlin_em):
+    gremlin_em.instrumentation = MetricsCollector()
+    gremlin_em.client = RecordingClient()
+    gremlin_em.schema_dialect = "tinkergraph"
+
+    gremlin_em.ensure_schema([Station])
+    gremlin_em.fake.responses = [[]]
+    gremlin_em.clear_database()
+
+    assert set(gremlin_em.instrumentation.snapshot()) == {("ensure_schema", "station"), ("clear_database", "")}
+    assert GremlinEntityManager.clear_database.__wrapped__
+
+
+def test_only_unique_keys_are_cache_eligible(gremlin_em):
+    """
+    Scenario: a unit is looked up twice by its unique slug, then twice by its indexed category.
+    Expected: the slug lookup is served from the identity map the second time; the category
+    lookups, which may match other units, both go to the server.
+    """
+    gremlin_em.fake.responses = [[unit_map(1, "k8s")], [unit_map(1, "k8s")], [unit_map(1, "k8s")]]
+
+    first = gremlin_em.find_by_property(LearningUnit, "slug", "k8s")
+    assert gremlin_em.find_by_property(LearningUnit, "slug", "k8s") is first
+    gremlin_em.find_by_property(LearningUnit, "category", "Cloud")
+    gremlin_em.find_by_property(LearningUnit, "category", "Cloud")
+
+    assert len(gremlin_em.fake.submitted) == 3
+    assert all(b.step_instructions[-2] == ["limit", 1] for b in gremlin_em.fake.submitted)
+
+
+def test_unindexed_lookup_on_large_label_warns_once(gremlin_em, capsys):
+    gremlin_em.unindexed_lookup_threshold = 100
+    # Label count (capped at the threshold), then the lookups
+    gremlin_em.fake.responses = [[100], [unit_map(1, "k8s")], [unit_map(1, "k8s")]]
+
+    gremlin_em.find_by_property(LearningUnit, "title", "k8s")
+    gremlin_em.find_by_property(LearningUnit, "title", "k8s")
+
+    count = gremlin_em.fake.submitted[0]
+    assert [step[0] for step in count.step_instructions] == ["V", "hasLabel", "limit", "count"]
+    assert len(gremlin_em.fake.submitted) == 3
+    assert capsys.readouterr().out.count("Unindexed lookup on learning_unit.title") == 1
+
+
+def test_unindexed_lookup_on_small_label_is_silent(gremlin_em, capsys):
+    gremlin_em.fake.responses = [[12], [unit_map(1, "k8s")]]
+
+    gremlin_em.find_by_property(LearningUnit, "title", "k8s")
+
+    assert "Unindexed" not in capsys.readouterr().out
@@ -0,0 +1,71 @@
+import pytest
+from gremlin_python.process.traversal import Direction, P, T
+
+from soltania_persistence.provider.memory.server import GremlinStandInServer
+from soltania_persistence.provider.tinkerpop.hydration import (
+    edge_endpoint,
+    element_id,
+    element_label,
+    element_properties,
+    hydrator_for,
+)
+from soltania_persistence.provider.tinkerpop.manager import SERIALIZERS, GremlinEntityManager, _extract_id
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+
+
+@pytest.fixture(scope="module")
+def server():
+    with GremlinStandInServer(seed=1) as server:
+        yield server
+
+
+@pytest.fixture(params=sorted(SERIALIZERS))
+def em(request, server):
+    server.graph.clear()
+    em = GremlinEntityManager(server.url, message_serializer=request.param)
+    yield em
+    em.close()
+
+
+def test_element_maps_read_the_same_with_every_serializer(em):
+    """
+    Scenario: stations and connections written, then read back as entities,
+    eager relations and a path().by(elementMap()) route, over each serializer.
+    Expected: same entities and route; GraphSON 2 string keys ('id', 'OUT')
+    are read like the T / Direction enums of GraphBinary and GraphSON 3.
+    """
+    repo = MetroRepository(em)
+    a, b, c = repo.save_stations([Station(name=n) for n in ("A", "B", "C")])
+    nation = em.persist(Station(name="Nation", zone=2))
+    repo.save_connections([(a, b, "1", 60), (b, c, "1", 60), (a, c, "2", 500)])
+    em.identity_map.clear()
+
+    assert nation.id is not None
+    found = em.find_by_property(Station, "name", "Nation")
+    assert (found.id, found.zone) == (nation.id, 2)
+    assert em.find(Station, a.id).name == "A"
+
+    links = em.find_by_property(Station, "name", "A", include=[Connection]).related(Connection)
+    assert [(link.relationship.line, link.entity.name) for link in links] == [("1", "B"), ("2", "C")]
+
+    route = repo.find_fastest_path("A", "C")
+    assert route["total_time"] == 120
+    steps = route["path_data"].objects
+    assert [element_label(step) for step in steps] == ["station", "connects_to", "station", "connects_to", "station"]
+    assert element_id(edge_endpoint(steps[1], Direction.OUT)) == a.id
+    assert em.g.V().has("name", P.within(["A", "B"])).count().next() == 2
+
+
+def test_graphson2_element_map_helpers():
+    vertex = {"id": 7, "label": "station", "name": "Nation", "zone": 2}
+    edge = {"id": 9, "label": "connects_to", "OUT": {"id": 7, "label": "station"}, "IN": {T.id: 8}, "line": "1"}
+
+    assert (element_id(vertex), element_label(vertex)) == (7, "station")
+    assert element_id({T.id: 0, "id": 5}) == 0
+    assert element_id(edge_endpoint(edge, Direction.OUT)) == 7
+    assert element_id(edge_endpoint(edge, Direction.IN)) == 8
+    assert element_properties(edge) == {"line": "1"}
+    assert _extract_id(vertex) == 7
+    station = hydrator_for(Station).hydrate(vertex, trusted=True)
+    assert (station.id, station.name, station.zone) == (7, "Nation", 2)
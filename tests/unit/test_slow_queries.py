@@ -0,0 +1,82 @@
+import pytest
+from gremlin_python.process.graph_traversal import __
+from gremlin_python.process.traversal import P, T
+from gremlin_python.structure.graph import Vertex
+
+from soltania_persistence.config import AppConfig
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+from soltania_persistence.provider.tinkerpop.slow_queries import SlowQueryLog, fingerprint
+
+PROFILE = {
+    "dur": 12_500_000,  # GraphBinary: nanoseconds
+    "metrics": [
+        {"id": "1", "name": "TinkerGraphStep(vertex,[~label.eq(station)])", "dur": 10_000_000,
+         "counts": {"traverserCount": 300, "elementCount": 300}, "annotations": {"percentDur": 80.0}, "metrics": []},
+        {"id": "2", "name": "CountGlobalStep", "dur": 2_500_000,
+         "counts": {"traverserCount": 1, "elementCount": 1}, "annotations": {"percentDur": 20.0}, "metrics": []},
+    ],
+}
+
+
+def steps(bytecode):
+    return [instruction[0] for instruction in bytecode.step_instructions]
+
+
+@pytest.fixture
+def logged_em(fake_connection):
+    em = GremlinEntityManager("ws://fake:8182/gremlin", slow_query_threshold=0.0, profile_slow_queries=True)
+    em.fake = fake_connection[0]
+    return em
+
+
+def test_fingerprint_ignores_literal_values(gremlin_em):
+    g = gremlin_em.g
+    first = fingerprint(g.V().hasLabel("station").has("name", "A").out("connects_to").limit(5).bytecode)
+    second = fingerprint(g.V().hasLabel("station").has("name", "B").out("connects_to").limit(9).bytecode)
+    other = fingerprint(g.V().hasLabel("station").has("zone", P.gt(2)).bytecode)
+
+    assert first[0] == second[0] != other[0]
+    assert first[1] == "g.V().hasLabel('station').has('name', _0).out('connects_to').limit(_1)"
+    assert second[2] == {"_0": "B", "_1": 9}
+    assert other[1] == "g.V().hasLabel('station').has('zone', P.gt(_0))"
+
+
+def test_slow_read_is_logged_and_profiled(logged_em):
+    """
+    Scenario: threshold 0 with profiling, one read traversal.
+    Expected: an entry with the result count, and a profile() re-run broken down per step.
+    """
+    logged_em.fake.responses = [[300], [PROFILE]]
+
+    assert logged_em.g.V().hasLabel("station").count().next() == 300
+
+    assert steps(logged_em.fake.submitted[1])[-1] == "profile"
+    entry = logged_em.slow_query_log.entries()[0]
+    assert (entry.results, entry.error, entry.bindings) == (1, None, {})
+    assert [(s.duration_ms, s.traversers, s.percent) for s in entry.profile] == [(10.0, 300, 80.0), (2.5, 1, 20.0)]
+
+
+def test_writes_are_not_profiled_and_errors_are_logged(logged_em):
+    logged_em.fake.responses = [[Vertex(1, "station")], TimeoutError("598 evaluation timeout")]
+
+    logged_em.persist(Station(name="A"))
+    with pytest.raises(TimeoutError):
+        logged_em.g.V(1).repeat(__.out()).times(40).toList()
+
+    assert len(logged_em.fake.submitted) == 2
+    write, timeout = logged_em.slow_query_log.entries()
+    assert write.profile is None and write.results == 1
+    assert timeout.error == "598 evaluation timeout" and timeout.profile is None
+
+
+def test_fast_queries_are_not_logged():
+    log = SlowQueryLog(threshold=1.0)
+    assert log.observe(None, 0.5, 1) is None
+    assert len(log) == 0
+
+
+def test_threshold_comes_from_settings(fake_connection):
+    em = GremlinEntityManager.from_settings(AppConfig(gremlin_slow_query_threshold=2.5, gremlin_slow_query_profile=True))
+    assert (em.slow_query_log.threshold, em.slow_query_log.profile) == (2.5, True)
+    assert GremlinEntityManager.from_settings(AppConfig()).slow_query_log is None
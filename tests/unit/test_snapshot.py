@@ -0,0 +1,80 @@
+import multiprocessing
+
+import pytest
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.memory.snapshot import GraphSnapshot, export_snapshot, write_snapshot
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.services.routing import shortest_paths
+
+
+@pytest.fixture
+def metro_em():
+    em = InMemoryEntityManager()
+    a, b, c = em.persist_all([Station(name="A"), Station(name="B", zone=2), Station(name="C")])
+    em.create_relationships([
+        (a, b, Connection(line="1", duration=60)),
+        (b, c, Connection(line="1", duration=30)),
+        (a, c, Connection(line="2", duration=120)),
+    ])
+    return em
+
+
+@pytest.fixture
+def snapshot_path(metro_em, tmp_path):
+    path = str(tmp_path / "metro.graph")
+    export_snapshot(metro_em, path, [Station], [Connection], weight="duration")
+    return path
+
+
+def test_round_trip_through_the_models(metro_em, snapshot_path):
+    """
+    Scenario: export the metro graph, map the file.
+    Expected: same ids, labels and entities; edges as CSR rows with their Connection models.
+    """
+    with GraphSnapshot.open(snapshot_path) as snapshot:
+        assert (len(snapshot), snapshot.edge_count) == (3, 3)
+        a = snapshot.lookup("station", "name", "A")[0]
+        assert snapshot.entity(a) == metro_em.find_by_property(Station, "name", "A")
+        assert [(r.relationship, r.entity.name) for r in snapshot.related(a)] == [
+            (Connection(line="1", duration=60), "B"),
+            (Connection(line="2", duration=120), "C"),
+        ]
+        assert snapshot.index_of(snapshot.vertex_id(a)) == a
+
+
+def test_csr_arrays_feed_shortest_paths(snapshot_path):
+    with GraphSnapshot.open(snapshot_path) as snapshot:
+        a, c = snapshot.lookup("station", "name", "A")[0], snapshot.lookup("station", "name", "C")[0]
+        settled, _ = shortest_paths(snapshot.offsets, snapshot.targets, snapshot.weights, a, {c})
+        assert settled[c] == 90.0
+
+
+def test_selected_properties_and_string_ids(tmp_path):
+    path = str(tmp_path / "g.graph")
+    write_snapshot(path, [("a", "station", {"name": "A"}), ("b", "station", {"name": "B"})],
+                   [("a", "b", "connects_to", {"line": "1", "duration": 5}), ("a", "zz", "connects_to", {})])
+
+    with GraphSnapshot.open(path) as snapshot:
+        assert [snapshot.vertex_id(i) for i in range(len(snapshot))] == ["a", "b"]
+        assert snapshot.edge_count == 1  # dangling edge dropped
+        graph = snapshot.to_graph()
+    assert graph.lookup("station", "name", "B") == ["b"]
+
+
+def test_version_is_checked(snapshot_path):
+    with open(snapshot_path, "r+b") as f:
+        f.seek(8)
+        f.write(b"\x63\x00")
+    with pytest.raises(ValueError, match="version 99"):
+        GraphSnapshot.open(snapshot_path)
+
+
+def _count_edges(path):
+    with GraphSnapshot.open(path) as snapshot:
+        return snapshot.edge_count
+
+
+def test_workers_map_the_same_file(snapshot_path):
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        assert pool.map(_count_edges, [snapshot_path] * 2) == [3, 3]
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+from gremlin_python.driver.protocol import GremlinServerError
+
+from soltania_persistence.provider.memory.server import GremlinStandInServer
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager, _find_by_property_template
+from soltania_persistence.examples.metro_network.models import Station, Connection
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+
+
+@pytest.fixture
+def server():
+    with GremlinStandInServer(seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def em(server):
+    em = GremlinEntityManager(server.url)
+    yield em
+    em.close()
+
+
+def test_repository_runs_over_the_wire(server, em):
+    """
+    Scenario: stations and connections saved, then routed, through the websocket.
+    Expected: same results as a Gremlin Server; the writes land in the server graph.
+    """
+    repo = MetroRepository(em)
+    a, b, c = repo.save_stations([Station(name=n) for n in ("A", "B", "C")])
+    repo.save_connections([(a, b, "1", 60), (b, c, "1", 60), (a, c, "2", 500)])
+
+    result = repo.find_fastest_path("A", "C")
+
+    assert result["total_time"] == 120
+    assert [step["name"] for step in result["path_data"].objects[::2]] == ["A", "B", "C"]
+    assert len(server.graph.vertex_ids("station")) == 3
+    assert [r.entity.name for r in repo.find_with_connections("A").related(Connection)] == ["B", "C"]
+
+
+def test_large_results_arrive_in_partial_batches(server, em):
+    server.batch_size = 16
+    assert em.g.inject(*range(100)).toList() == list(range(100))
+    assert em.g.V().hasLabel("missing").toList() == []
+
+
+def test_injected_failures(server, em):
+    """
+    Scenario: the next request is failed with 598, then every request with 500.
+    Expected: the driver raises GremlinServerError with the injected status.
+    """
+    server.fail_next(status=598)
+    with pytest.raises(GremlinServerError) as error:
+        em.g.inject(1).next()
+    assert error.value.status_code == 598
+    assert em.g.inject(1).next() == 1
+
+    server.error_rate, server.error_status = 1.0, 500
+    with pytest.raises(GremlinServerError) as error:
+        em.g.inject(1).next()
+    assert error.value.status_code == 500
+    assert server.errors == 2
+
+
+def test_latency_and_evaluation_timeout(server, em):
+    server.latency = 0.05
+    start = time.perf_counter()
+    em.g.inject(1).next()
+    assert time.perf_counter() - start >= 0.05
+
+    # The request's evaluationTimeout (ms) is shorter than the latency
+    with pytest.raises(GremlinServerError) as error:
+        em.g.with_("evaluationTimeout", 10).inject(1).next()
+    assert error.value.status_code == 598
+
+
+def test_script_endpoint_serves_registered_templates(server):
+    server.register(_find_by_property_template("station", "name"))
+    em = GremlinEntityManager(server.url, script_templates=True)
+    try:
+        em.persist(Station(name="Nation"))
+        em.identity_map.clear()
+        assert em.find_by_property(Station, "name", "Nation").name == "Nation"
+
+        with pytest.raises(GremlinServerError) as error:
+            em.client.submit("g.V().count()").all().result()
+        assert error.value.status_code == 597
+    finally:
+        em.close()
@@ -0,0 +1,119 @@
+import pytest
+from gremlin_python.process.traversal import P, T
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.tinkerpop.manager import GremlinEntityManager
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+from soltania_persistence.examples.learning_paths.models import LearningUnit
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+
+
+def element_map(obj_id, name):
+    return {T.id: obj_id, T.label: "station", "name": name, "zone": 1}
+
+
+def id_bounds(bytecodes):
+    """Lower id bound of each page (None for the first one)."""
+    bounds = []
+    for b in bytecodes:
+        gt = [inst[2] for inst in b.step_instructions if inst[0] == "has" and inst[1] == T.id]
+        bounds.append(gt[0].value if gt else None)
+    return bounds
+
+
+def test_stream_pages_by_id(gremlin_em):
+    """
+    Scenario: 5 stations streamed with page_size=2.
+    Expected: 3 round trips (2 + 2 + 1), each page ordered by id and starting
+    after the last id of the previous one; entities yielded lazily in order.
+    """
+    gremlin_em.fake.responses = [
+        [element_map(1, "A"), element_map(2, "B")],
+        [element_map(3, "C"), element_map(4, "D")],
+        [element_map(5, "E")],
+    ]
+
+    stream = gremlin_em.stream(Station, page_size=2)
+    first = next(stream)
+
+    assert first.name == "A"
+    assert len(gremlin_em.fake.submitted) == 1
+    assert [s.id for s in stream] == [2, 3, 4, 5]
+    assert id_bounds(gremlin_em.fake.submitted) == [None, 2, 4]
+    steps = gremlin_em.fake.submitted[1].step_instructions
+    assert [step[0] for step in steps[-4:]] == ["order", "by", "limit", "elementMap"]
+    assert steps[-2] == ["limit", 2]
+    assert "range" not in [step[0] for step in steps]
+
+
+def test_find_all_applies_filters(gremlin_em):
+    gremlin_em.fake.responses = [[element_map(1, "A")]]
+
+    result = list(gremlin_em.find_all(Station, zone=1, name="A"))
+
+    assert [s.name for s in result] == ["A"]
+    bytecode = gremlin_em.fake.submitted[0]
+    assert ["has", "zone", 1] in bytecode.step_instructions
+    assert ["has", "name", "A"] in bytecode.step_instructions
+
+
+def test_stream_stops_on_exact_page_boundary(gremlin_em):
+    gremlin_em.fake.responses = [[element_map(1, "A"), element_map(2, "B")], []]
+
+    assert len(list(gremlin_em.stream(Station, page_size=2))) == 2
+    assert len(gremlin_em.fake.submitted) == 2
+
+    with pytest.raises(ValueError):
+        next(gremlin_em.stream(Station, page_size=0))
+
+
+def test_in_memory_stream_and_repositories():
+    em = InMemoryEntityManager()
+    metro = MetroRepository(em)
+    metro.save_stations([Station(name=f"S{i}", zone=i % 2) for i in range(7)])
+
+    assert [s.name for s in metro.stream_stations(page_size=3)] == [f"S{i}" for i in range(7)]
+    assert [s.name for s in em.find_all(Station, zone=1)] == ["S1", "S3", "S5"]
+
+    curriculum = CurriculumRepository(em)
+    curriculum.save_units([
+        LearningUnit(slug="a", title="A", category="OS", hours=1),
+        LearningUnit(slug="b", title="B", category="Cloud", hours=1),
+    ])
+    assert [u.slug for u in curriculum.find_by_category("Cloud")] == ["b"]
+
+
+def test_gremlin_stream_runs_against_local_graph():
+    """The paged traversal returns every vertex exactly once."""
+    em = InMemoryEntityManager()
+    em.persist_all([Station(name=f"S{i}") for i in range(5)])
+
+    names = [s.name for s in GremlinEntityManager.stream(em_as_gremlin(em), Station, page_size=2)]
+
+    assert names == [f"S{i}" for i in range(5)]
+
+
+def test_gremlin_stream_is_not_shifted_by_writes():
+    """
+    Scenario: a station is deleted, then another created, between two pages.
+    Expected: the pages of the remaining stations are neither skipped nor repeated.
+    """
+    em = InMemoryEntityManager()
+    stations = em.persist_all([Station(name=f"S{i}") for i in range(6)])
+
+    stream = GremlinEntityManager.stream(em_as_gremlin(em), Station, page_size=2)
+    seen = [next(stream).name, next(stream).name]
+    em.remove_all([stations[0]])
+    em.persist(Station(name="S6"))
+    seen += [s.name for s in stream]
+
+    assert seen == [f"S{i}" for i in range(7)]
+
+
+def em_as_gremlin(em):
+    """Runs the Gremlin manager's stream() over the in-memory traversal source."""
+    proxy = GremlinEntityManager.__new__(GremlinEntityManager)
+    proxy.g = em.g
+    proxy.trusted_hydration = False
+    return proxy
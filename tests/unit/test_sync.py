@@ -0,0 +1,182 @@
+import json
+
+import pytest
+
+from soltania_persistence.core.sync import GraphSync, Manifest
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.examples.learning_paths.models import LearningUnit, Dependency
+from soltania_persistence.examples.learning_paths.repositories.curriculum_repository import CurriculumRepository
+from soltania_persistence.examples.learning_paths.services.importer import CurriculumImporter
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+from soltania_persistence.examples.metro_network.services.importer import NetworkImporter
+
+
+NETWORK = {"METRO": {"avg_stop_time": 90, "lines": {"1": ["A", "B", "C"], "2": ["C", "D"]}}}
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def edge_triples(em, label):
+    names = {vid: record.properties.get("name") or record.properties.get("slug") for vid, record in em.graph.vertices.items()}
+    return sorted(
+        (names[edge.out_v], names[edge.in_v], edge.properties.get("line") or edge.properties.get("type"))
+        for edge in em.graph.edges.values() if edge.label == label
+    )
+
+
+class CountingEM(InMemoryEntityManager):
+    """Records the write calls that reach the manager."""
+
+    WRITES = ("upsert_all", "update_all", "remove_all", "remove_relationships", "create_relationships", "persist_all")
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def __getattribute__(self, name):
+        attribute = super().__getattribute__(name)
+        if name in CountingEM.WRITES:
+            self.calls.append(name)
+        return attribute
+
+
+@pytest.fixture
+def memory_em():
+    return CountingEM()
+
+
+@pytest.fixture(autouse=True)
+def working_dir(tmp_path, monkeypatch):
+    """Default manifests are written to the working directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_default_manifest_is_written_to_the_working_directory(memory_em, tmp_path, working_dir):
+    """
+    Scenario: a source file in a (possibly read-only) data directory, synced
+    without an explicit manifest path, then with one.
+    Expected: the manifest goes to the working directory, or to the given path.
+    """
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    source = write_json(data_dir / "lines.json", NETWORK)
+
+    NetworkImporter(MetroRepository(memory_em), source).sync()
+    assert (working_dir / "lines.json.manifest.json").exists()
+    assert not (data_dir / "lines.json.manifest.json").exists()
+
+    explicit = str(tmp_path / "state" / "metro.manifest.json")
+    (tmp_path / "state").mkdir()
+    importer = NetworkImporter(MetroRepository(memory_em), source, manifest_path=explicit)
+    assert importer.sync().unchanged == 4
+    assert Manifest.load(explicit) is not None
+
+
+def test_rerun_of_unchanged_file_writes_nothing(memory_em, tmp_path):
+    """
+    Scenario: the same network file synced twice.
+    Expected: the second run plans no change and sends no write at all.
+    """
+    importer = NetworkImporter(MetroRepository(memory_em), write_json(tmp_path / "lines.json", NETWORK))
+    first = importer.sync()
+    assert len(first.inserts) == 4 and len(first.edge_inserts) == 6
+    before = edge_triples(memory_em, "connects_to")
+
+    memory_em.calls.clear()
+    second = importer.sync()
+
+    assert second.is_empty and second.unchanged == 4
+    assert memory_em.calls == []
+    assert edge_triples(memory_em, "connects_to") == before
+
+
+def test_changes_are_sent_as_a_diff(memory_em, tmp_path):
+    """
+    Scenario: line 2 is rerouted (D replaced by E) and its stop time changes.
+    Expected: D and its edges are deleted, E is inserted, line 1 edges are untouched.
+    """
+    path = tmp_path / "lines.json"
+    importer = NetworkImporter(MetroRepository(memory_em), write_json(path, NETWORK))
+    importer.sync()
+    line_1 = [e for e in edge_triples(memory_em, "connects_to") if e[2] == "1"]
+    d_id = memory_em.graph.lookup("station", "name", "D")[0]
+
+    write_json(path, {
+        "METRO": {"avg_stop_time": 90, "lines": {"1": ["A", "B", "C"]}},
+        "RER": {"avg_stop_time": 120, "lines": {"E": ["C", "E"]}},
+    })
+    plan = importer.sync()
+
+    assert [s.name for s in plan.inserts] == ["E"]
+    # Known from the manifest only: deleted by id
+    assert [s.id for s in plan.deletes] == [d_id]
+    # C <-> D went with D; only the new C <-> E pair is written
+    assert plan.edge_deletes == [] and len(plan.edge_inserts) == 2
+    assert memory_em.graph.lookup("station", "name", "D") == []
+    assert [e for e in edge_triples(memory_em, "connects_to") if e[2] == "1"] == line_1
+    assert ("C", "E", "RER E") in edge_triples(memory_em, "connects_to")
+
+
+def test_updated_record_keeps_its_vertex(memory_em, tmp_path):
+    path = tmp_path / "curriculum.json"
+    units = [
+        {"id": "python", "title": "Python", "category": "dev", "hours": 10},
+        {"id": "django", "title": "Django", "category": "dev", "hours": 20, "prerequisites": ["python"]},
+    ]
+    importer = CurriculumImporter(CurriculumRepository(memory_em), write_json(path, {"units": units}))
+    importer.sync()
+    python_id = memory_em.graph.lookup("learning_unit", "slug", "python")[0]
+
+    units[0]["hours"] = 15
+    write_json(path, {"units": units})
+    plan = importer.sync()
+
+    assert [u.slug for u in plan.updates] == ["python"] and plan.unchanged == 1
+    assert memory_em.graph.lookup("learning_unit", "slug", "python") == [python_id]
+    assert memory_em.graph.vertices[python_id].properties["hours"] == 15
+    assert edge_triples(memory_em, "leads_to") == [("python", "django", "required")]
+
+
+def test_rescan_repairs_graph_filled_by_full_reloads(memory_em, tmp_path):
+    """
+    Scenario: run() was executed twice (every connection duplicated), then a
+    first sync without manifest.
+    Expected: the baseline is read from the graph and the duplicates are deleted.
+    """
+    importer = NetworkImporter(MetroRepository(memory_em), write_json(tmp_path / "lines.json", NETWORK))
+    importer.run()
+    importer.run()
+    assert len(edge_triples(memory_em, "connects_to")) == 12
+
+    plan = importer.sync()
+
+    assert plan.inserts == [] and plan.updates == [] and len(plan.edge_deletes) == 6
+    assert len(edge_triples(memory_em, "connects_to")) == 6
+    assert Manifest.load(importer.manifest_path).edges
+    assert importer.sync().is_empty
+
+
+def test_failed_sync_discards_the_manifest(memory_em, tmp_path, monkeypatch):
+    manifest_path = str(tmp_path / "units.manifest.json")
+    sync = GraphSync(memory_em, manifest_path)
+    sync.sync([LearningUnit(slug="python", title="Python", category="dev", hours=10)], ["slug"])
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("server gone")
+
+    monkeypatch.setattr(memory_em, "upsert_all", fail)
+    with pytest.raises(ConnectionError):
+        sync.sync([LearningUnit(slug="rust", title="Rust", category="dev", hours=30)], ["slug"])
+
+    assert Manifest.load(manifest_path) is None
+
+
+def test_links_must_belong_to_the_sync(memory_em, tmp_path):
+    a, b = Station(name="A"), Station(name="B")
+    with pytest.raises(ValueError):
+        GraphSync(memory_em, str(tmp_path / "m.json")).plan([a], ["name"], [(a, b, Dependency(type="x"))])
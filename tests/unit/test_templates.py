@@ -0,0 +1,74 @@
+import pytest
+from gremlin_python.process.traversal import P, T
+
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.provider.tinkerpop.templates import TraversalTemplate
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.examples.metro_network.repositories.metro_repository import (
+    _fastest_path_template,
+    _fastest_path_traversal,
+)
+
+BY_ZONE = TraversalTemplate(
+    lambda g, zone, excluded: g.V().hasLabel("station").has("zone", P.gte(zone)).has("name", P.neq(excluded)).values("name"),
+    "zone", "excluded",
+)
+
+
+class FakeClient:
+    """Driver Client stand-in for the script endpoint."""
+
+    def __init__(self, results):
+        self.results = results
+        self.scripts = []
+
+    def submit(self, script, bindings=None):
+        self.scripts.append((script, bindings))
+        client = self
+
+        class _ResultSet:
+            def all(self):
+                class _Future:
+                    def result(self):
+                        return client.results
+                return _Future()
+        return _ResultSet()
+
+
+def test_template_bytecode_matches_the_fluent_traversal(gremlin_em):
+    template = _fastest_path_template(("name",), ("line",))
+
+    built = template.bytecode(start=1, end=2)
+
+    assert built == _fastest_path_traversal(gremlin_em.g, 1, 2, ["name"], ["line"]).bytecode
+    # The template itself keeps its placeholders
+    assert template.bytecode(start=3, end=4) != built
+
+
+def test_template_parameters_are_checked():
+    with pytest.raises(ValueError):
+        BY_ZONE.bytecode(zone=1)
+    with pytest.raises(ValueError):
+        BY_ZONE.bytecode(zone=1, excluded="A", other=2)
+
+
+def test_template_runs_on_the_in_memory_graph():
+    em = InMemoryEntityManager()
+    em.persist_all([Station(name="A", zone=1), Station(name="B", zone=3), Station(name="C", zone=4)])
+
+    assert sorted(em.execute(BY_ZONE, zone=3, excluded="A")) == ["B", "C"]
+    assert em.execute(BY_ZONE, zone=4, excluded="C") == []
+
+
+def test_script_mode_sends_one_script_with_bindings(gremlin_em):
+    gremlin_em.script_templates = True
+    gremlin_em.client = FakeClient([{T.id: 7, T.label: "station", "name": "A"}])
+
+    first = gremlin_em.find_by_property(Station, "name", "A", use_cache=False)
+    gremlin_em.find_by_property(Station, "name", "B", use_cache=False)
+
+    assert first.id == 7
+    (script_a, bindings_a), (script_b, bindings_b) = gremlin_em.client.scripts
+    assert script_a == script_b == "g.V().hasLabel('station').has('name',value).limit(1).elementMap()"
+    assert (bindings_a, bindings_b) == ({"value": "A"}, {"value": "B"})
+    assert gremlin_em.fake.submitted == []
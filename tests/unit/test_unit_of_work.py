@@ -0,0 +1,115 @@
+import pytest
+from gremlin_python.process.traversal import T
+
+from soltania_persistence.core.unit_of_work import UnitOfWork
+from soltania_persistence.provider.memory.manager import InMemoryEntityManager
+from soltania_persistence.examples.learning_paths.models import LearningUnit, Dependency
+from soltania_persistence.examples.metro_network.models import Station
+
+
+def unit(slug, hours=10):
+    return LearningUnit(slug=slug, title=slug.title(), category="dev", hours=hours)
+
+
+def steps(bytecode):
+    return [instruction[0] for instruction in bytecode.step_instructions]
+
+
+@pytest.fixture
+def memory_em():
+    return InMemoryEntityManager()
+
+
+def test_commit_flushes_new_entities_and_relationships(memory_em):
+    """
+    Scenario: two new units and a link between them queued in a unit of work.
+    Expected: nothing is written before the block ends, then ids are assigned back.
+    """
+    with UnitOfWork(memory_em) as uow:
+        python = uow.add(unit("python"))
+        django = uow.add(unit("django"))
+        uow.relate(python, django, Dependency(type="required"))
+        assert memory_em.graph.vertex_ids() == [] and uow.has_changes
+
+    assert python.id is not None and django.id is not None
+    assert [memory_em.graph.edges[e].in_v for e in memory_em.graph.edge_ids(python.id, "OUT")] == [django.id]
+    assert not uow.has_changes
+
+
+def test_only_dirty_fields_are_written(memory_em):
+    saved = memory_em.persist(unit("python"))
+
+    with UnitOfWork(memory_em) as uow:
+        loaded = uow.find(LearningUnit, saved.id)
+        loaded.hours = 40
+        assert set(uow.dirty_fields(loaded)) == {"hours"}
+
+    properties = memory_em.graph.vertices[saved.id].properties
+    assert properties["hours"] == 40
+    assert properties["updated_at"] == loaded.updated_at > saved.updated_at
+    assert memory_em.graph.lookup("learning_unit", "slug", "python") == [saved.id]
+
+
+def test_exception_discards_queued_work(memory_em):
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(memory_em) as uow:
+            uow.add(unit("python"))
+            raise RuntimeError("request failed")
+
+    assert memory_em.graph.vertex_ids() == []
+
+
+def test_keyed_entities_are_upserted(memory_em):
+    existing = memory_em.persist(unit("python"))
+
+    with UnitOfWork(memory_em) as uow:
+        again = uow.add(unit("python"), key_fields=["slug"])
+
+    assert again.id == existing.id
+    assert len(memory_em.graph.vertex_ids()) == 1
+
+
+def test_unsaved_endpoints_must_be_queued(memory_em):
+    uow = UnitOfWork(memory_em)
+    with pytest.raises(ValueError):
+        uow.relate(unit("python"), unit("django"), Dependency(type="required"))
+
+
+def test_persist_updates_a_saved_entity(memory_em):
+    """persist() on an entity with an id rewrites it instead of creating a duplicate."""
+    station = memory_em.persist(Station(name="Nation"))
+    station.name = "Nation (RER)"
+    memory_em.persist(station)
+
+    assert memory_em.graph.vertex_ids() == [station.id]
+    assert memory_em.graph.lookup("station", "name", "Nation") == []
+
+
+def test_gremlin_flush_is_one_traversal_per_kind(gremlin_em):
+    """
+    Scenario: a tracked entity changed, a new one added and linked to it.
+    Expected: addV batch, then a single update traversal with only the changed property, then the edges.
+    """
+    gremlin_em.fake.responses = [[{T.id: 1, T.label: "learning_unit", "slug": "python", "title": "Python",
+                                   "category": "dev", "hours": 10}]]
+    uow = UnitOfWork(gremlin_em)
+    python = uow.find(LearningUnit, 1)
+    python.hours = 40
+    django = uow.add(unit("django"))
+    uow.relate(python, django, Dependency(type="required"))
+
+    gremlin_em.fake.responses = [[2], [1], [1]]
+    uow.commit()
+
+    persist, update, link = gremlin_em.fake.submitted[1:]
+    assert django.id == 2
+    assert steps(persist)[0] == "addV" and steps(link)[-1] == "count"
+    assert steps(update) == ["inject", "union", "count"]
+    branch = update.step_instructions[1][1]
+    assert [i[2] for i in branch.step_instructions if i[0] == "property"] == ["hours", "updated_at"]
+
+
+def test_gremlin_update_reports_missing_vertices(gremlin_em):
+    gremlin_em.fake.responses = [[0]]
+    with pytest.raises(RuntimeError):
+        gremlin_em.update_all([(Station(id=5, name="Gone"), {"name": "Gone"})])
@@ -0,0 +1,65 @@
+import pytest
+from unittest.mock import MagicMock
+
+from soltania_persistence.core.interfaces import EntityManager
+from soltania_persistence.examples.metro_network.models import Station
+from soltania_persistence.examples.metro_network.repositories.metro_repository import MetroRepository
+
+
+def steps(bytecode):
+    return [inst[0] for inst in bytecode.step_instructions]
+
+
+def test_upsert_uses_single_fold_coalesce_traversal(gremlin_em):
+    """
+    Scenario: upsert a station by name.
+    Expected: one round trip using fold().coalesce(unfold(), addV()), id assigned.
+    """
+    gremlin_em.fake.responses = [[42]]
+
+    result = gremlin_em.upsert(Station(name="Nation"), key_fields=["name"])
+
+    assert result.id == 42
+    assert len(gremlin_em.fake.submitted) == 1
+    bytecode = gremlin_em.fake.submitted[0]
+    assert steps(bytecode) == ["V", "hasLabel", "has", "fold", "coalesce", "id"]
+    assert ["has", "name", "Nation"] in bytecode.step_instructions
+
+
+def test_upsert_rejects_missing_key(gremlin_em):
+    """A None key value can never match: refuse instead of creating duplicates."""
+    with pytest.raises(ValueError):
+        gremlin_em.upsert(Station(name="Nation", zone=None), key_fields=["zone"])
+
+    with pytest.raises(ValueError):
+        gremlin_em.upsert(Station(name="Nation"), key_fields=[])
+
+
+def test_upsert_all_projects_one_key_per_entity(gremlin_em):
+    """
+    Scenario: 3 stations upserted with batch_size=2.
+    Expected: 2 round trips, ids mapped back by position.
+    """
+    stations = [Station(name=n) for n in ("A", "B", "C")]
+    gremlin_em.fake.responses = [[{"u0": 1, "u1": 2}], [{"u0": 3}]]
+
+    gremlin_em.upsert_all(stations, key_fields=["name"], batch_size=2)
+
+    assert [s.id for s in stations] == [1, 2, 3]
+    first = gremlin_em.fake.submitted[0]
+    assert ["project", "u0", "u1"] in first.step_instructions
+    assert steps(first).count("by") == 2
+
+
+def test_repository_save_station_delegates_to_upsert():
+    """MetroRepository no longer does find-then-persist."""
+    em = MagicMock(spec=EntityManager)
+    station = Station(name="Bastille")
+    em.upsert.return_value = Station(id=7, name="Bastille")
+
+    result = MetroRepository(em).save_station(station)
+
+    assert result.id == 7
+    em.upsert.assert_called_once_with(station, key_fields=["name"])
+    em.find_by_property.assert_not_called()
+    em.persist.assert_not_called()